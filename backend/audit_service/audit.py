@@ -1,41 +1,204 @@
-from motor.motor_asyncio import AsyncIOMotorDatabase
+import asyncio
+import logging
+import os
+from database import AuditRepo
 from models.audit_log import AuditLog, AuditLogCreate
-from typing import List, Optional
-from datetime import datetime
+from pymongo.errors import BulkWriteError
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+DUPLICATE_KEY = 11000
+PENDING_FIELDS = ('connection_id', 'user_id')
+
+logger = logging.getLogger(__name__)
+
+class AuditWriter:
+    
+    def __init__(self, batch_size: Optional[int] = None, flush_interval: Optional[float] = None,
+                 max_queue: Optional[int] = None, max_retries: Optional[int] = None,
+                 retry_delay: Optional[float] = None):
+        self.batch_size = batch_size or int(os.environ.get('AUDIT_BATCH_SIZE', '500'))
+        self.flush_interval = flush_interval or float(os.environ.get('AUDIT_FLUSH_INTERVAL', '0.25'))
+        self.max_queue = max_queue or int(os.environ.get('AUDIT_QUEUE_SIZE', '10000'))
+        self.max_retries = max_retries if max_retries is not None else int(os.environ.get('AUDIT_MAX_RETRIES', '5'))
+        self.retry_delay = retry_delay or float(os.environ.get('AUDIT_RETRY_DELAY', '0.1'))
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self._settled: Optional[asyncio.Condition] = None
+        self.written = 0
+        self.retried = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+    
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._pending = {}
+        self._settled = asyncio.Condition()
+        self._task = loop.create_task(self._run())
+    
+    @staticmethod
+    def _keys(doc: Dict[str, Any]) -> List[Tuple[str, str]]:
+        return [(field, doc[field]) for field in PENDING_FIELDS if doc.get(field) is not None]
+    
+    async def submit(self, repo: AuditRepo, docs: List[Dict[str, Any]]) -> None:
+        self.start()
+        for doc in docs:
+            for key in self._keys(doc):
+                self._pending[key] = self._pending.get(key, 0) + 1
+            await self._queue.put((repo, doc))
+    
+    async def drain(self, field: str, value: str) -> None:
+        if self._task is None or self._task.done() or not self._pending.get((field, value)):
+            return
+        async with self._settled:
+            await self._settled.wait_for(lambda: not self._pending.get((field, value)))
+    
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.put(None)
+            await self._task
+        self._task = None
+        self._queue = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "written": self.written,
+            "retried": self.retried,
+            "failed": self.failed,
+            "last_error": self.last_error
+        }
+    
+    async def _run(self) -> None:
+        queue = self._queue
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                queue.task_done()
+                break
+            batch = [item]
+            deadline = asyncio.get_running_loop().time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if queue.empty():
+                    timeout = deadline - asyncio.get_running_loop().time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = queue.get_nowait()
+                if item is None:
+                    queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            await self._release(batch)
+            for _ in batch:
+                queue.task_done()
+    
+    async def _release(self, batch: List[Tuple[AuditRepo, Dict[str, Any]]]) -> None:
+        for _, doc in batch:
+            for key in self._keys(doc):
+                remaining = self._pending.get(key, 0) - 1
+                if remaining > 0:
+                    self._pending[key] = remaining
+                else:
+                    self._pending.pop(key, None)
+        async with self._settled:
+            self._settled.notify_all()
+    
+    async def _flush(self, batch: List[Tuple[AuditRepo, Dict[str, Any]]]) -> None:
+        groups: Dict[int, Tuple[AuditRepo, List[Dict[str, Any]]]] = {}
+        for repo, doc in batch:
+            groups.setdefault(id(repo), (repo, []))[1].append(doc)
+        for repo, docs in groups.values():
+            await self._write(repo, docs)
+    
+    async def _write(self, repo: AuditRepo, docs: List[Dict[str, Any]]) -> None:
+        total = len(docs)
+        error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retried += 1
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+            try:
+                await repo.insert_many(docs, ordered=False)
+                docs = []
+            except BulkWriteError as e:
+                failed = {failure['index'] for failure in e.details.get('writeErrors', [])
+                          if failure.get('code') != DUPLICATE_KEY}
+                docs = [doc for index, doc in enumerate(docs) if index in failed]
+                error = e
+            except Exception as e:
+                error = e
+            if not docs:
+                break
+            if attempt < self.max_retries:
+                logger.warning(f"Audit write attempt {attempt + 1} failed for {len(docs)} entries: {error}")
+        self.written += total - len(docs)
+        if docs:
+            self.failed += len(docs)
+            self.last_error = str(error)
+            logger.error(f"Dropped {len(docs)} audit log entries after {self.max_retries + 1} attempts: {error}")
+
+AUDIT_WRITER = AuditWriter()
 
 class AuditService:
     
-    def __init__(self, db: AsyncIOMotorDatabase):
-        self.db = db
+    def __init__(self, repo: AuditRepo, writer: AuditWriter = AUDIT_WRITER):
+        self.repo = repo
+        self.writer = writer
+    
+    @staticmethod
+    def _document(audit_log: AuditLog) -> Dict[str, Any]:
+        return audit_log.model_dump()
     
-    async def log_action(self, log_create: AuditLogCreate) -> AuditLog:
+    async def log_action(self, log_create: AuditLogCreate, durable: bool = False) -> AuditLog:
         audit_log = AuditLog(**log_create.model_dump())
-        doc = audit_log.model_dump()
-        doc['timestamp'] = doc['timestamp'].isoformat()
+        doc = self._document(audit_log)
         
-        await self.db.audit_logs.insert_one(doc)
+        if durable:
+            await self.repo.insert_one(doc)
+        else:
+            await self.writer.submit(self.repo, [doc])
         return audit_log
     
-    async def get_connection_audit_trail(self, connection_id: str) -> List[AuditLog]:
-        logs = await self.db.audit_logs.find(
-            {"connection_id": connection_id},
-            {"_id": 0}
-        ).sort("timestamp", -1).to_list(1000)
-        
-        for log in logs:
-            if isinstance(log['timestamp'], str):
-                log['timestamp'] = datetime.fromisoformat(log['timestamp'])
+    async def log_actions(self, log_creates: List[AuditLogCreate], durable: bool = False) -> int:
+        docs = [self._document(AuditLog(**log_create.model_dump())) for log_create in log_creates]
         
-        return [AuditLog(**log) for log in logs]
+        if not docs:
+            return 0
+        if durable:
+            await self.repo.insert_many(docs, ordered=False)
+        else:
+            await self.writer.submit(self.repo, docs)
+        return len(docs)
     
-    async def get_user_audit_trail(self, user_id: str, limit: int = 100) -> List[AuditLog]:
-        logs = await self.db.audit_logs.find(
-            {"user_id": user_id},
-            {"_id": 0}
-        ).sort("timestamp", -1).limit(limit).to_list(limit)
-        
-        for log in logs:
-            if isinstance(log['timestamp'], str):
-                log['timestamp'] = datetime.fromisoformat(log['timestamp'])
-        
-        return [AuditLog(**log) for log in logs]
\ No newline at end of file
+    async def get_connection_audit_trail(self, connection_id: str, after: Optional[str] = None,
+                                         limit: int = 1000) -> Tuple[List[AuditLog], Optional[str]]:
+        await self.writer.drain('connection_id', connection_id)
+        logs, next_cursor = await self.repo.page_for_connection(connection_id, after, limit)
+        return [AuditLog(**log) for log in logs], next_cursor
+    
+    async def get_user_audit_trail(self, user_id: str, after: Optional[str] = None,
+                                   limit: int = 100) -> Tuple[List[AuditLog], Optional[str]]:
+        await self.writer.drain('user_id', user_id)
+        logs, next_cursor = await self.repo.page_for_user(user_id, after, limit)
+        return [AuditLog(**log) for log in logs], next_cursor
+    
+    async def stream_connection_audit_trail(self, connection_id: str, after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        await self.writer.drain('connection_id', connection_id)
+        return self.repo.stream_for_connection(connection_id, after)
+    
+    async def stream_user_audit_trail(self, user_id: str, after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        await self.writer.drain('user_id', user_id)
+        return self.repo.stream_for_user(user_id, after)
\ No newline at end of file
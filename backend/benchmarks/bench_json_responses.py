@@ -0,0 +1,75 @@
+# Run: python backend/benchmarks/bench_json_responses.py
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from geometry_engine import GeometryGenerator
+from models.connection import Connection
+from rule_engine import AISC360RuleEngine
+from utils.responses import FastJSONResponse
+
+CONNECTIONS = 200
+ROUNDS = 20
+
+PARAMETERS = {
+    "num_bolts_vertical": 4,
+    "num_bolts_horizontal": 2,
+    "bolt_diameter": 0.75,
+    "plate_thickness": 0.75,
+    "shear_load": 40.0
+}
+
+def documents() -> List[Dict[str, Any]]:
+    engine = AISC360RuleEngine()
+    validation = engine.validate_connection("end_plate", PARAMETERS).to_dict()
+    geometry = GeometryGenerator.generate_connection("end_plate", PARAMETERS)
+    return [
+        Connection(
+            name=f"EP-{i}",
+            connection_type="end_plate",
+            project_id="project",
+            user_id="user",
+            parameters=PARAMETERS,
+            geometry=geometry,
+            validation_results=validation,
+            rule_checks=validation["checks"]
+        ).model_dump()
+        for i in range(CONNECTIONS)
+    ]
+
+field = create_response_field(name="Response_get_connections", type_=List[Connection])
+
+async def response_model_path(docs: List[Dict[str, Any]]) -> bytes:
+    content = await serialize_response(field=field, response_content=[Connection(**doc) for doc in docs])
+    return JSONResponse(jsonable_encoder(content)).body
+
+async def model_serializer_path(docs: List[Dict[str, Any]]) -> bytes:
+    return FastJSONResponse([Connection(**doc) for doc in docs]).body
+
+async def raw_document_path(docs: List[Dict[str, Any]]) -> bytes:
+    return FastJSONResponse(docs).body
+
+def measure(label: str, render: Callable, docs: List[Dict[str, Any]]) -> Dict[str, float]:
+    body = asyncio.run(render(docs))
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        asyncio.run(render(docs))
+    elapsed = (time.perf_counter() - started) / ROUNDS
+    print(f"{label:>19}: {elapsed * 1000:8.2f} ms per response, {CONNECTIONS / elapsed:8.0f} connections/s, {len(body)} bytes")
+    return {"elapsed": elapsed, "bytes": len(body)}
+
+if __name__ == "__main__":
+    docs = documents()
+    legacy = measure("response_model", response_model_path, docs)
+    serializer = measure("pydantic_serializer", model_serializer_path, docs)
+    raw = measure("orjson_documents", raw_document_path, docs)
+    print(f"throughput gain {legacy['elapsed'] / serializer['elapsed']:.1f}x pydantic serializer, "
+          f"{legacy['elapsed'] / raw['elapsed']:.1f}x raw documents")
\ No newline at end of file
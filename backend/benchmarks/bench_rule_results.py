@@ -0,0 +1,82 @@
+# Run: python backend/benchmarks/bench_rule_results.py [baseline-revision]
+import subprocess
+import sys
+import time
+import tracemalloc
+import types
+from pathlib import Path
+from typing import Any, Dict, Callable, Optional
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from rule_engine import AISC360RuleEngine
+
+ITERATIONS = 5000
+
+PARAMETERS = {
+    "num_bolts": 4,
+    "bolt_diameter": 0.75,
+    "bolt_spacing": 3.0,
+    "edge_distance": 1.5,
+    "plate_thickness": 0.375,
+    "plate_length": 10.5,
+    "beam_depth": 18.0,
+    "connection_depth": 10.5
+}
+
+CONNECTION_TYPE = "beam_to_column_shear"
+
+def load_baseline(revision: Optional[str] = None) -> Any:
+    def git(*args: str) -> str:
+        return subprocess.run(["git", *args], cwd=BACKEND, capture_output=True, text=True, check=True).stdout
+    
+    revision = revision or git("rev-list", "--max-parents=0", "HEAD").split()[0]
+    source = git("show", f"{revision}:./rule_engine/aisc360.py")
+    module = types.ModuleType("rule_engine.baseline_aisc360")
+    module.__package__ = "rule_engine"
+    exec(compile(source, f"{revision[:12]}:rule_engine/aisc360.py", "exec"), module.__dict__)
+    return module.AISC360RuleEngine()
+
+engine = AISC360RuleEngine()
+baseline = None
+
+def baseline_path(params: Dict[str, Any]) -> Any:
+    rule_result = baseline.validate_connection(CONNECTION_TYPE, params)
+    return rule_result.model_dump(), [check.model_dump() for check in rule_result.checks]
+
+def compact_path(params: Dict[str, Any]) -> Any:
+    validation_results = engine.validate_connection(CONNECTION_TYPE, params).to_dict()
+    return validation_results, validation_results['checks']
+
+def measure(name: str, fn: Callable[[Dict[str, Any]], Any]) -> Dict[str, float]:
+    for _ in range(200):
+        fn(PARAMETERS)
+    
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn(PARAMETERS)
+    latency_us = (time.perf_counter() - start) / ITERATIONS * 1e6
+    
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [fn(PARAMETERS) for _ in range(100)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(stat.count_diff for stat in stats) / len(kept)
+    size = sum(stat.size_diff for stat in stats) / len(kept)
+    
+    print(f"{name:<10} {latency_us:8.1f} us/validation {blocks:8.1f} live blocks/validation {size / 1024:8.2f} KiB/validation")
+    return {"latency_us": latency_us, "blocks": blocks, "bytes": size}
+
+if __name__ == "__main__":
+    baseline = load_baseline(sys.argv[1] if len(sys.argv) > 1 else None)
+    legacy_checks = len(baseline_path(PARAMETERS)[1])
+    compact_checks = len(compact_path(PARAMETERS)[1])
+    if legacy_checks != compact_checks:
+        print(f"warning: baseline produces {legacy_checks} checks, current engine {compact_checks}")
+    legacy = measure("baseline", baseline_path)
+    compact = measure("compact", compact_path)
+    print(f"latency reduction {1 - compact['latency_us'] / legacy['latency_us']:.0%}, "
+          f"allocation reduction {1 - compact['bytes'] / legacy['bytes']:.0%}")
\ No newline at end of file
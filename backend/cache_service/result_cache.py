@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from database import Repository
+from fastapi.concurrency import run_in_threadpool
+from typing import Any, Callable, Dict, Optional
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+def normalize_parameters(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    normalized = {}
+    for name, value in parameters.items():
+        if hasattr(value, 'item'):
+            value = value.item()
+        if isinstance(value, dict):
+            value = normalize_parameters(value)
+        normalized[name] = value
+    return normalized
+
+def canonical_key(namespace: str, connection_type: str, parameters: Dict[str, Any], version: str) -> str:
+    payload = json.dumps(
+        [namespace, connection_type, normalize_parameters(parameters), version],
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResultCache:
+    
+    def __init__(self, namespace: str, version: str, max_entries: int = 4096,
+                 collection: Optional[Repository] = None,
+                 encode: Callable[[Any], Any] = lambda value: value,
+                 decode: Callable[[Any], Any] = lambda value: value):
+        self.namespace = namespace
+        self.version = version
+        self.max_entries = max_entries
+        self.collection = collection
+        self.encode = encode
+        self.decode = decode
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.second_tier_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def key(self, connection_type: str, parameters: Dict[str, Any]) -> str:
+        return canonical_key(self.namespace, connection_type, parameters, self.version)
+    
+    def get(self, key: str) -> Optional[Any]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    async def get_or_compute(self, connection_type: str, parameters: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        key = self.key(connection_type, parameters)
+        
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        
+        if self.collection is not None:
+            value = await self._load(key)
+            if value is not None:
+                self.second_tier_hits += 1
+                self.put(key, value)
+                return value
+        
+        self.misses += 1
+        value = await run_in_threadpool(compute)
+        self.put(key, value)
+        
+        if self.collection is not None:
+            await self._store(key, connection_type, value)
+        
+        return value
+    
+    async def _load(self, key: str) -> Optional[Any]:
+        try:
+            doc = await self.collection.find_one({"_id": key}, {"value": 1})
+        except Exception as e:
+            logger.warning(f"Result cache {self.namespace}: second tier read failed: {e}")
+            return None
+        return self.decode(doc['value']) if doc else None
+    
+    async def _store(self, key: str, connection_type: str, value: Any) -> None:
+        try:
+            await self.collection.replace_one(
+                {"_id": key},
+                {
+                    "namespace": self.namespace,
+                    "version": self.version,
+                    "connection_type": connection_type,
+                    "value": self.encode(value),
+                    "created_at": datetime.now(timezone.utc)
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Result cache {self.namespace}: second tier write failed: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.second_tier_hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "version": self.version,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "second_tier_hits": self.second_tier_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.second_tier_hits) / lookups if lookups else 0.0,
+            "second_tier": self.collection is not None
+        }
+
+def cache_settings() -> Dict[str, Any]:
+    return {
+        "max_entries": int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', '4096')),
+        "second_tier": os.environ.get('RESULT_CACHE_MONGO', 'false').lower() in ('1', 'true', 'yes')
+    }
\ No newline at end of file
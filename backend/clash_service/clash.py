@@ -0,0 +1,310 @@
+import itertools
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from geometry_engine import GeometryGenerator, BoltPattern
+from cache_service.result_cache import canonical_key
+
+DEFAULT_CELL_SIZE = 6.0
+MAX_PROJECT_INDEXES = 64
+CONTACT_TOLERANCE = 1e-3
+
+CLASH_PIECES = frozenset({"bolts", "dimensions"})
+
+Cell = Tuple[int, int, int]
+
+NEIGHBOR_OFFSETS = list(itertools.product((-1, 0, 1), repeat=3))
+
+def placement_transform(placement: Optional[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    placement = placement or {}
+    origin = np.asarray(placement.get('origin') or (0.0, 0.0, 0.0), dtype=np.float64)
+    rx, ry, rz = np.radians(np.asarray(placement.get('rotation') or (0.0, 0.0, 0.0), dtype=np.float64))
+    rotate_x = np.array([[1, 0, 0], [0, np.cos(rx), -np.sin(rx)], [0, np.sin(rx), np.cos(rx)]])
+    rotate_y = np.array([[np.cos(ry), 0, np.sin(ry)], [0, 1, 0], [-np.sin(ry), 0, np.cos(ry)]])
+    rotate_z = np.array([[np.cos(rz), -np.sin(rz), 0], [np.sin(rz), np.cos(rz), 0], [0, 0, 1]])
+    return rotate_z @ rotate_y @ rotate_x, origin
+
+def connection_solids(connection_type: str, parameters: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    geometry = GeometryGenerator.build(connection_type, parameters, CLASH_PIECES)
+    bolts = geometry.get("bolts")
+    if isinstance(bolts, BoltPattern) and len(bolts):
+        positions = bolts.positions
+        diameters = np.full(len(bolts), float(bolts.diameter))
+    else:
+        positions = np.zeros((0, 3))
+        diameters = np.zeros(0)
+    
+    dimensions = geometry.get("dimensions", {})
+    if geometry.get("type") == "double_angle":
+        length = dimensions.get("angle_length", 0.0)
+        leg = parameters.get('angle_leg', 4.0)
+        thickness = parameters.get('angle_thickness', 0.375)
+        gap = parameters.get('beam_web_thickness', 0.3)
+        boxes = np.array([
+            [[0.0, 0.0, -thickness], [leg, length, 0.0]],
+            [[0.0, 0.0, gap], [leg, length, gap + thickness]]
+        ])
+    elif "plate_length" in dimensions:
+        boxes = np.array([[[0.0, 0.0, 0.0], [dimensions["plate_width"], dimensions["plate_length"], dimensions["plate_thickness"]]]])
+    else:
+        boxes = np.zeros((0, 2, 3))
+    return positions, diameters, boxes
+
+def boxes_overlap(centers_a: np.ndarray, axes_a: np.ndarray, half_a: np.ndarray,
+                  centers_b: np.ndarray, axes_b: np.ndarray, half_b: np.ndarray) -> np.ndarray:
+    cross = np.cross(axes_a[:, :, np.newaxis, :], axes_b[:, np.newaxis, :, :]).reshape(-1, 9, 3)
+    candidates = np.concatenate([axes_a, axes_b, cross], axis=1)
+    norms = np.linalg.norm(candidates, axis=2, keepdims=True)
+    usable = norms[:, :, 0] > 1e-9
+    candidates = candidates / np.where(norms > 1e-9, norms, 1.0)
+    
+    radius_a = (np.abs(np.einsum('kad,kid->kai', candidates, axes_a)) * half_a[:, np.newaxis, :]).sum(axis=2)
+    radius_b = (np.abs(np.einsum('kad,kid->kai', candidates, axes_b)) * half_b[:, np.newaxis, :]).sum(axis=2)
+    distance = np.abs(np.einsum('kad,kd->ka', candidates, centers_b - centers_a))
+    overlap = np.where(usable, radius_a + radius_b - distance, np.inf)
+    return overlap.min(axis=1)
+
+class ConnectionEntry:
+    __slots__ = ('fingerprint', 'bolts', 'radii', 'box_centers', 'box_axes', 'box_half', 'bolt_cells', 'box_cells')
+    
+    def __init__(self, fingerprint: str, connection_type: str, parameters: Dict[str, Any],
+                 placement: Optional[Dict[str, Any]], cell_size: float):
+        rotation, origin = placement_transform(placement)
+        positions, diameters, boxes = connection_solids(connection_type, parameters)
+        self.fingerprint = fingerprint
+        self.bolts = positions @ rotation.T + origin
+        self.radii = diameters / 2
+        self.box_centers = ((boxes[:, 0] + boxes[:, 1]) / 2) @ rotation.T + origin
+        self.box_axes = np.broadcast_to(rotation.T, (len(boxes), 3, 3)).copy()
+        self.box_half = np.abs(boxes[:, 1] - boxes[:, 0]) / 2
+        
+        self.bolt_cells: List[Cell] = [tuple(cell) for cell in np.floor(self.bolts / cell_size).astype(np.int64).tolist()]
+        extents = np.abs(rotation) @ self.box_half.T if len(boxes) else np.zeros((3, 0))
+        lower = np.floor((self.box_centers - extents.T) / cell_size).astype(np.int64)
+        upper = np.floor((self.box_centers + extents.T) / cell_size).astype(np.int64)
+        self.box_cells: List[List[Cell]] = [
+            list(itertools.product(*[range(low, high + 1) for low, high in zip(lo, hi)]))
+            for lo, hi in zip(lower.tolist(), upper.tolist())
+        ]
+
+class ProjectClashIndex:
+    
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.min_clearance: Optional[float] = None
+        self.entries: Dict[str, ConnectionEntry] = {}
+        self.bolt_grid: Dict[Cell, Dict[str, List[int]]] = {}
+        self.box_grid: Dict[Cell, Dict[str, List[int]]] = {}
+        self.bolt_clashes: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self.plate_clashes: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self.lock = threading.Lock()
+    
+    def reset(self, cell_size: float) -> None:
+        self.cell_size = cell_size
+        self.entries.clear()
+        self.bolt_grid.clear()
+        self.box_grid.clear()
+        self.bolt_clashes.clear()
+        self.plate_clashes.clear()
+    
+    def sync(self, connections: Iterable[Dict[str, Any]], min_clearance: float) -> Dict[str, int]:
+        incoming = {}
+        for connection in connections:
+            placement = connection.get('placement')
+            if not placement:
+                continue
+            fingerprint = canonical_key(
+                "clash", connection['connection_type'], {**(connection.get('parameters') or {}), "__placement__": placement},
+                GeometryGenerator.VERSION
+            )
+            incoming[connection['id']] = (fingerprint, connection)
+        
+        if self.min_clearance != min_clearance:
+            self.bolt_clashes.clear()
+            stale_results = set(self.entries)
+        else:
+            stale_results = set()
+        self.min_clearance = min_clearance
+        
+        removed = [connection_id for connection_id in self.entries if connection_id not in incoming]
+        changed = [connection_id for connection_id, (fingerprint, _) in incoming.items()
+                   if connection_id not in self.entries or self.entries[connection_id].fingerprint != fingerprint]
+        
+        for connection_id in removed + changed:
+            self._remove(connection_id)
+        skipped = []
+        for connection_id in changed:
+            fingerprint, connection = incoming[connection_id]
+            try:
+                entry = ConnectionEntry(fingerprint, connection['connection_type'], connection.get('parameters') or {},
+                                        connection['placement'], self.cell_size)
+            except (TypeError, ValueError, KeyError):
+                skipped.append(connection_id)
+                continue
+            self._insert(connection_id, entry)
+        
+        dirty = set(changed) | set(removed)
+        for clashes in (self.bolt_clashes, self.plate_clashes):
+            for pair in [pair for pair in clashes if dirty & set(pair)]:
+                del clashes[pair]
+        
+        refresh_bolts = set(changed) | stale_results
+        self._detect_bolts(refresh_bolts, min_clearance)
+        self._detect_plates(set(changed))
+        return {"indexed": len(self.entries), "changed": len(changed), "removed": len(removed),
+                "rechecked": len(refresh_bolts), "skipped": skipped}
+    
+    def _insert(self, connection_id: str, entry: ConnectionEntry) -> None:
+        self.entries[connection_id] = entry
+        for i, cell in enumerate(entry.bolt_cells):
+            self.bolt_grid.setdefault(cell, {}).setdefault(connection_id, []).append(i)
+        for i, cells in enumerate(entry.box_cells):
+            for cell in cells:
+                self.box_grid.setdefault(cell, {}).setdefault(connection_id, []).append(i)
+    
+    def _remove(self, connection_id: str) -> None:
+        entry = self.entries.pop(connection_id, None)
+        if entry is None:
+            return
+        for grid, cells in ((self.bolt_grid, set(entry.bolt_cells)),
+                            (self.box_grid, {cell for box in entry.box_cells for cell in box})):
+            for cell in cells:
+                occupants = grid.get(cell)
+                if occupants is not None:
+                    occupants.pop(connection_id, None)
+                    if not occupants:
+                        del grid[cell]
+    
+    def _neighbors(self, connection_id: str, checked: Set[str]) -> Dict[str, Tuple[Set[int], Set[int]]]:
+        entry = self.entries[connection_id]
+        nearby: Dict[str, Tuple[Set[int], Set[int]]] = {}
+        for i, (x, y, z) in enumerate(entry.bolt_cells):
+            for dx, dy, dz in NEIGHBOR_OFFSETS:
+                occupants = self.bolt_grid.get((x + dx, y + dy, z + dz))
+                if not occupants:
+                    continue
+                for other, indices in occupants.items():
+                    if other == connection_id or (other in checked and other < connection_id):
+                        continue
+                    mine, theirs = nearby.setdefault(other, (set(), set()))
+                    mine.add(i)
+                    theirs.update(indices)
+        return nearby
+    
+    def _detect_bolts(self, connection_ids: Set[str], min_clearance: float) -> None:
+        for connection_id in sorted(connection_ids):
+            if connection_id not in self.entries:
+                continue
+            entry = self.entries[connection_id]
+            for other, (mine, theirs) in self._neighbors(connection_id, connection_ids).items():
+                other_entry = self.entries[other]
+                mine = np.fromiter(mine, dtype=np.int64)
+                theirs = np.fromiter(theirs, dtype=np.int64)
+                distance = np.linalg.norm(entry.bolts[mine][:, np.newaxis, :] - other_entry.bolts[theirs][np.newaxis, :, :], axis=2)
+                required = entry.radii[mine][:, np.newaxis] + other_entry.radii[theirs][np.newaxis, :] + min_clearance
+                rows, columns = np.nonzero(distance < required)
+                if not len(rows):
+                    continue
+                pair = tuple(sorted((connection_id, other)))
+                self.bolt_clashes[pair] = [
+                    {
+                        "connection_a": connection_id,
+                        "bolt_a": int(mine[i]),
+                        "connection_b": other,
+                        "bolt_b": int(theirs[j]),
+                        "distance": round(float(distance[i, j]), 4),
+                        "required": round(float(required[i, j]), 4),
+                        "location": [round(v, 4) for v in entry.bolts[mine[i]].tolist()]
+                    }
+                    for i, j in zip(rows.tolist(), columns.tolist())
+                ]
+    
+    def _detect_plates(self, connection_ids: Set[str]) -> None:
+        for connection_id in sorted(connection_ids):
+            entry = self.entries.get(connection_id)
+            if entry is None or not len(entry.box_half):
+                continue
+            candidates = set()
+            for i, cells in enumerate(entry.box_cells):
+                for cell in cells:
+                    for other, indices in self.box_grid.get(cell, {}).items():
+                        if other == connection_id or (other in connection_ids and other < connection_id):
+                            continue
+                        candidates.update((i, other, j) for j in indices)
+            if not candidates:
+                continue
+            candidates = sorted(candidates)
+            mine = np.array([i for i, _, _ in candidates])
+            others = [self.entries[other] for _, other, _ in candidates]
+            theirs = np.array([j for _, _, j in candidates])
+            depth = boxes_overlap(
+                entry.box_centers[mine], entry.box_axes[mine], entry.box_half[mine],
+                np.array([o.box_centers[j] for o, j in zip(others, theirs)]),
+                np.array([o.box_axes[j] for o, j in zip(others, theirs)]),
+                np.array([o.box_half[j] for o, j in zip(others, theirs)])
+            )
+            for k in np.nonzero(depth > CONTACT_TOLERANCE)[0].tolist():
+                i, other, j = candidates[k]
+                pair = tuple(sorted((connection_id, other)))
+                self.plate_clashes.setdefault(pair, []).append({
+                    "connection_a": connection_id,
+                    "part_a": i,
+                    "connection_b": other,
+                    "part_b": j,
+                    "penetration": round(float(depth[k]), 4),
+                    "location": [round(v, 4) for v in entry.box_centers[i].tolist()]
+                })
+
+def _diameter(parameters: Dict[str, Any]) -> float:
+    try:
+        return float(parameters.get('bolt_diameter') or 0.875)
+    except (TypeError, ValueError):
+        return 0.875
+
+class ClashService:
+    
+    def __init__(self, max_projects: int = MAX_PROJECT_INDEXES):
+        self.max_projects = max_projects
+        self._indexes: "OrderedDict[str, ProjectClashIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def index(self, project_id: str) -> ProjectClashIndex:
+        with self._lock:
+            index = self._indexes.get(project_id)
+            if index is None:
+                index = self._indexes[project_id] = ProjectClashIndex()
+            self._indexes.move_to_end(project_id)
+            while len(self._indexes) > self.max_projects:
+                self._indexes.popitem(last=False)
+            return index
+    
+    def check(self, project_id: str, connections: List[Dict[str, Any]], min_clearance: float = 0.5,
+              include_plates: bool = True, max_results: int = 1000) -> Dict[str, Any]:
+        started = time.perf_counter()
+        index = self.index(project_id)
+        with index.lock:
+            largest = max((_diameter(c.get('parameters') or {}) for c in connections), default=0.875)
+            cell_size = max(DEFAULT_CELL_SIZE, largest + min_clearance)
+            if cell_size > index.cell_size:
+                index.reset(cell_size)
+            stats = index.sync(connections, min_clearance)
+            stats["unplaced"] = sum(1 for c in connections if not c.get('placement'))
+            bolt_clashes = [clash for pair in sorted(index.bolt_clashes) for clash in index.bolt_clashes[pair]]
+            plate_clashes = [clash for pair in sorted(index.plate_clashes) for clash in index.plate_clashes[pair]] \
+                if include_plates else []
+            total_bolts = sum(len(entry.bolts) for entry in index.entries.values())
+        
+        return {
+            "project_id": project_id,
+            "bolt_clash_count": len(bolt_clashes),
+            "plate_clash_count": len(plate_clashes),
+            "bolt_clashes": bolt_clashes[:max_results],
+            "plate_clashes": plate_clashes[:max_results],
+            "truncated": len(bolt_clashes) > max_results or len(plate_clashes) > max_results,
+            "index": {**stats, "bolts": total_bolts, "cell_size": index.cell_size},
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+CLASH_SERVICE = ClashService()
\ No newline at end of file
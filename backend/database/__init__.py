@@ -0,0 +1,36 @@
+from .client import DATABASE, Database, PoolStats, OperationStats, client_settings
+from .indexes import INDEXES, ensure_indexes
+from .slow_queries import SlowQueryLog
+from .repositories import (
+    Repository,
+    UserRepo,
+    ProjectRepo,
+    ConnectionRepo,
+    TypicalRepo,
+    DesignResultRepo,
+    RedlineRepo,
+    AuditRepo,
+    JobRepo,
+    ResultCacheRepo
+)
+
+__all__ = [
+    'DATABASE',
+    'Database',
+    'PoolStats',
+    'OperationStats',
+    'client_settings',
+    'INDEXES',
+    'ensure_indexes',
+    'SlowQueryLog',
+    'Repository',
+    'UserRepo',
+    'ProjectRepo',
+    'ConnectionRepo',
+    'TypicalRepo',
+    'DesignResultRepo',
+    'RedlineRepo',
+    'AuditRepo',
+    'JobRepo',
+    'ResultCacheRepo'
+]
\ No newline at end of file
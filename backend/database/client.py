@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from datetime import timezone
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from typing import Any, Dict, Optional
+from .slow_queries import SlowQueryLog
+
+POOL_SETTINGS = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", int),
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", int),
+    "maxIdleTimeMS": ("MONGO_MAX_IDLE_TIME_MS", int),
+    "waitQueueTimeoutMS": ("MONGO_WAIT_QUEUE_TIMEOUT_MS", int),
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", int),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", int),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", int)
+}
+
+def client_settings() -> Dict[str, Any]:
+    return {
+        option: cast(os.environ[variable])
+        for option, (variable, cast) in POOL_SETTINGS.items()
+        if os.environ.get(variable)
+    }
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checkout_started = threading.local()
+        self.reset()
+    
+    def reset(self) -> None:
+        with self._lock:
+            self.created = 0
+            self.closed = 0
+            self.checked_out = 0
+            self.checked_in = 0
+            self.checkout_failures = 0
+            self.in_use = 0
+            self.max_in_use = 0
+            self.cleared = 0
+            self.checkout_wait_ms = 0.0
+            self.max_checkout_wait_ms = 0.0
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        with self._lock:
+            self.cleared += 1
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_created(self, event):
+        with self._lock:
+            self.created += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self.closed += 1
+    
+    def connection_check_out_started(self, event):
+        self._checkout_started.value = time.perf_counter()
+    
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+    
+    def connection_checked_out(self, event):
+        started = getattr(self._checkout_started, 'value', None)
+        wait_ms = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+        with self._lock:
+            self.checked_out += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            self.checkout_wait_ms += wait_ms
+            self.max_checkout_wait_ms = max(self.max_checkout_wait_ms, wait_ms)
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_in += 1
+            self.in_use -= 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open": self.created - self.closed,
+                "created": self.created,
+                "closed": self.closed,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "checked_out": self.checked_out,
+                "checkout_failures": self.checkout_failures,
+                "cleared": self.cleared,
+                "mean_checkout_wait_ms": self.checkout_wait_ms / self.checked_out if self.checked_out else 0.0,
+                "max_checkout_wait_ms": self.max_checkout_wait_ms
+            }
+
+class OperationStats:
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, Dict[str, float]]] = {}
+    
+    def record(self, collection: str, operation: str, elapsed_ms: float, failed: bool = False) -> None:
+        with self._lock:
+            entry = self._operations.setdefault(collection, {}).setdefault(
+                operation, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            entry["count"] += 1
+            entry["errors"] += failed
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+    
+    def snapshot(self, collection: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            collections = {
+                name: {
+                    operation: {**entry, "mean_ms": entry["total_ms"] / entry["count"] if entry["count"] else 0.0}
+                    for operation, entry in operations.items()
+                }
+                for name, operations in self._operations.items()
+            }
+        return collections.get(collection, {}) if collection is not None else collections
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+class Database:
+    
+    def __init__(self):
+        self.client: Optional[AsyncIOMotorClient] = None
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self.pool = PoolStats()
+        self.operations = OperationStats()
+        self.slow_queries = SlowQueryLog()
+    
+    def connect(self) -> AsyncIOMotorDatabase:
+        if self._db is None:
+            self.client = AsyncIOMotorClient(os.environ['MONGO_URL'], tz_aware=True, tzinfo=timezone.utc,
+                                             event_listeners=[self.pool], **client_settings())
+            self._db = self.client[os.environ['DB_NAME']]
+        return self._db
+    
+    @property
+    def db(self) -> AsyncIOMotorDatabase:
+        return self.connect()
+    
+    @db.setter
+    def db(self, db: AsyncIOMotorDatabase) -> None:
+        self._db = db
+    
+    def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+        self._db = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "settings": client_settings(),
+            "pool": self.pool.snapshot(),
+            "operations": self.operations.snapshot(),
+            "slow_queries": self.slow_queries.stats()
+        }
+
+DATABASE = Database()
\ No newline at end of file
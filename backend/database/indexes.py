@@ -0,0 +1,92 @@
+import logging
+import os
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+INDEX_PREFIX = "sc_"
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="sc_id", unique=True),
+        IndexModel([("email", ASCENDING)], name="sc_email", unique=True)
+    ],
+    "projects": [
+        IndexModel([("id", ASCENDING)], name="sc_id", unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], name="sc_user_created")
+    ],
+    "connections": [
+        IndexModel([("id", ASCENDING), ("user_id", ASCENDING)], name="sc_id_user", unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], name="sc_user_created"),
+        IndexModel([("user_id", ASCENDING), ("project_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+                   name="sc_user_project_created"),
+        IndexModel([("project_id", ASCENDING)], name="sc_project"),
+        IndexModel([("typical_id", ASCENDING), ("user_id", ASCENDING)], name="sc_typical_user",
+                   partialFilterExpression={"typical_id": {"$type": "string"}})
+    ],
+    "typicals": [
+        IndexModel([("id", ASCENDING)], name="sc_id", unique=True),
+        IndexModel([("user_id", ASCENDING), ("project_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+                   name="sc_user_project_created")
+    ],
+    "audit_logs": [
+        IndexModel([("connection_id", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)], name="sc_connection_timestamp"),
+        IndexModel([("user_id", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)], name="sc_user_timestamp")
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)], name="sc_id", unique=True),
+        IndexModel([("kind", ASCENDING), ("status", ASCENDING), ("run_after", ASCENDING)], name="sc_kind_status_run_after"),
+        IndexModel([("kind", ASCENDING), ("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="sc_kind_status_lease"),
+        IndexModel([("finished_at", ASCENDING)], name="sc_finished_ttl",
+                   expireAfterSeconds=int(os.environ.get('JOB_RETENTION_SECONDS', str(7 * 24 * 3600))))
+    ],
+    "redlines": [
+        IndexModel([("id", ASCENDING)], name="sc_id", unique=True),
+        IndexModel([("connection_id", ASCENDING), ("user_id", ASCENDING)], name="sc_connection_user")
+    ]
+}
+
+INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+def _signature(spec: Dict[str, Any]) -> tuple:
+    return (
+        tuple((field, int(direction)) for field, direction in spec["key"]),
+        tuple((option, spec.get(option)) for option in INDEX_OPTIONS if spec.get(option) not in (None, False))
+    )
+
+async def ensure_indexes(db: AsyncIOMotorDatabase, indexes: Dict[str, List[IndexModel]] = INDEXES) -> Dict[str, Dict[str, List[str]]]:
+    report = {}
+    for collection_name, models in indexes.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        declared = {model.document["name"]: model for model in models}
+        created, rebuilt, dropped, failed = [], [], [], []
+        
+        for name, info in existing.items():
+            if not name.startswith(INDEX_PREFIX):
+                continue
+            model = declared.get(name)
+            if model is not None and _signature(info) == _signature({**model.document, "key": list(model.document["key"].items())}):
+                continue
+            await collection.drop_index(name)
+            (rebuilt if model is not None else dropped).append(name)
+        
+        missing = [model for name, model in declared.items() if name not in existing or name in rebuilt]
+        for model in missing:
+            name = model.document["name"]
+            try:
+                await collection.create_indexes([model])
+            except OperationFailure as e:
+                logger.error(f"Could not create index {collection_name}.{name}: {e}")
+                failed.append(name)
+                continue
+            if name not in rebuilt:
+                created.append(name)
+        
+        if created or rebuilt or dropped or failed:
+            logger.info(f"Indexes on {collection_name}: created={created} rebuilt={rebuilt} dropped={dropped} failed={failed}")
+        report[collection_name] = {"created": created, "rebuilt": rebuilt, "dropped": dropped, "failed": failed}
+    return report
\ No newline at end of file
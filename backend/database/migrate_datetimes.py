@@ -0,0 +1,112 @@
+# Run from backend/: python -m database.migrate_datetimes [--batch-size 1000] [--collection connections] [--restart]
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pathlib import Path
+from pymongo import UpdateOne
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+MIGRATION = "datetimes_v1"
+
+DATETIME_FIELDS = {
+    "users": ("created_at",),
+    "projects": ("created_at", "updated_at"),
+    "connections": ("created_at", "updated_at"),
+    "redlines": ("created_at", "updated_at"),
+    "audit_logs": ("timestamp",),
+    "result_cache": ("created_at",)
+}
+
+def parse_timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed.astimezone(timezone.utc)
+
+def converted_fields(document: Dict[str, Any], fields: Sequence[str]) -> Dict[str, datetime]:
+    converted = {}
+    for field in fields:
+        value = document.get(field)
+        if isinstance(value, str):
+            try:
+                converted[field] = parse_timestamp(value)
+            except ValueError:
+                logger.warning(f"Skipping unparseable {field}={value!r} on {document['_id']}")
+    return converted
+
+async def migrate_collection(db: AsyncIOMotorDatabase, name: str, fields: Sequence[str],
+                             batch_size: int = 1000, restart: bool = False) -> Dict[str, Any]:
+    progress = db.migrations
+    checkpoint_id = f"{MIGRATION}:{name}"
+    checkpoint = None if restart else await progress.find_one({"_id": checkpoint_id})
+    checkpoint = checkpoint or {"last_id": None, "scanned": 0, "converted": 0}
+    if checkpoint.get("done"):
+        logger.info(f"{name}: already migrated ({checkpoint['converted']} documents converted)")
+        return checkpoint
+    
+    query_fields = {"$or": [{field: {"$type": "string"}} for field in fields]}
+    last_id = checkpoint.get("last_id")
+    scanned, converted = checkpoint.get("scanned", 0), checkpoint.get("converted", 0)
+    
+    while True:
+        query = query_fields if last_id is None else {"$and": [{"_id": {"$gt": last_id}}, query_fields]}
+        batch = await db[name].find(query, {field: 1 for field in fields}).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+        
+        operations = []
+        for document in batch:
+            update = converted_fields(document, fields)
+            if update:
+                operations.append(UpdateOne(
+                    {"_id": document["_id"], **{field: document[field] for field in update}},
+                    {"$set": update}
+                ))
+        if operations:
+            result = await db[name].bulk_write(operations, ordered=False)
+            converted += result.modified_count
+        scanned += len(batch)
+        last_id = batch[-1]["_id"]
+        
+        await progress.update_one(
+            {"_id": checkpoint_id},
+            {"$set": {"last_id": last_id, "scanned": scanned, "converted": converted,
+                      "updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        logger.info(f"{name}: scanned {scanned}, converted {converted}")
+    
+    checkpoint = {"last_id": last_id, "scanned": scanned, "converted": converted, "done": True,
+                  "updated_at": datetime.now(timezone.utc)}
+    await progress.update_one({"_id": checkpoint_id}, {"$set": checkpoint}, upsert=True)
+    return checkpoint
+
+async def migrate(db: AsyncIOMotorDatabase, collections: Optional[List[str]] = None,
+                  batch_size: int = 1000, restart: bool = False) -> Dict[str, Dict[str, Any]]:
+    return {
+        name: await migrate_collection(db, name, DATETIME_FIELDS[name], batch_size, restart)
+        for name in collections or DATETIME_FIELDS
+    }
+
+async def main(collections: Optional[List[str]], batch_size: int, restart: bool) -> None:
+    from .client import DATABASE
+    try:
+        report = await migrate(DATABASE.connect(), collections, batch_size, restart)
+    finally:
+        DATABASE.close()
+    for name, checkpoint in report.items():
+        print(f"{name}: scanned {checkpoint['scanned']}, converted {checkpoint['converted']}")
+
+if __name__ == "__main__":
+    load_dotenv(Path(__file__).parent.parent / '.env')
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Convert ISO string timestamps to native BSON dates.")
+    parser.add_argument("--batch-size", type=int, default=int(os.environ.get('MIGRATION_BATCH_SIZE', '1000')))
+    parser.add_argument("--collection", action="append", choices=sorted(DATETIME_FIELDS), dest="collections")
+    parser.add_argument("--restart", action="store_true", help="Rescan collections already marked as migrated")
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.collections, arguments.batch_size, arguments.restart))
\ No newline at end of file
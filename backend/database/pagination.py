@@ -0,0 +1,47 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+Keys = Sequence[Tuple[str, int]]
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+def encode_cursor(document: Dict[str, Any], keys: Keys) -> str:
+    values = [_encode_value(document.get(field)) for field, _ in keys]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode()).decode().rstrip("=")
+
+def decode_cursor(token: str, keys: Keys) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Malformed pagination cursor")
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Pagination cursor does not match this listing")
+    return [_decode_value(value) for value in values]
+
+def keyset_filter(keys: Keys, values: Sequence[Any]) -> Dict[str, Any]:
+    clauses = []
+    for i, (field, direction) in enumerate(keys):
+        clause = {name: values[j] for j, (name, _) in enumerate(keys[:i])}
+        clause[field] = {"$gt" if direction > 0 else "$lt": values[i]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+def after_filter(query: Dict[str, Any], keys: Keys, after: Optional[str]) -> Dict[str, Any]:
+    if not after:
+        return query
+    return {"$and": [query, keyset_filter(keys, decode_cursor(after, keys))]}
+
+def with_keys(projection: Optional[Dict[str, Any]], keys: Keys) -> Optional[Dict[str, Any]]:
+    if not projection or not any(value for name, value in projection.items() if name != "_id"):
+        return projection
+    return {**projection, **{field: 1 for field, _ in keys}}
\ No newline at end of file
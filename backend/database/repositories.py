@@ -0,0 +1,315 @@
+import time
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from .client import DATABASE, Database
+from .pagination import Keys, after_filter, encode_cursor, with_keys
+
+Projection = Optional[Dict[str, Any]]
+Sort = Optional[Sequence[Tuple[str, int]]]
+
+NO_ID = {"_id": 0}
+
+class Repository:
+    collection_name: str = ""
+    
+    def __init__(self, database: Database = DATABASE):
+        self.database = database
+    
+    @property
+    def collection(self) -> AsyncIOMotorCollection:
+        return self.database.db[self.collection_name]
+    
+    def _record(self, operation: str, started: float, failed: bool = False,
+                query: Optional[Dict[str, Any]] = None, sort: Sort = None) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.database.operations.record(self.collection_name, operation, elapsed_ms, failed)
+        self.database.slow_queries.observe(self.collection, operation, query, sort, elapsed_ms)
+    
+    async def _timed(self, operation: str, awaitable, query: Optional[Dict[str, Any]] = None, sort: Sort = None) -> Any:
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await awaitable
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._record(operation, started, failed, query, sort)
+    
+    def _cursor(self, query: Dict[str, Any], projection: Projection = None, sort: Sort = None,
+                limit: int = 0, batch_size: Optional[int] = None):
+        cursor = self.collection.find(query, NO_ID if projection is None else projection)
+        if sort:
+            cursor = cursor.sort(list(sort))
+        if limit:
+            cursor = cursor.limit(limit)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        return cursor
+    
+    async def find_one(self, query: Dict[str, Any], projection: Projection = None) -> Optional[Dict[str, Any]]:
+        return await self._timed("find_one", self.collection.find_one(query, NO_ID if projection is None else projection), query)
+    
+    async def find(self, query: Dict[str, Any], projection: Projection = None, sort: Sort = None,
+                   limit: int = 0) -> List[Dict[str, Any]]:
+        return await self._timed("find", self._cursor(query, projection, sort, limit).to_list(limit or None), query, sort)
+    
+    async def page(self, query: Dict[str, Any], keys: Keys, after: Optional[str] = None, limit: int = 100,
+                   projection: Projection = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        documents = await self.find(after_filter(query, keys, after), with_keys(projection, keys), keys, limit + 1)
+        if len(documents) <= limit:
+            return documents, None
+        documents = documents[:limit]
+        return documents, encode_cursor(documents[-1], keys)
+    
+    def stream(self, query: Dict[str, Any], projection: Projection = None, sort: Sort = None,
+               limit: int = 0, batch_size: Optional[int] = None,
+               after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        if after:
+            query = after_filter(query, sort, after)
+        return self._iterate(self._cursor(query, projection, sort, limit, batch_size), query, sort)
+    
+    async def _iterate(self, cursor, query: Dict[str, Any], sort: Sort) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            started = time.perf_counter()
+            try:
+                document = await cursor.next()
+            except StopAsyncIteration:
+                break
+            finally:
+                self._record("stream", started, query=query, sort=sort)
+            yield document
+    
+    async def count(self, query: Dict[str, Any]) -> int:
+        return await self._timed("count", self.collection.count_documents(query), query)
+    
+    async def insert_one(self, document: Dict[str, Any]) -> None:
+        await self._timed("insert_one", self.collection.insert_one(document))
+    
+    async def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = True) -> None:
+        await self._timed("insert_many", self.collection.insert_many(documents, ordered=ordered))
+    
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        return await self._timed("update_one", self.collection.update_one(query, update, upsert=upsert), query)
+    
+    async def update_many(self, query: Dict[str, Any], update: Dict[str, Any]) -> int:
+        result = await self._timed("update_many", self.collection.update_many(query, update), query)
+        return result.modified_count
+    
+    async def find_one_and_update(self, query: Dict[str, Any], update: Dict[str, Any],
+                                  projection: Projection = None, sort: Sort = None) -> Optional[Dict[str, Any]]:
+        return await self._timed("find_one_and_update", self.collection.find_one_and_update(
+            query, update, projection=NO_ID if projection is None else projection,
+            sort=list(sort) if sort else None, return_document=ReturnDocument.AFTER
+        ), query, sort)
+    
+    async def replace_one(self, query: Dict[str, Any], document: Dict[str, Any], upsert: bool = False):
+        return await self._timed("replace_one", self.collection.replace_one(query, document, upsert=upsert), query)
+    
+    async def delete_one(self, query: Dict[str, Any]) -> int:
+        result = await self._timed("delete_one", self.collection.delete_one(query), query)
+        return result.deleted_count
+    
+    async def delete_many(self, query: Dict[str, Any]) -> int:
+        result = await self._timed("delete_many", self.collection.delete_many(query), query)
+        return result.deleted_count
+    
+    async def bulk_write(self, operations: List[Any], ordered: bool = True):
+        return await self._timed("bulk_write", self.collection.bulk_write(operations, ordered=ordered))
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "collection": self.collection_name,
+            "pool": self.database.pool.snapshot(),
+            "operations": self.database.operations.snapshot(self.collection_name)
+        }
+
+CREATED_ORDER = (("created_at", 1), ("id", 1))
+NEWEST_FIRST = (("timestamp", -1), ("id", -1))
+
+class UserRepo(Repository):
+    collection_name = "users"
+    
+    async def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return await self.find_one({"id": user_id})
+    
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        return await self.find_one({"email": email})
+
+class VersionedRepo(Repository):
+    
+    async def apply_update(self, entity_id: str, fields: Dict[str, Any], user_id: Optional[str] = None,
+                           version_filter: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        query = {"id": entity_id}
+        if user_id is not None:
+            query["user_id"] = user_id
+        if version_filter:
+            query.update(version_filter)
+        update = {"$inc": {"version": 1}}
+        if fields:
+            update["$set"] = fields
+        return await self.find_one_and_update(query, update)
+    
+    async def update(self, entity_id: str, fields: Dict[str, Any]) -> None:
+        await self.update_one({"id": entity_id}, {"$set": fields, "$inc": {"version": 1}})
+    
+    async def current_version(self, entity_id: str, user_id: str) -> Optional[int]:
+        document = await self.find_one({"id": entity_id, "user_id": user_id}, {"_id": 0, "version": 1})
+        return None if document is None else document.get("version") or 0
+
+class ProjectRepo(VersionedRepo):
+    collection_name = "projects"
+    
+    async def get(self, project_id: str, user_id: Optional[str] = None, projection: Projection = None) -> Optional[Dict[str, Any]]:
+        query = {"id": project_id}
+        if user_id is not None:
+            query["user_id"] = user_id
+        return await self.find_one(query, projection)
+    
+    async def page_for_user(self, user_id: str, after: Optional[str] = None,
+                            limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await self.page({"user_id": user_id}, CREATED_ORDER, after, limit)
+    
+    def stream_for_user(self, user_id: str, after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        return self.stream({"user_id": user_id}, sort=CREATED_ORDER, after=after)
+    
+    async def owned_ids(self, project_ids: List[str], user_id: str) -> List[str]:
+        documents = await self.find({"id": {"$in": list(project_ids)}, "user_id": user_id}, {"_id": 0, "id": 1})
+        return [document["id"] for document in documents]
+    
+    async def increment_connection_count(self, project_id: str, delta: int) -> None:
+        await self.update_one({"id": project_id}, {"$inc": {"connection_count": delta, "version": 1}})
+    
+    async def delete(self, project_id: str, user_id: str) -> bool:
+        return await self.delete_one({"id": project_id, "user_id": user_id}) > 0
+
+class ConnectionRepo(VersionedRepo):
+    collection_name = "connections"
+    
+    async def get(self, connection_id: str, user_id: Optional[str] = None, projection: Projection = None) -> Optional[Dict[str, Any]]:
+        query = {"id": connection_id}
+        if user_id is not None:
+            query["user_id"] = user_id
+        return await self.find_one(query, projection)
+    
+    async def get_many(self, connection_ids: List[str], user_id: str, projection: Projection = None) -> List[Dict[str, Any]]:
+        return await self.find({"id": {"$in": list(connection_ids)}, "user_id": user_id}, projection)
+    
+    @staticmethod
+    def _user_query(user_id: str, project_id: Optional[str]) -> Dict[str, Any]:
+        query = {"user_id": user_id}
+        if project_id:
+            query["project_id"] = project_id
+        return query
+    
+    async def page_for_user(self, user_id: str, project_id: Optional[str] = None, after: Optional[str] = None,
+                            limit: int = 100, projection: Projection = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await self.page(self._user_query(user_id, project_id), CREATED_ORDER, after, limit, projection)
+    
+    def stream_for_user(self, user_id: str, project_id: Optional[str] = None, after: Optional[str] = None,
+                        projection: Projection = None) -> AsyncIterator[Dict[str, Any]]:
+        return self.stream(self._user_query(user_id, project_id), projection, CREATED_ORDER, after=after)
+    
+    async def list_for_project(self, project_id: str, user_id: str, projection: Projection = None) -> List[Dict[str, Any]]:
+        return await self.find({"project_id": project_id, "user_id": user_id}, projection)
+    
+    def stream_for_project(self, project_id: str, user_id: str, projection: Projection = None,
+                           batch_size: Optional[int] = None, standalone: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        query = {"project_id": project_id, "user_id": user_id}
+        if standalone:
+            query["typical_id"] = None
+        return self.stream(query, projection, batch_size=batch_size)
+    
+    async def list_for_typical(self, typical_id: str, user_id: str, projection: Projection = None) -> List[Dict[str, Any]]:
+        return await self.find({"typical_id": typical_id, "user_id": user_id}, projection)
+    
+    async def delete_for_typical(self, typical_id: str, user_id: str) -> int:
+        return await self.delete_many({"typical_id": typical_id, "user_id": user_id})
+    
+    async def delete(self, connection_id: str, user_id: str) -> bool:
+        return await self.delete_one({"id": connection_id, "user_id": user_id}) > 0
+    
+    async def delete_for_project(self, project_id: str) -> int:
+        return await self.delete_many({"project_id": project_id})
+
+class TypicalRepo(VersionedRepo):
+    collection_name = "typicals"
+    
+    async def get(self, typical_id: str, user_id: Optional[str] = None, projection: Projection = None) -> Optional[Dict[str, Any]]:
+        query = {"id": typical_id}
+        if user_id is not None:
+            query["user_id"] = user_id
+        return await self.find_one(query, projection)
+    
+    async def page_for_user(self, user_id: str, project_id: Optional[str] = None, after: Optional[str] = None,
+                            limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await self.page(ConnectionRepo._user_query(user_id, project_id), CREATED_ORDER, after, limit)
+    
+    def stream_for_user(self, user_id: str, project_id: Optional[str] = None,
+                        after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        return self.stream(ConnectionRepo._user_query(user_id, project_id), sort=CREATED_ORDER, after=after)
+    
+    async def list_for_project(self, project_id: str, user_id: str) -> List[Dict[str, Any]]:
+        return await self.find({"project_id": project_id, "user_id": user_id}, sort=CREATED_ORDER)
+    
+    async def increment_instance_count(self, typical_id: str, delta: int) -> None:
+        await self.update_one({"id": typical_id}, {"$inc": {"instance_count": delta, "version": 1}})
+    
+    async def delete(self, typical_id: str, user_id: str) -> bool:
+        return await self.delete_one({"id": typical_id, "user_id": user_id}) > 0
+    
+    async def delete_for_project(self, project_id: str) -> int:
+        return await self.delete_many({"project_id": project_id})
+
+class DesignResultRepo(Repository):
+    collection_name = "design_results"
+    
+    async def get_many(self, keys: List[str], projection: Projection = None) -> Dict[str, Dict[str, Any]]:
+        documents = await self.find({"_id": {"$in": list(keys)}}, {"parameters": 0} if projection is None else projection)
+        return {document["_id"]: document for document in documents}
+
+class RedlineRepo(Repository):
+    collection_name = "redlines"
+    
+    async def get(self, redline_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        return await self.find_one({"id": redline_id, "user_id": user_id})
+    
+    async def list_for_connection(self, connection_id: str, user_id: str) -> List[Dict[str, Any]]:
+        return await self.find({"connection_id": connection_id, "user_id": user_id}, limit=100)
+    
+    async def update(self, redline_id: str, fields: Dict[str, Any]) -> None:
+        await self.update_one({"id": redline_id}, {"$set": fields})
+
+class AuditRepo(Repository):
+    collection_name = "audit_logs"
+    
+    async def page_for_connection(self, connection_id: str, after: Optional[str] = None,
+                                  limit: int = 1000) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await self.page({"connection_id": connection_id}, NEWEST_FIRST, after, limit)
+    
+    def stream_for_connection(self, connection_id: str, after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        return self.stream({"connection_id": connection_id}, sort=NEWEST_FIRST, after=after)
+    
+    async def page_for_user(self, user_id: str, after: Optional[str] = None,
+                            limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await self.page({"user_id": user_id}, NEWEST_FIRST, after, limit)
+    
+    def stream_for_user(self, user_id: str, after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        return self.stream({"user_id": user_id}, sort=NEWEST_FIRST, after=after)
+
+class JobRepo(Repository):
+    collection_name = "jobs"
+    
+    async def get(self, job_id: str, user_id: Optional[str] = None, projection: Projection = None) -> Optional[Dict[str, Any]]:
+        query = {"id": job_id}
+        if user_id is not None:
+            query["user_id"] = user_id
+        return await self.find_one(query, projection)
+    
+    async def update_leased(self, job_id: str, owner: str, update: Dict[str, Any],
+                            projection: Projection = None) -> Optional[Dict[str, Any]]:
+        return await self.find_one_and_update({"id": job_id, "lease_owner": owner}, update, projection)
+
+class ResultCacheRepo(Repository):
+    collection_name = "result_cache"
\ No newline at end of file
@@ -0,0 +1,70 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from motor.motor_asyncio import AsyncIOMotorCollection
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = {"find", "find_one", "stream", "count", "update_one", "find_one_and_update", "delete_one", "delete_many"}
+
+def query_shape(query: Any) -> Any:
+    if isinstance(query, dict):
+        return {key: query_shape(value) if key.startswith("$") or isinstance(value, dict) else "?"
+                for key, value in query.items()}
+    if isinstance(query, list):
+        return [query_shape(item) for item in query]
+    return "?"
+
+def plan_summary(explain: Dict[str, Any]) -> str:
+    stages: List[str] = []
+    plan = (explain.get("queryPlanner") or {}).get("winningPlan") or {}
+    while plan:
+        stage = plan.get("stage", "?")
+        if plan.get("indexName"):
+            stage += f"({plan['indexName']})"
+        stages.append(stage)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0] or plan.get("queryPlan")
+    return " <- ".join(stages) or "unknown"
+
+class SlowQueryLog:
+    
+    def __init__(self, threshold_ms: Optional[float] = None, cooldown_seconds: float = 60.0):
+        self.threshold_ms = threshold_ms if threshold_ms is not None else float(os.environ.get('MONGO_SLOW_QUERY_MS', '100'))
+        self.cooldown_seconds = cooldown_seconds
+        self.count = 0
+        self._explained: Dict[str, float] = {}
+        self._tasks = set()
+    
+    def observe(self, collection: AsyncIOMotorCollection, operation: str, query: Optional[Dict[str, Any]],
+                sort: Any, elapsed_ms: float) -> None:
+        if self.threshold_ms <= 0 or elapsed_ms < self.threshold_ms:
+            return
+        self.count += 1
+        shape = json.dumps({"filter": query_shape(query or {}), "sort": sort}, sort_keys=True, default=str)
+        message = f"Slow {collection.name}.{operation} {elapsed_ms:.1f} ms shape={shape}"
+        
+        now = time.monotonic()
+        key = f"{collection.name}.{operation}:{shape}"
+        if operation not in EXPLAINABLE or query is None or now - self._explained.get(key, -self.cooldown_seconds) < self.cooldown_seconds:
+            logger.warning(message)
+            return
+        self._explained[key] = now
+        task = asyncio.get_running_loop().create_task(self._explain(collection, query, sort, message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _explain(self, collection: AsyncIOMotorCollection, query: Dict[str, Any], sort: Any, message: str) -> None:
+        command = {"find": collection.name, "filter": query}
+        if sort:
+            command["sort"] = dict(sort)
+        try:
+            plan = plan_summary(await collection.database.command({"explain": command, "verbosity": "queryPlanner"}))
+        except Exception as e:
+            plan = f"explain failed: {e}"
+        logger.warning(f"{message} plan={plan}")
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"threshold_ms": self.threshold_ms, "slow_operations": self.count}
\ No newline at end of file
@@ -1,4 +1,4 @@
 from .generator import GeometryGenerator
-from .components import Bolt, Plate, Weld
+from .components import Bolt, BoltPattern, Plate, Weld, WeldGroup
 
-__all__ = ['GeometryGenerator', 'Bolt', 'Plate', 'Weld']
\ No newline at end of file
+__all__ = ['GeometryGenerator', 'Bolt', 'BoltPattern', 'Plate', 'Weld', 'WeldGroup']
\ No newline at end of file
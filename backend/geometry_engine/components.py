@@ -1,5 +1,6 @@
+import numpy as np
 from pydantic import BaseModel
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 
 class Point3D(BaseModel):
     x: float
@@ -23,4 +24,54 @@ class Weld(BaseModel):
     start_point: Point3D
     end_point: Point3D
     weld_size: float
-    weld_type: str = "fillet"
\ No newline at end of file
+    weld_type: str = "fillet"
+
+class BoltPattern:
+    __slots__ = ('positions', 'diameter', 'grade', 'hole_type')
+    
+    def __init__(self, positions: np.ndarray, diameter: float, grade: str, hole_type: str = "standard"):
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        self.diameter = diameter
+        self.grade = grade
+        self.hole_type = hole_type
+    
+    def __len__(self) -> int:
+        return len(self.positions)
+    
+    @classmethod
+    def from_list(cls, bolts: List[Dict[str, Any]]) -> "BoltPattern":
+        first = bolts[0] if bolts else {}
+        positions = [(b["position"]["x"], b["position"]["y"], b["position"]["z"]) for b in bolts]
+        return cls(np.array(positions, dtype=np.float64).reshape(-1, 3), first.get("diameter", 0.0),
+                   first.get("grade", ""), first.get("hole_type", "standard"))
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        diameter = float(self.diameter)
+        return [
+            {"position": {"x": x, "y": y, "z": z}, "diameter": diameter, "grade": self.grade, "hole_type": self.hole_type}
+            for x, y, z in self.positions.tolist()
+        ]
+
+class WeldGroup:
+    __slots__ = ('lines', 'weld_size', 'weld_type')
+    
+    def __init__(self, lines: np.ndarray, weld_size: float, weld_type: str = "fillet"):
+        self.lines = np.asarray(lines, dtype=np.float64).reshape(-1, 2, 3)
+        self.weld_size = weld_size
+        self.weld_type = weld_type
+    
+    def __len__(self) -> int:
+        return len(self.lines)
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        weld_size = float(self.weld_size)
+        return [
+            {"start_point": {"x": sx, "y": sy, "z": sz}, "end_point": {"x": ex, "y": ey, "z": ez},
+             "weld_size": weld_size, "weld_type": self.weld_type}
+            for (sx, sy, sz), (ex, ey, ez) in self.lines.tolist()
+        ]
+
+COMPONENT_TYPES = (BoltPattern, WeldGroup)
+
+def materialize(geometry: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: value.to_list() if isinstance(value, COMPONENT_TYPES) else value for name, value in geometry.items()}
\ No newline at end of file
@@ -0,0 +1,140 @@
+import json
+import struct
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from .components import BoltPattern, WeldGroup, materialize
+
+MAGIC = b"SGEO"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sBBHI")
+ALIGNMENT = 8
+
+FLOAT_TYPES = {4: np.dtype("<f4"), 8: np.dtype("<f8")}
+
+MEDIA_TYPE = "application/octet-stream"
+
+def _uniform(items: List[Dict[str, Any]], keys: Tuple[str, ...]) -> bool:
+    return all(all(item.get(key) == items[0].get(key) for key in keys) for item in items)
+
+def _point(point: Dict[str, Any]) -> Tuple[float, float, float]:
+    return point["x"], point["y"], point["z"]
+
+def encode_geometry(geometry: Dict[str, Any], precision: int = 8) -> bytes:
+    if precision not in FLOAT_TYPES:
+        raise ValueError(f"Unsupported precision {precision}; use 4 or 8")
+    dtype = FLOAT_TYPES[precision]
+    buffers: List[np.ndarray] = []
+    
+    def buffer(values: Any, shape: Tuple[int, ...]) -> int:
+        buffers.append(np.asarray(values, dtype=dtype).reshape(shape))
+        return len(buffers) - 1
+    
+    def pack(name: str, value: Any) -> Any:
+        if isinstance(value, BoltPattern):
+            return {"$buffer": buffer(value.positions, (-1, 3)), "kind": "bolts",
+                    "diameter": value.diameter, "grade": value.grade, "hole_type": value.hole_type}
+        if isinstance(value, WeldGroup):
+            return {"$buffer": buffer(value.lines, (-1, 2, 3)), "kind": "welds",
+                    "weld_size": value.weld_size, "weld_type": value.weld_type}
+        if isinstance(value, dict):
+            return {key: pack(key, item) for key, item in value.items()}
+        if not isinstance(value, list) or not value or not all(isinstance(item, dict) for item in value):
+            return value
+        if name == "bolts" and all("position" in item for item in value) and \
+                _uniform(value, ("diameter", "grade", "hole_type")):
+            first = value[0]
+            return {"$buffer": buffer([_point(item["position"]) for item in value], (-1, 3)), "kind": "bolts",
+                    "diameter": first.get("diameter"), "grade": first.get("grade"), "hole_type": first.get("hole_type", "standard")}
+        if name == "corner_points" and all(set(item) == {"x", "y", "z"} for item in value):
+            return {"$buffer": buffer([_point(item) for item in value], (-1, 3)), "kind": "points"}
+        if name == "welds" and all("start_point" in item and "end_point" in item for item in value) and \
+                _uniform(value, ("weld_size", "weld_type")):
+            first = value[0]
+            lines = [(_point(item["start_point"]), _point(item["end_point"])) for item in value]
+            return {"$buffer": buffer(lines, (-1, 2, 3)), "kind": "welds",
+                    "weld_size": first.get("weld_size"), "weld_type": first.get("weld_type", "fillet")}
+        return value
+    
+    skeleton = {key: pack(key, value) for key, value in geometry.items()}
+    
+    offset = 0
+    layout = []
+    for values in buffers:
+        layout.append({"offset": offset, "shape": list(values.shape)})
+        offset += values.nbytes
+    metadata = json.dumps({"geometry": skeleton, "buffers": layout}, separators=(",", ":")).encode()
+    metadata += b" " * (-(HEADER.size + len(metadata)) % ALIGNMENT)
+    
+    return b"".join([HEADER.pack(MAGIC, FORMAT_VERSION, precision, 0, len(metadata)), metadata] +
+                    [values.tobytes() for values in buffers])
+
+class PackedGeometry:
+    __slots__ = ('data', 'precision', 'skeleton', 'layout', '_start')
+    
+    def __init__(self, data: bytes):
+        data = bytes(data)
+        if len(data) < HEADER.size:
+            raise ValueError("Packed geometry is truncated")
+        magic, version, precision, _, metadata_length = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a packed geometry buffer")
+        if version != FORMAT_VERSION or precision not in FLOAT_TYPES:
+            raise ValueError(f"Unsupported packed geometry version {version} (precision {precision})")
+        metadata = json.loads(data[HEADER.size:HEADER.size + metadata_length])
+        self.data = data
+        self.precision = precision
+        self.skeleton = metadata["geometry"]
+        self.layout = metadata["buffers"]
+        self._start = HEADER.size + metadata_length
+    
+    def array(self, index: int) -> np.ndarray:
+        entry = self.layout[index]
+        dtype = FLOAT_TYPES[self.precision]
+        count = int(np.prod(entry["shape"]))
+        return np.frombuffer(self.data, dtype=dtype, count=count, offset=self._start + entry["offset"]).reshape(entry["shape"])
+    
+    def bolt_positions(self) -> np.ndarray:
+        bolts = self.skeleton.get("bolts")
+        if isinstance(bolts, dict) and "$buffer" in bolts:
+            return self.array(bolts["$buffer"]).astype(np.float64)
+        return np.zeros((0, 3))
+    
+    def build(self) -> Dict[str, Any]:
+        def unpack(value: Any) -> Any:
+            if isinstance(value, dict):
+                if "$buffer" not in value:
+                    return {key: unpack(item) for key, item in value.items()}
+                values = self.array(value["$buffer"]).astype(np.float64)
+                if value["kind"] == "bolts":
+                    return BoltPattern(values, value["diameter"], value["grade"], value["hole_type"])
+                if value["kind"] == "welds":
+                    return WeldGroup(values, value["weld_size"], value["weld_type"])
+                return [{"x": x, "y": y, "z": z} for x, y, z in values.tolist()]
+            return value
+        
+        return {key: unpack(value) for key, value in self.skeleton.items()}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return materialize(self.build())
+
+def decode_geometry(data: bytes) -> Dict[str, Any]:
+    return PackedGeometry(data).to_dict()
+
+def packed_fields(geometry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"geometry": None, "geometry_packed": encode_geometry(geometry) if geometry else None}
+
+def stored_components(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if document.get("geometry_packed") is not None:
+        return PackedGeometry(document["geometry_packed"]).build()
+    return document.get("geometry")
+
+def stored_geometry(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if document.get("geometry_packed") is not None:
+        return decode_geometry(document["geometry_packed"])
+    return document.get("geometry")
+
+def unpack_document(document: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if document:
+        document["geometry"] = stored_geometry(document)
+        document.pop("geometry_packed", None)
+    return document
\ No newline at end of file
@@ -1,23 +1,138 @@
-from typing import Dict, Any, List
-from .components import Bolt, Plate, Weld, Point3D
+import math
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Set
+from shape_service import shapes
+from shape_service.shapes import resolve_sections, derived_parameters
+from utils.fingerprint import source_fingerprint
+from .components import Plate, Point3D, BoltPattern, WeldGroup, materialize
+
+SOURCES = (Path(__file__).parent, Path(shapes.__file__), shapes.SOURCE_PATH)
+
+ALL_PIECES = frozenset({"plate", "angle", "bolts", "welds", "dimensions"})
+
+PIECE_DEPENDENCIES = {
+    "single_plate": {
+        "plate": {"num_bolts", "bolt_spacing", "edge_distance", "plate_thickness", "plate_width", "plate_grade"},
+        "bolts": {"num_bolts", "bolt_diameter", "bolt_spacing", "edge_distance", "plate_width", "bolt_grade", "hole_type"},
+        "welds": {"num_bolts", "bolt_spacing", "edge_distance", "plate_thickness", "weld_size", "weld_type"},
+        "dimensions": {"num_bolts", "bolt_spacing", "edge_distance", "plate_thickness", "plate_width"}
+    },
+    "double_angle": {
+        "angle": {"num_bolts", "bolt_spacing", "edge_distance", "angle_size", "angle_thickness"},
+        "bolts": {"num_bolts", "bolt_diameter", "bolt_spacing", "edge_distance", "bolt_grade", "hole_type"},
+        "dimensions": {"num_bolts", "bolt_spacing", "edge_distance"}
+    },
+    "end_plate": {
+        "plate": {"num_bolts_vertical", "num_bolts_horizontal", "bolt_spacing_vertical", "bolt_spacing_horizontal",
+                  "edge_distance", "plate_thickness", "plate_grade"},
+        "bolts": {"num_bolts_vertical", "num_bolts_horizontal", "bolt_diameter", "bolt_spacing_vertical",
+                  "bolt_spacing_horizontal", "edge_distance", "bolt_grade", "hole_type"},
+        "welds": {"num_bolts_vertical", "num_bolts_horizontal", "bolt_spacing_vertical", "bolt_spacing_horizontal",
+                  "edge_distance", "plate_thickness", "beam_web_thickness", "weld_size", "weld_type"},
+        "dimensions": {"num_bolts_vertical", "num_bolts_horizontal", "bolt_spacing_vertical", "bolt_spacing_horizontal",
+                       "edge_distance", "plate_thickness"}
+    }
+}
 
 class GeometryGenerator:
     
+    VERSION = f"1+{source_fingerprint(*SOURCES)}"
+    
     @staticmethod
     def generate_connection(connection_type: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
-        if connection_type == "single_plate":
-            return GeometryGenerator._generate_single_plate(parameters)
-        elif connection_type == "double_angle":
-            return GeometryGenerator._generate_double_angle(parameters)
-        elif connection_type == "end_plate":
-            return GeometryGenerator._generate_end_plate(parameters)
-        elif connection_type in ["beam_to_column_shear", "beam_to_beam_shear"]:
-            return GeometryGenerator._generate_shear_connection(parameters)
-        else:
+        return materialize(GeometryGenerator.build(connection_type, parameters))
+    
+    @staticmethod
+    def build(connection_type: str, parameters: Dict[str, Any], pieces: Iterable[str] = ALL_PIECES) -> Dict[str, Any]:
+        branch = GeometryGenerator.branch(connection_type, parameters)
+        if branch is None:
             return {"error": "Unknown connection type"}
+        return GeometryGenerator._generate_branch(branch, resolve_sections(parameters), pieces)
+    
+    @staticmethod
+    def branch(connection_type: str, parameters: Dict[str, Any]) -> Optional[str]:
+        if connection_type in ["single_plate", "double_angle", "end_plate"]:
+            return connection_type
+        elif connection_type in ["beam_to_column_shear", "beam_to_beam_shear"]:
+            return 'single_plate' if parameters.get('subtype', 'single_plate') == 'single_plate' else 'double_angle'
+        return None
+    
+    @staticmethod
+    def bolt_positions(connection_type: str, parameters: Dict[str, Any]) -> np.ndarray:
+        branch = GeometryGenerator.branch(connection_type, parameters)
+        if branch == "end_plate":
+            num_bolts_vertical = parameters.get('num_bolts_vertical', 4)
+            num_bolts_horizontal = parameters.get('num_bolts_horizontal', 2)
+            edge_distance = parameters.get('edge_distance', 1.75)
+            rows = edge_distance + np.arange(max(num_bolts_vertical, 0)) * parameters.get('bolt_spacing_vertical', 3.0)
+            columns = edge_distance + np.arange(max(num_bolts_horizontal, 0)) * parameters.get('bolt_spacing_horizontal', 3.5)
+            y, x = np.meshgrid(rows, columns, indexing='ij')
+            return np.column_stack([x.ravel(), y.ravel(), np.zeros(x.size)])
+        
+        num_bolts = max(parameters.get('num_bolts', 4), 0)
+        y = parameters.get('edge_distance', 1.5) + np.arange(num_bolts) * parameters.get('bolt_spacing', 3.0)
+        x = parameters.get('plate_width', 5.0) / 2 if branch == "single_plate" else 2.0
+        return np.column_stack([np.full(num_bolts, x, dtype=np.float64), y, np.zeros(num_bolts)])
+    
+    @staticmethod
+    def weld_size(parameters: Dict[str, Any], default_thickness: float) -> float:
+        weld_size = parameters.get('weld_size')
+        if weld_size:
+            return weld_size
+        return math.ceil(0.625 * parameters.get('plate_thickness', default_thickness) * 16 - 1e-9) / 16
+    
+    @staticmethod
+    def weld_lines(connection_type: str, parameters: Dict[str, Any]) -> np.ndarray:
+        branch = GeometryGenerator.branch(connection_type, parameters)
+        if branch == "single_plate":
+            num_bolts = parameters.get('num_bolts', 4)
+            plate_length = (num_bolts - 1) * parameters.get('bolt_spacing', 3.0) + 2 * parameters.get('edge_distance', 1.5)
+            plate_thickness = parameters.get('plate_thickness', 0.375)
+            return np.array([
+                [[0.0, 0.0, 0.0], [0.0, plate_length, 0.0]],
+                [[0.0, 0.0, plate_thickness], [0.0, plate_length, plate_thickness]]
+            ])
+        elif branch == "end_plate":
+            edge_distance = parameters.get('edge_distance', 1.75)
+            weld_length = (parameters.get('num_bolts_vertical', 4) - 1) * parameters.get('bolt_spacing_vertical', 3.0)
+            plate_width = (parameters.get('num_bolts_horizontal', 2) - 1) * parameters.get('bolt_spacing_horizontal', 3.5) + 2 * edge_distance
+            web_face = parameters.get('beam_web_thickness', 0.3) / 2
+            plate_thickness = parameters.get('plate_thickness', 0.5)
+            return np.array([
+                [[plate_width / 2 - web_face, edge_distance, plate_thickness], [plate_width / 2 - web_face, edge_distance + weld_length, plate_thickness]],
+                [[plate_width / 2 + web_face, edge_distance, plate_thickness], [plate_width / 2 + web_face, edge_distance + weld_length, plate_thickness]]
+            ])
+        return np.zeros((0, 2, 3))
+    
+    @staticmethod
+    def stale_pieces(branch: str, changed: Iterable[str]) -> Set[str]:
+        changed = set(changed)
+        return {piece for piece, dependencies in PIECE_DEPENDENCIES[branch].items() if dependencies & changed}
+    
+    @staticmethod
+    def regenerate(connection_type: str, parameters: Dict[str, Any], previous: Optional[Dict[str, Any]],
+                   changed: Iterable[str]) -> Dict[str, Any]:
+        branch = GeometryGenerator.branch(connection_type, parameters)
+        if branch is None or not previous or previous.get("type") != branch:
+            return GeometryGenerator.build(connection_type, parameters)
+        
+        stale = GeometryGenerator.stale_pieces(branch, derived_parameters(changed))
+        if not stale:
+            return previous
+        
+        return {**previous, **GeometryGenerator._generate_branch(branch, resolve_sections(parameters), stale)}
+    
+    @staticmethod
+    def _generate_branch(branch: str, params: Dict[str, Any], pieces: Iterable[str]) -> Dict[str, Any]:
+        if branch == "single_plate":
+            return GeometryGenerator._generate_single_plate(params, pieces)
+        elif branch == "double_angle":
+            return GeometryGenerator._generate_double_angle(params, pieces)
+        return GeometryGenerator._generate_end_plate(params, pieces)
     
     @staticmethod
-    def _generate_single_plate(params: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_single_plate(params: Dict[str, Any], pieces: Iterable[str] = ALL_PIECES) -> Dict[str, Any]:
         num_bolts = params.get('num_bolts', 4)
         bolt_diameter = params.get('bolt_diameter', 0.75)
         bolt_spacing = params.get('bolt_spacing', 3.0)
@@ -27,42 +142,46 @@ class GeometryGenerator:
         
         plate_length = (num_bolts - 1) * bolt_spacing + 2 * edge_distance
         
-        plate = Plate(
-            length=plate_length,
-            width=plate_width,
-            thickness=plate_thickness,
-            material=params.get('plate_grade', 'A36'),
-            corner_points=[
-                Point3D(x=0, y=0, z=0),
-                Point3D(x=plate_length, y=0, z=0),
-                Point3D(x=plate_length, y=plate_width, z=0),
-                Point3D(x=0, y=plate_width, z=0)
-            ]
-        )
-        
-        bolts = []
-        for i in range(num_bolts):
-            y_pos = edge_distance + i * bolt_spacing
-            bolts.append(Bolt(
-                position=Point3D(x=plate_width/2, y=y_pos, z=0),
-                diameter=bolt_diameter,
-                grade=params.get('bolt_grade', 'A325')
-            ))
-        
-        return {
-            "type": "single_plate",
-            "plate": plate.model_dump(),
-            "bolts": [b.model_dump() for b in bolts],
-            "dimensions": {
+        geometry = {"type": "single_plate"}
+        
+        if "plate" in pieces:
+            plate = Plate(
+                length=plate_length,
+                width=plate_width,
+                thickness=plate_thickness,
+                material=params.get('plate_grade', 'A36'),
+                corner_points=[
+                    Point3D(x=0, y=0, z=0),
+                    Point3D(x=plate_length, y=0, z=0),
+                    Point3D(x=plate_length, y=plate_width, z=0),
+                    Point3D(x=0, y=plate_width, z=0)
+                ]
+            )
+            geometry["plate"] = plate.model_dump()
+        
+        if "bolts" in pieces:
+            geometry["bolts"] = BoltPattern(
+                GeometryGenerator.bolt_positions("single_plate", params),
+                bolt_diameter,
+                params.get('bolt_grade', 'A325'),
+                params.get('hole_type', 'standard')
+            )
+        
+        if "welds" in pieces:
+            geometry["welds"] = GeometryGenerator._welds("single_plate", params, 0.375)
+        
+        if "dimensions" in pieces:
+            geometry["dimensions"] = {
                 "plate_length": plate_length,
                 "plate_width": plate_width,
                 "plate_thickness": plate_thickness,
                 "num_bolts": num_bolts
             }
-        }
+        
+        return geometry
     
     @staticmethod
-    def _generate_double_angle(params: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_double_angle(params: Dict[str, Any], pieces: Iterable[str] = ALL_PIECES) -> Dict[str, Any]:
         num_bolts = params.get('num_bolts', 4)
         bolt_diameter = params.get('bolt_diameter', 0.75)
         bolt_spacing = params.get('bolt_spacing', 3.0)
@@ -71,29 +190,35 @@ class GeometryGenerator:
         
         angle_length = (num_bolts - 1) * bolt_spacing + 2 * edge_distance
         
-        bolts = []
-        for i in range(num_bolts):
-            y_pos = edge_distance + i * bolt_spacing
-            bolts.append(Bolt(
-                position=Point3D(x=2, y=y_pos, z=0),
-                diameter=bolt_diameter,
-                grade=params.get('bolt_grade', 'A325')
-            ))
-        
-        return {
-            "type": "double_angle",
-            "angle_size": angle_size,
-            "angle_length": angle_length,
-            "bolts": [b.model_dump() for b in bolts],
-            "num_angles": 2,
-            "dimensions": {
+        geometry = {"type": "double_angle"}
+        
+        if "angle" in pieces:
+            geometry["angle_size"] = angle_size
+            geometry["angle_length"] = angle_length
+            if "angle_thickness" in params:
+                geometry["angle_thickness"] = params["angle_thickness"]
+        
+        if "bolts" in pieces:
+            geometry["bolts"] = BoltPattern(
+                GeometryGenerator.bolt_positions("double_angle", params),
+                bolt_diameter,
+                params.get('bolt_grade', 'A325'),
+                params.get('hole_type', 'standard')
+            )
+        
+        if "angle" in pieces:
+            geometry["num_angles"] = 2
+        
+        if "dimensions" in pieces:
+            geometry["dimensions"] = {
                 "angle_length": angle_length,
                 "num_bolts_per_angle": num_bolts
             }
-        }
+        
+        return geometry
     
     @staticmethod
-    def _generate_end_plate(params: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_end_plate(params: Dict[str, Any], pieces: Iterable[str] = ALL_PIECES) -> Dict[str, Any]:
         num_bolts_vertical = params.get('num_bolts_vertical', 4)
         num_bolts_horizontal = params.get('num_bolts_horizontal', 2)
         bolt_diameter = params.get('bolt_diameter', 0.875)
@@ -105,46 +230,46 @@ class GeometryGenerator:
         plate_length = (num_bolts_vertical - 1) * bolt_spacing_v + 2 * edge_distance
         plate_width = (num_bolts_horizontal - 1) * bolt_spacing_h + 2 * edge_distance
         
-        plate = Plate(
-            length=plate_length,
-            width=plate_width,
-            thickness=plate_thickness,
-            material=params.get('plate_grade', 'A36'),
-            corner_points=[
-                Point3D(x=0, y=0, z=0),
-                Point3D(x=plate_length, y=0, z=0),
-                Point3D(x=plate_length, y=plate_width, z=0),
-                Point3D(x=0, y=plate_width, z=0)
-            ]
-        )
-        
-        bolts = []
-        for i in range(num_bolts_vertical):
-            for j in range(num_bolts_horizontal):
-                y_pos = edge_distance + i * bolt_spacing_v
-                x_pos = edge_distance + j * bolt_spacing_h
-                bolts.append(Bolt(
-                    position=Point3D(x=x_pos, y=y_pos, z=0),
-                    diameter=bolt_diameter,
-                    grade=params.get('bolt_grade', 'A490')
-                ))
-        
-        return {
-            "type": "end_plate",
-            "plate": plate.model_dump(),
-            "bolts": [b.model_dump() for b in bolts],
-            "dimensions": {
+        geometry = {"type": "end_plate"}
+        
+        if "plate" in pieces:
+            plate = Plate(
+                length=plate_length,
+                width=plate_width,
+                thickness=plate_thickness,
+                material=params.get('plate_grade', 'A36'),
+                corner_points=[
+                    Point3D(x=0, y=0, z=0),
+                    Point3D(x=plate_length, y=0, z=0),
+                    Point3D(x=plate_length, y=plate_width, z=0),
+                    Point3D(x=0, y=plate_width, z=0)
+                ]
+            )
+            geometry["plate"] = plate.model_dump()
+        
+        if "bolts" in pieces:
+            geometry["bolts"] = BoltPattern(
+                GeometryGenerator.bolt_positions("end_plate", params),
+                bolt_diameter,
+                params.get('bolt_grade', 'A490'),
+                params.get('hole_type', 'standard')
+            )
+        
+        if "welds" in pieces:
+            geometry["welds"] = GeometryGenerator._welds("end_plate", params, 0.5)
+        
+        if "dimensions" in pieces:
+            geometry["dimensions"] = {
                 "plate_length": plate_length,
                 "plate_width": plate_width,
                 "plate_thickness": plate_thickness,
-                "total_bolts": len(bolts)
+                "total_bolts": max(num_bolts_vertical, 0) * max(num_bolts_horizontal, 0)
             }
-        }
+        
+        return geometry
     
     @staticmethod
-    def _generate_shear_connection(params: Dict[str, Any]) -> Dict[str, Any]:
-        connection_subtype = params.get('subtype', 'single_plate')
-        if connection_subtype == 'single_plate':
-            return GeometryGenerator._generate_single_plate(params)
-        else:
-            return GeometryGenerator._generate_double_angle(params)
\ No newline at end of file
+    def _welds(connection_type: str, params: Dict[str, Any], default_thickness: float) -> WeldGroup:
+        lines = GeometryGenerator.weld_lines(connection_type, params)
+        lines = lines[~np.all(np.isclose(lines[:, 0], lines[:, 1]), axis=1)]
+        return WeldGroup(lines, GeometryGenerator.weld_size(params, default_thickness), params.get('weld_type', 'fillet'))
\ No newline at end of file
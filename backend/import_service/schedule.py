@@ -0,0 +1,93 @@
+import io
+import os
+import pandas as pd
+from pathlib import PurePath
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from models.connection import Connection, ConnectionType
+from validation_engine.validator import ValidationEngine, coerce_numeric_columns
+
+REQUIRED_COLUMNS = ("name", "connection_type")
+RESERVED_COLUMNS = ("name", "connection_type", "description")
+CONNECTION_TYPES = [connection_type.value for connection_type in ConnectionType]
+
+FORMATS = {
+    ".csv": "csv",
+    ".xlsx": "xlsx",
+    "text/csv": "csv",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": "xlsx"
+}
+
+def import_settings() -> Dict[str, int]:
+    return {
+        "chunk_size": int(os.environ.get('IMPORT_CHUNK_SIZE', '1000')),
+        "max_bytes": int(os.environ.get('IMPORT_MAX_BYTES', str(50 * 1024 * 1024)))
+    }
+
+def schedule_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    schedule = FORMATS.get(PurePath(filename or "").suffix.lower()) or FORMATS.get((content_type or "").split(';')[0].strip())
+    if schedule is None:
+        raise ValueError("Connection schedules must be .csv or .xlsx files")
+    return schedule
+
+def _columns(frame: pd.DataFrame) -> pd.DataFrame:
+    frame.columns = [str(column).strip() for column in frame.columns]
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Schedule is missing required columns: {', '.join(missing)}")
+    return frame
+
+def open_schedule(content: bytes, schedule: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if schedule == "csv":
+        _columns(pd.read_csv(io.BytesIO(content), nrows=0))
+        return (_columns(chunk) for chunk in pd.read_csv(io.BytesIO(content), chunksize=chunk_size, skipinitialspace=True))
+    
+    frame = _columns(pd.read_excel(io.BytesIO(content), engine="openpyxl"))
+    return (frame.iloc[start:start + chunk_size] for start in range(0, len(frame), chunk_size))
+
+def _text(column: pd.Series) -> pd.Series:
+    return column.where(column.notna(), "").astype(str).str.strip()
+
+def _python_values(parameters: pd.DataFrame) -> pd.DataFrame:
+    converted = {}
+    for name, column in parameters.items():
+        values = column.dropna()
+        if column.dtype.kind == "f" and len(values) and (values % 1 == 0).all():
+            column = column.astype("Int64")
+        converted[name] = column.astype(object).where(column.notna(), None)
+    return pd.DataFrame(converted, index=parameters.index)
+
+def prepare_chunk(frame: pd.DataFrame, first_row: int, project_id: str,
+                  user_id: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+    names = _text(frame["name"])
+    types = _text(frame["connection_type"]).str.lower()
+    descriptions = _text(frame["description"]) if "description" in frame else pd.Series("", index=frame.index)
+    parameters = coerce_numeric_columns(frame[[column for column in frame.columns if column not in RESERVED_COLUMNS]])
+    
+    checks = ValidationEngine.validate_parameter_frame(parameters, types)
+    unnamed = (names == "").to_numpy()
+    unknown_type = (~types.isin(CONNECTION_TYPES)).to_numpy()
+    records = _python_values(parameters).to_dict("records")
+    
+    documents, errors, warnings = [], [], 0
+    for position, (issues, row_warnings) in enumerate(zip(checks["issues"], checks["warnings"])):
+        row = first_row + position
+        problems = []
+        if unnamed[position]:
+            problems.append("Missing connection name")
+        if unknown_type[position]:
+            problems.append(f"Unknown connection type: {types.iat[position] or '(blank)'}")
+        else:
+            problems.extend(issues)
+        if problems:
+            errors.append({"row": row, "name": names.iat[position] or None, "issues": problems})
+            continue
+        warnings += bool(row_warnings)
+        documents.append(Connection(
+            name=names.iat[position],
+            connection_type=types.iat[position],
+            description=descriptions.iat[position] or None,
+            project_id=project_id,
+            user_id=user_id,
+            parameters={name: value for name, value in records[position].items() if value is not None}
+        ).model_dump())
+    return documents, errors, warnings
\ No newline at end of file
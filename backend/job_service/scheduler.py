@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+import orjson
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from pymongo.errors import PyMongoError
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from database import JobRepo
+from models.job import Job, JobKind, JobStatus
+from utils.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 300.0
+
+class JobFailed(Exception):
+    pass
+
+class JobContext:
+    
+    def __init__(self, scheduler: "JobScheduler", job: Dict[str, Any]):
+        self.scheduler = scheduler
+        self.job = job
+    
+    async def progress(self, progress: float, message: Optional[str] = None) -> None:
+        await self.scheduler.repo.update_leased(self.job['id'], self.scheduler.owner, {"$set": {
+            "progress": max(0.0, min(progress, 1.0)),
+            "message": message,
+            "updated_at": datetime.now(timezone.utc)
+        }})
+
+JobHandler = Callable[[Dict[str, Any], JobContext], Awaitable[Optional[Dict[str, Any]]]]
+
+class JobScheduler:
+    
+    def __init__(self, repo: Optional[JobRepo] = None, lease_seconds: Optional[float] = None,
+                 poll_interval: Optional[float] = None, retry_backoff: Optional[float] = None,
+                 max_attempts: Optional[int] = None):
+        self.repo = repo or JobRepo()
+        self.lease_seconds = lease_seconds or float(os.environ.get('JOB_LEASE_SECONDS', '60'))
+        self.poll_interval = poll_interval or float(os.environ.get('JOB_POLL_INTERVAL', '1.0'))
+        self.retry_backoff = retry_backoff or float(os.environ.get('JOB_RETRY_BACKOFF', '5'))
+        self.max_attempts = max_attempts or int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.handlers: Dict[str, JobHandler] = {}
+        self.concurrency: Dict[str, int] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+    
+    def register(self, kind: JobKind, handler: JobHandler, concurrency: int = 2) -> None:
+        self.handlers[kind.value] = handler
+        self.concurrency[kind.value] = int(os.environ.get(f'JOB_CONCURRENCY_{kind.name}', str(concurrency)))
+    
+    def start(self) -> None:
+        if self._workers:
+            return
+        for kind, count in self.concurrency.items():
+            self._wakeups[kind] = asyncio.Event()
+            self._workers.extend(asyncio.create_task(self._worker(kind)) for _ in range(count))
+    
+    async def stop(self) -> None:
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def submit(self, kind: JobKind, user_id: str, payload: Dict[str, Any],
+                     max_attempts: Optional[int] = None) -> Dict[str, Any]:
+        job = Job(kind=kind, user_id=user_id, payload=payload, max_attempts=max_attempts or self.max_attempts).model_dump()
+        await self.repo.insert_one(job)
+        wakeup = self._wakeups.get(kind.value)
+        if wakeup is not None:
+            wakeup.set()
+        return job
+    
+    async def cancel(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        job = await self.repo.find_one_and_update(
+            {"id": job_id, "user_id": user_id, "status": JobStatus.QUEUED.value},
+            {"$set": {"status": JobStatus.CANCELLED.value, "cancel_requested": True, "finished_at": now, "updated_at": now}}
+        )
+        if job is not None:
+            return job
+        
+        job = await self.repo.find_one_and_update(
+            {"id": job_id, "user_id": user_id, "status": JobStatus.RUNNING.value},
+            {"$set": {"cancel_requested": True, "updated_at": now}}
+        )
+        if job is None:
+            return await self.repo.get(job_id, user_id)
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        return job
+    
+    async def _claim(self, kind: str) -> Optional[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        return await self.repo.find_one_and_update(
+            {"kind": kind, "$or": [
+                {"status": JobStatus.QUEUED.value, "run_after": {"$lte": now}},
+                {"status": JobStatus.RUNNING.value, "lease_expires_at": {"$lt": now}}
+            ]},
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "lease_owner": self.owner,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "started_at": now,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=(("run_after", 1),)
+        )
+    
+    async def _worker(self, kind: str) -> None:
+        wakeup = self._wakeups[kind]
+        while True:
+            wakeup.clear()
+            try:
+                job = await self._claim(kind)
+                if job is not None:
+                    await self._run(job)
+                    continue
+            except PyMongoError as e:
+                logger.error(f"Job worker for {kind} could not reach the database: {e}")
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job['id']
+        if job.get('cancel_requested'):
+            await self._finish(job_id, JobStatus.CANCELLED)
+            return
+        if job['attempts'] > job['max_attempts']:
+            await self._finish(job_id, JobStatus.FAILED, error="Job lease expired on its final attempt")
+            return
+        
+        task = asyncio.create_task(self.handlers[job['kind']](job, JobContext(self, job)))
+        self._running[job_id] = task
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                await self._release(job_id)
+                raise
+            await self._finish(job_id, JobStatus.CANCELLED)
+        except JobFailed as e:
+            await self._finish(job_id, JobStatus.FAILED, error=str(e))
+        except HTTPException as e:
+            if e.status_code < 500:
+                await self._finish(job_id, JobStatus.FAILED, error=str(e.detail))
+            else:
+                await self._retry(job, str(e.detail))
+        except Exception as e:
+            logger.exception(f"Job {job_id} ({job['kind']}) attempt {job['attempts']} failed")
+            await self._retry(job, f"{type(e).__name__}: {e}")
+        else:
+            await self._finish(job_id, JobStatus.SUCCEEDED, progress=1.0, result=orjson.loads(dumps(result or {})))
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job_id, None)
+    
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            now = datetime.now(timezone.utc)
+            try:
+                job = await self.repo.update_leased(
+                    job_id,
+                    self.owner,
+                    {"$set": {"lease_expires_at": now + timedelta(seconds=self.lease_seconds), "updated_at": now}},
+                    {"_id": 0, "cancel_requested": 1}
+                )
+            except PyMongoError as e:
+                logger.warning(f"Could not renew lease on job {job_id}: {e}")
+                continue
+            if job is None or job.get('cancel_requested'):
+                task = self._running.get(job_id)
+                if task is not None:
+                    task.cancel()
+                return
+    
+    async def _finish(self, job_id: str, status: JobStatus, **fields: Any) -> None:
+        now = datetime.now(timezone.utc)
+        await self.repo.update_leased(job_id, self.owner, {"$set": {
+            **fields,
+            "status": status.value,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "finished_at": now,
+            "updated_at": now
+        }})
+    
+    async def _retry(self, job: Dict[str, Any], error: str) -> None:
+        if job['attempts'] >= job['max_attempts']:
+            await self._finish(job['id'], JobStatus.FAILED, error=error)
+            return
+        now = datetime.now(timezone.utc)
+        delay = min(self.retry_backoff * 2 ** (job['attempts'] - 1), MAX_RETRY_DELAY)
+        await self.repo.update_leased(job['id'], self.owner, {"$set": {
+            "status": JobStatus.QUEUED.value,
+            "error": error,
+            "run_after": now + timedelta(seconds=delay),
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "updated_at": now
+        }})
+    
+    async def _release(self, job_id: str) -> None:
+        now = datetime.now(timezone.utc)
+        try:
+            await self.repo.update_leased(job_id, self.owner, {
+                "$set": {
+                    "status": JobStatus.QUEUED.value,
+                    "run_after": now,
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": -1}
+            })
+        except PyMongoError as e:
+            logger.warning(f"Could not release job {job_id}; it will be reclaimed when its lease expires: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "owner": self.owner,
+            "workers": dict(self.concurrency),
+            "running": len(self._running)
+        }
+
+JOBS = JobScheduler()
\ No newline at end of file
@@ -1,13 +1,18 @@
 from .user import User, UserCreate, UserLogin, UserResponse
-from .project import Project, ProjectCreate, ProjectUpdate
-from .connection import Connection, ConnectionCreate, ConnectionUpdate, ConnectionType
+from .project import Project, ProjectCreate, ProjectUpdate, ClashCheckRequest
+from .connection import Connection, ConnectionCreate, ConnectionUpdate, ConnectionBatchUpdate, ConnectionType, Placement, ParameterRange, ConnectionOptimizeRequest, ConnectionSummary, ValidationSummary
+from .typical import Typical, TypicalCreate, TypicalUpdate, InstanceCreate, InstanceUpdate, InstanceBatchCreate
+from .job import Job, JobKind, JobStatus
 from .audit_log import AuditLog, AuditLogCreate
 from .redline import Redline, RedlineCreate, AIExtraction
 
 __all__ = [
     'User', 'UserCreate', 'UserLogin', 'UserResponse',
-    'Project', 'ProjectCreate', 'ProjectUpdate',
-    'Connection', 'ConnectionCreate', 'ConnectionUpdate', 'ConnectionType',
+    'Project', 'ProjectCreate', 'ProjectUpdate', 'ClashCheckRequest',
+    'Connection', 'ConnectionCreate', 'ConnectionUpdate', 'ConnectionBatchUpdate', 'ConnectionType', 'Placement', 'ParameterRange', 'ConnectionOptimizeRequest',
+    'ConnectionSummary', 'ValidationSummary',
+    'Typical', 'TypicalCreate', 'TypicalUpdate', 'InstanceCreate', 'InstanceUpdate', 'InstanceBatchCreate',
+    'Job', 'JobKind', 'JobStatus',
     'AuditLog', 'AuditLogCreate',
     'Redline', 'RedlineCreate', 'AIExtraction'
 ]
\ No newline at end of file
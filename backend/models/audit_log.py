@@ -13,6 +13,10 @@ class AuditAction(str, Enum):
     EXPORT_TEKLA = "export_tekla"
     RULE_CHECK = "rule_check"
     USER_APPROVAL = "user_approval"
+    CREATE_TYPICAL = "create_typical"
+    UPDATE_TYPICAL = "update_typical"
+    VALIDATE_TYPICAL = "validate_typical"
+    IMPORT_CONNECTIONS = "import_connections"
 
 class AuditLogCreate(BaseModel):
     action: AuditAction
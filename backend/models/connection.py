@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Dict, List, Any
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+from typing import Optional, Dict, List, Any, Literal
 from datetime import datetime, timezone
 from enum import Enum
+import math
 import uuid
 
 class ConnectionType(str, Enum):
@@ -17,6 +18,24 @@ class ConnectionStatus(str, Enum):
     FAILED = "failed"
     EXPORTED = "exported"
 
+def clean_parameters(parameters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if parameters is None:
+        return None
+    cleaned = {}
+    for name, value in parameters.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        elif isinstance(value, float) and not math.isfinite(value):
+            raise ValueError(f"Parameter {name} must be a finite number")
+        cleaned[name] = value
+    return cleaned
+
+class Placement(BaseModel):
+    origin: List[float] = Field(default_factory=lambda: [0.0, 0.0, 0.0], min_length=3, max_length=3)
+    rotation: List[float] = Field(default_factory=lambda: [0.0, 0.0, 0.0], min_length=3, max_length=3)
+
 class ConnectionBase(BaseModel):
     name: str
     connection_type: ConnectionType
@@ -25,12 +44,22 @@ class ConnectionBase(BaseModel):
 class ConnectionCreate(ConnectionBase):
     project_id: str
     parameters: Dict[str, Any] = {}
+    placement: Optional[Placement] = None
+    
+    _clean_parameters = field_validator("parameters")(clean_parameters)
 
 class ConnectionUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     parameters: Optional[Dict[str, Any]] = None
+    placement: Optional[Placement] = None
     status: Optional[ConnectionStatus] = None
+    
+    _clean_parameters = field_validator("parameters")(clean_parameters)
+
+class ConnectionBatchUpdate(ConnectionUpdate):
+    id: str
+    version: Optional[int] = None
 
 class Connection(ConnectionBase):
     model_config = ConfigDict(extra="ignore")
@@ -38,10 +67,66 @@ class Connection(ConnectionBase):
     project_id: str
     user_id: str
     parameters: Dict[str, Any] = {}
+    placement: Optional[Placement] = None
     geometry: Optional[Dict[str, Any]] = None
     validation_results: Optional[Dict[str, Any]] = None
     rule_checks: List[Dict[str, Any]] = []
     status: ConnectionStatus = ConnectionStatus.DRAFT
     ai_suggested: bool = False
+    typical_id: Optional[str] = None
+    overrides: Dict[str, Any] = {}
+    design_key: Optional[str] = None
+    version: int = 1
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
\ No newline at end of file
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ValidationSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    overall_status: Optional[str] = None
+    summary: Optional[str] = None
+    is_valid: Optional[bool] = None
+
+class ConnectionSummary(ConnectionBase):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    project_id: str
+    status: ConnectionStatus = ConnectionStatus.DRAFT
+    validation_results: Optional[ValidationSummary] = None
+    typical_id: Optional[str] = None
+    version: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+CONNECTION_SUMMARY_PROJECTION = {
+    "_id": 0,
+    **{name: 1 for name in ConnectionSummary.model_fields if name != "validation_results"},
+    **{f"validation_results.{name}": 1 for name in ValidationSummary.model_fields}
+}
+
+class ParameterRange(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    step: Optional[float] = None
+    values: Optional[List[float]] = None
+    
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.values is None and (self.min is None or self.max is None or not self.step or self.step <= 0 or self.max < self.min):
+            raise ValueError("Provide either 'values' or 'min', 'max' and a positive 'step'")
+        return self
+    
+    def expand(self) -> List[float]:
+        if self.values is not None:
+            return list(self.values)
+        count = int(round((self.max - self.min) / self.step)) + 1
+        if count > 100000:
+            raise ValueError(f"Range expands to {count} values")
+        return [round(self.min + i * self.step, 6) for i in range(count)]
+
+class ConnectionOptimizeRequest(BaseModel):
+    connection_type: ConnectionType
+    constraints: Dict[str, Any] = {}
+    ranges: Dict[str, ParameterRange]
+    objective: Literal["plate_weight", "bolt_count"] = "plate_weight"
+    allow_warnings: bool = False
+    max_results: int = Field(default=20, ge=1, le=200)
\ No newline at end of file
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional, Dict, Any
+from datetime import datetime, timezone
+from enum import Enum
+import uuid
+
+class JobKind(str, Enum):
+    VALIDATE_CONNECTION = "validate_connection"
+    EXPORT_TEKLA = "export_tekla"
+    INTERPRET_REDLINE = "interpret_redline"
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class Job(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    kind: JobKind
+    user_id: str
+    payload: Dict[str, Any] = {}
+    status: JobStatus = JobStatus.QUEUED
+    progress: float = 0.0
+    message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    max_attempts: int = 3
+    cancel_requested: bool = False
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    run_after: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
\ No newline at end of file
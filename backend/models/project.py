@@ -21,5 +21,11 @@ class Project(ProjectBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
     connection_count: int = 0
+    version: int = 1
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
\ No newline at end of file
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ClashCheckRequest(BaseModel):
+    min_clearance: float = Field(default=0.5, ge=0, le=12)
+    include_plates: bool = True
+    max_results: int = Field(default=1000, ge=1, le=100000)
@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import Optional, Dict, List, Any
+from datetime import datetime, timezone
+from .connection import ConnectionType, ConnectionStatus, Placement, clean_parameters
+import uuid
+
+class TypicalBase(BaseModel):
+    name: str
+    connection_type: ConnectionType
+    description: Optional[str] = None
+
+class TypicalCreate(TypicalBase):
+    project_id: str
+    parameters: Dict[str, Any] = {}
+    
+    _clean_parameters = field_validator("parameters")(clean_parameters)
+
+class TypicalUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    parameters: Optional[Dict[str, Any]] = None
+    
+    _clean_parameters = field_validator("parameters")(clean_parameters)
+
+class Typical(TypicalBase):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    project_id: str
+    user_id: str
+    parameters: Dict[str, Any] = {}
+    design_key: Optional[str] = None
+    status: ConnectionStatus = ConnectionStatus.DRAFT
+    instance_count: int = 0
+    version: int = 1
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class InstanceCreate(BaseModel):
+    name: Optional[str] = None
+    overrides: Dict[str, Any] = {}
+    placement: Optional[Placement] = None
+    
+    _clean_overrides = field_validator("overrides")(clean_parameters)
+
+class InstanceUpdate(BaseModel):
+    name: Optional[str] = None
+    overrides: Optional[Dict[str, Any]] = None
+    placement: Optional[Placement] = None
+    
+    _clean_overrides = field_validator("overrides")(clean_parameters)
+
+class InstanceBatchCreate(BaseModel):
+    instances: List[InstanceCreate] = Field(min_length=1, max_length=1000)
\ No newline at end of file
@@ -1,3 +1,3 @@
-from . import auth, projects, connections, redlines, audit, ai
+from . import auth, projects, connections, typicals, redlines, audit, ai, jobs
 
-__all__ = ['auth', 'projects', 'connections', 'redlines', 'audit', 'ai']
+__all__ = ['auth', 'projects', 'connections', 'typicals', 'redlines', 'audit', 'ai', 'jobs']
\ No newline at end of file
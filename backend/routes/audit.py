@@ -1,24 +1,35 @@
-from fastapi import APIRouter, Depends
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import APIRouter, Depends, Query, Request, Response
 from models.audit_log import AuditLog
 from utils.dependencies import get_current_user
+from utils.pagination import cursor_headers, keyset_page, ndjson_stream, wants_ndjson
+from utils.responses import FastJSONResponse, dumps
 from audit_service.audit import AuditService
-import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from typing import List
+from database import AuditRepo
+from typing import List, Optional
 
 router = APIRouter(prefix="/audit", tags=["audit"])
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
-audit_service = AuditService(db)
+audit_service = AuditService(AuditRepo())
 
 @router.get("/connection/{connection_id}", response_model=List[AuditLog])
-async def get_connection_audit_trail(connection_id: str, user_id: str = Depends(get_current_user)):
-    return await audit_service.get_connection_audit_trail(connection_id)
+async def get_connection_audit_trail(connection_id: str, request: Request, response: Response,
+                                     after: Optional[str] = None, limit: int = Query(1000, ge=1, le=1000),
+                                     user_id: str = Depends(get_current_user)):
+    if wants_ndjson(request):
+        return await ndjson_stream(
+            lambda: audit_service.stream_connection_audit_trail(connection_id, after),
+            lambda log: dumps(AuditLog(**log))
+        )
+    logs = await keyset_page(audit_service.get_connection_audit_trail(connection_id, after, limit), response)
+    return FastJSONResponse(logs, headers=cursor_headers(response))
 
 @router.get("/my-activity", response_model=List[AuditLog])
-async def get_my_audit_trail(limit: int = 50, user_id: str = Depends(get_current_user)):
-    return await audit_service.get_user_audit_trail(user_id, limit)
\ No newline at end of file
+async def get_my_audit_trail(request: Request, response: Response, after: Optional[str] = None,
+                             limit: int = Query(50, ge=1, le=1000), user_id: str = Depends(get_current_user)):
+    if wants_ndjson(request):
+        return await ndjson_stream(
+            lambda: audit_service.stream_user_audit_trail(user_id, after),
+            lambda log: dumps(AuditLog(**log))
+        )
+    logs = await keyset_page(audit_service.get_user_audit_trail(user_id, after, limit), response)
+    return FastJSONResponse(logs, headers=cursor_headers(response))
\ No newline at end of file
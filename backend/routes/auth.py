@@ -1,21 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from motor.motor_asyncio import AsyncIOMotorDatabase
 from models.user import UserCreate, UserLogin, UserResponse
 from models.user import User as UserModel
 from utils.auth import get_password_hash, verify_password, create_access_token
 from utils.dependencies import get_current_user
-import os
-from motor.motor_asyncio import AsyncIOMotorClient
+from database import UserRepo
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+users = UserRepo()
 
 @router.post("/register", response_model=UserResponse)
 async def register(user_create: UserCreate):
-    existing_user = await db.users.find_one({"email": user_create.email}, {"_id": 0})
+    existing_user = await users.get_by_email(user_create.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -27,9 +23,8 @@ async def register(user_create: UserCreate):
     
     user = UserModel(**user_dict, hashed_password=hashed_password)
     doc = user.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     
-    await db.users.insert_one(doc)
+    await users.insert_one(doc)
     
     return UserResponse(
         id=user.id,
@@ -42,7 +37,7 @@ async def register(user_create: UserCreate):
 
 @router.post("/login")
 async def login(user_login: UserLogin):
-    user_doc = await db.users.find_one({"email": user_login.email}, {"_id": 0})
+    user_doc = await users.get_by_email(user_login.email)
     if not user_doc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -70,15 +65,11 @@ async def login(user_login: UserLogin):
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(user_id: str = Depends(get_current_user)):
-    user_doc = await db.users.find_one({"id": user_id}, {"_id": 0})
+    user_doc = await users.get(user_id)
     if not user_doc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    if isinstance(user_doc['created_at'], str):
-        from datetime import datetime
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-    
     return UserResponse(**user_doc)
\ No newline at end of file
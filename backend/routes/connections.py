@@ -1,44 +1,105 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from motor.motor_asyncio import AsyncIOMotorDatabase
-from models.connection import Connection, ConnectionCreate, ConnectionUpdate, ConnectionStatus
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from models.connection import Connection, ConnectionCreate, ConnectionUpdate, ConnectionBatchUpdate, ConnectionStatus, ConnectionOptimizeRequest
+from models.connection import ConnectionSummary, CONNECTION_SUMMARY_PROJECTION
 from models.audit_log import AuditLogCreate, AuditAction
+from models.job import JobKind
 from utils.dependencies import get_current_user
-from rule_engine import AISC360RuleEngine
+from utils.pagination import cursor_headers, keyset_page, ndjson_stream, wants_ndjson
+from utils.responses import FastJSONResponse, dumps
+from utils.etags import entity_tag, if_match_version, if_none_match, not_modified, version_filter
+from utils.jobs import job_accepted, wants_async
+from rule_engine import AISC360RuleEngine, DesignOptimizer
 from geometry_engine import GeometryGenerator
+from geometry_engine.components import materialize
+from geometry_engine.encoding import MEDIA_TYPE, encode_geometry, packed_fields, unpack_document, PackedGeometry
 from validation_engine.validator import ValidationEngine
+from validation_engine.incremental import incremental_revalidation
+from validation_engine.designs import DESIGNS, DESIGN_FIELDS
 from export_service.tekla_exporter import TeklaExporter
 from audit_service.audit import AuditService
-from typing import List
-import os
-from motor.motor_asyncio import AsyncIOMotorClient
+from cache_service.result_cache import ResultCache, cache_settings
+from job_service.scheduler import JOBS, JobContext
+from rule_engine.base import CompactRuleResult
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from database import AuditRepo, ConnectionRepo, ProjectRepo, ResultCacheRepo, TypicalRepo
+from typing import Any, Dict, List, Literal, Optional, Union
 from datetime import datetime, timezone
 
 router = APIRouter(prefix="/connections", tags=["connections"])
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+connections = ConnectionRepo()
+projects = ProjectRepo()
+typicals = TypicalRepo()
 
 rule_engine = AISC360RuleEngine()
-audit_service = AuditService(db)
+design_optimizer = DesignOptimizer(rule_engine)
+audit_service = AuditService(AuditRepo())
+
+_cache_settings = cache_settings()
+_cache_repo = ResultCacheRepo() if _cache_settings['second_tier'] else None
+rule_cache = ResultCache(
+    "rule_results",
+    AISC360RuleEngine.VERSION,
+    max_entries=_cache_settings['max_entries'],
+    collection=_cache_repo,
+    encode=lambda result: result.to_dict(),
+    decode=CompactRuleResult.from_dict
+)
+geometry_cache = ResultCache(
+    "geometry",
+    GeometryGenerator.VERSION,
+    max_entries=_cache_settings['max_entries'],
+    collection=_cache_repo,
+    encode=encode_geometry,
+    decode=lambda packed: PackedGeometry(packed).build()
+)
+
+ConnectionView = Literal["summary", "full"]
+ConnectionPayload = Union[Connection, ConnectionSummary, Dict[str, Any]]
+
+MAX_BATCH_SIZE = 1000
+
+def connection_projection(view: ConnectionView, fields: Optional[str]) -> Optional[Dict[str, Any]]:
+    if fields:
+        requested = {name.strip() for name in fields.split(',') if name.strip()}
+        unknown = requested - set(Connection.model_fields)
+        if unknown:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Unknown connection fields: {', '.join(sorted(unknown))}")
+        projection = {"_id": 0, "id": 1, **{name: 1 for name in requested}}
+        if "geometry" in requested:
+            projection["geometry_packed"] = 1
+        if requested & set(DESIGN_FIELDS):
+            projection["design_key"] = 1
+        return projection
+    if view == "summary":
+        return CONNECTION_SUMMARY_PROJECTION
+    return None
+
+def connection_payload(document: Dict[str, Any], view: ConnectionView, fields: Optional[str]) -> ConnectionPayload:
+    if fields:
+        if "geometry_packed" in document:
+            return unpack_document(document)
+        return document
+    if view == "summary":
+        return ConnectionSummary(**document)
+    return Connection(**unpack_document(document))
+
 
 @router.post("/", response_model=Connection)
 async def create_connection(connection_create: ConnectionCreate, user_id: str = Depends(get_current_user)):
-    project = await db.projects.find_one({"id": connection_create.project_id, "user_id": user_id}, {"_id": 0})
+    project = await projects.get(connection_create.project_id, user_id)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
     connection = Connection(**connection_create.model_dump(), user_id=user_id)
     doc = connection.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     
-    await db.connections.insert_one(doc)
+    await connections.insert_one(doc)
     
-    await db.projects.update_one(
-        {"id": connection_create.project_id},
-        {"$inc": {"connection_count": 1}}
-    )
+    await projects.increment_connection_count(connection_create.project_id, 1)
     
     await audit_service.log_action(AuditLogCreate(
         action=AuditAction.CREATE_CONNECTION,
@@ -48,69 +109,290 @@ async def create_connection(connection_create: ConnectionCreate, user_id: str =
         details={"connection_type": connection.connection_type}
     ))
     
-    return connection
+    return FastJSONResponse(connection, headers={"ETag": entity_tag(doc)})
+
+@router.get("/", response_model=Union[List[Connection], List[ConnectionSummary], List[Dict[str, Any]]])
+async def get_connections(request: Request, response: Response, project_id: str = None,
+                          after: Optional[str] = None, limit: int = Query(1000, ge=1, le=1000),
+                          view: ConnectionView = "full", fields: Optional[str] = None,
+                          user_id: str = Depends(get_current_user)):
+    projection = connection_projection(view, fields)
+    if wants_ndjson(request):
+        return await ndjson_stream(
+            lambda: DESIGNS.attach_stream(connections.stream_for_user(user_id, project_id, after, projection)),
+            lambda c: dumps(connection_payload(c, view, fields))
+        )
+    
+    documents = await DESIGNS.attach(
+        await keyset_page(connections.page_for_user(user_id, project_id, after, limit, projection), response)
+    )
+    return FastJSONResponse([connection_payload(c, view, fields) for c in documents], headers=cursor_headers(response))
+
+@router.post("/optimize")
+async def optimize_connection(request: ConnectionOptimizeRequest, user_id: str = Depends(get_current_user)):
+    try:
+        result = await run_in_threadpool(
+            design_optimizer.optimize,
+            request.connection_type.value,
+            request.constraints,
+            {name: spec.expand() for name, spec in request.ranges.items()},
+            request.objective,
+            request.allow_warnings,
+            request.max_results
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return {
+        **result,
+        "disclaimer": "Optimized designs are ADVISORY ONLY. Engineering review required."
+    }
+
+@router.get("/cache/stats")
+async def get_cache_stats(user_id: str = Depends(get_current_user)):
+    return {
+        "rule_results": rule_cache.stats(),
+        "geometry": geometry_cache.stats(),
+        "designs": DESIGNS.stats()
+    }
+
+def batch_error(index: int, status_code: int, detail: str, connection_id: Optional[str] = None) -> Dict[str, Any]:
+    return {"index": index, "id": connection_id, "status_code": status_code, "detail": detail}
+
+async def run_batch(operations: List[Any], positions: List[int], results: List[Dict[str, Any]]) -> None:
+    if not operations:
+        return
+    try:
+        await connections.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get('writeErrors', []):
+            index = positions[error['index']]
+            results[index] = batch_error(index, status.HTTP_409_CONFLICT, error.get('errmsg', "Write failed"), results[index]['id'])
 
-@router.get("/", response_model=List[Connection])
-async def get_connections(project_id: str = None, user_id: str = Depends(get_current_user)):
-    query = {"user_id": user_id}
-    if project_id:
-        query["project_id"] = project_id
+@router.post("/batch")
+async def create_connections_batch(connection_creates: List[ConnectionCreate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+                                   user_id: str = Depends(get_current_user)):
+    owned = set(await projects.owned_ids({item.project_id for item in connection_creates}, user_id))
     
-    connections = await db.connections.find(query, {"_id": 0}).to_list(1000)
+    results: List[Dict[str, Any]] = []
+    operations, positions = [], []
+    for index, connection_create in enumerate(connection_creates):
+        if connection_create.project_id not in owned:
+            results.append(batch_error(index, status.HTTP_404_NOT_FOUND, "Project not found"))
+            continue
+        doc = Connection(**connection_create.model_dump(), user_id=user_id).model_dump()
+        operations.append(InsertOne(doc))
+        positions.append(index)
+        results.append({"index": index, "id": doc['id'], "status_code": status.HTTP_201_CREATED, "etag": entity_tag(doc)})
     
-    for conn in connections:
-        if isinstance(conn['created_at'], str):
-            conn['created_at'] = datetime.fromisoformat(conn['created_at'])
-        if isinstance(conn['updated_at'], str):
-            conn['updated_at'] = datetime.fromisoformat(conn['updated_at'])
+    await run_batch(operations, positions, results)
     
-    return [Connection(**c) for c in connections]
+    created = [(results[index], connection_creates[index]) for index in positions if results[index]['status_code'] == status.HTTP_201_CREATED]
+    per_project: Dict[str, int] = {}
+    for _, connection_create in created:
+        per_project[connection_create.project_id] = per_project.get(connection_create.project_id, 0) + 1
+    if per_project:
+        await projects.bulk_write([
+            UpdateOne({"id": project_id}, {"$inc": {"connection_count": count, "version": 1}})
+            for project_id, count in per_project.items()
+        ], ordered=False)
+    
+    await audit_service.log_actions([
+        AuditLogCreate(
+            action=AuditAction.CREATE_CONNECTION,
+            user_id=user_id,
+            connection_id=result['id'],
+            project_id=connection_create.project_id,
+            details={"connection_type": connection_create.connection_type, "batch": True}
+        )
+        for result, connection_create in created
+    ], durable=True)
+    
+    return FastJSONResponse({"results": results, "succeeded": len(created), "failed": len(results) - len(created)})
 
-@router.get("/{connection_id}", response_model=Connection)
-async def get_connection(connection_id: str, user_id: str = Depends(get_current_user)):
-    connection = await db.connections.find_one({"id": connection_id, "user_id": user_id}, {"_id": 0})
-    if not connection:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+@router.patch("/batch")
+async def update_connections_batch(connection_updates: List[ConnectionBatchUpdate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+                                   user_id: str = Depends(get_current_user)):
+    ids = [item.id for item in connection_updates]
+    existing = {c['id']: c for c in await connections.get_many(set(ids), user_id)}
+    
+    results: List[Dict[str, Any]] = []
+    operations, positions, expected, audit_logs = [], [], {}, []
+    updated_at = datetime.now(timezone.utc)
+    seen = set()
+    for index, connection_update in enumerate(connection_updates):
+        connection = existing.get(connection_update.id)
+        if connection is None:
+            results.append(batch_error(index, status.HTTP_404_NOT_FOUND, "Connection not found", connection_update.id))
+            continue
+        if connection_update.id in seen:
+            results.append(batch_error(index, status.HTTP_409_CONFLICT, "Connection appears more than once in the batch", connection_update.id))
+            continue
+        seen.add(connection_update.id)
+        current_version = connection.get('version') or 0
+        if connection_update.version is not None and connection_update.version != current_version:
+            results.append(batch_error(index, status.HTTP_412_PRECONDITION_FAILED, "Connection was modified by another request", connection_update.id))
+            continue
+        
+        update_data = connection_update.model_dump(exclude_unset=True, exclude={"id", "version"})
+        if update_data.get('parameters') is not None and connection.get('typical_id'):
+            results.append(batch_error(index, status.HTTP_400_BAD_REQUEST,
+                                       f"Connection is an instance of typical {connection['typical_id']}; change its overrides instead",
+                                       connection_update.id))
+            continue
+        if not update_data:
+            results.append({"index": index, "id": connection_update.id, "status_code": status.HTTP_200_OK, "etag": entity_tag(connection)})
+            continue
+        
+        audit_fields = list(update_data.keys())
+        revalidation = None
+        if update_data.get('parameters') is not None:
+            revalidation = await run_in_threadpool(incremental_revalidation, rule_engine, connection, update_data['parameters'])
+        update_data['updated_at'] = updated_at
+        if revalidation:
+            update_data = {**revalidation['update'], **update_data}
+        
+        operations.append(UpdateOne(
+            {"id": connection_update.id, "user_id": user_id, **version_filter(current_version)},
+            {"$set": update_data, "$inc": {"version": 1}}
+        ))
+        positions.append(index)
+        expected[connection_update.id] = current_version + 1
+        results.append({"index": index, "id": connection_update.id, "status_code": status.HTTP_200_OK,
+                        "etag": entity_tag({"version": current_version + 1})})
+        audit_logs.append(AuditLogCreate(
+            action=AuditAction.UPDATE_CONNECTION,
+            user_id=user_id,
+            connection_id=connection_update.id,
+            details={"updated_fields": audit_fields, "batch": True}
+        ))
+        if revalidation:
+            audit_logs.append(AuditLogCreate(
+                action=AuditAction.VALIDATE_CONNECTION,
+                user_id=user_id,
+                connection_id=connection_update.id,
+                details={
+                    "incremental": True,
+                    "changed_parameters": revalidation['changed_parameters'],
+                    "rerun_rules": revalidation['rerun_rules'],
+                    "is_valid": revalidation['is_valid'],
+                    "geometry_valid": revalidation['update']['geometry_valid'],
+                    "batch": True
+                }
+            ))
+    
+    await run_batch(operations, positions, results)
     
-    if isinstance(connection['created_at'], str):
-        connection['created_at'] = datetime.fromisoformat(connection['created_at'])
-    if isinstance(connection['updated_at'], str):
-        connection['updated_at'] = datetime.fromisoformat(connection['updated_at'])
+    if expected:
+        versions = {c['id']: c.get('version') or 0
+                    for c in await connections.get_many(list(expected), user_id, {"_id": 0, "id": 1, "version": 1})}
+        for index in positions:
+            connection_id = results[index]['id']
+            if results[index]['status_code'] == status.HTTP_200_OK and versions.get(connection_id) != expected[connection_id]:
+                results[index] = batch_error(index, status.HTTP_409_CONFLICT, "Connection was modified by another request", connection_id)
     
-    return Connection(**connection)
+    failed = {results[index]['id'] for index in positions if results[index]['status_code'] != status.HTTP_200_OK}
+    await audit_service.log_actions([log for log in audit_logs if log.connection_id not in failed], durable=True)
+    
+    succeeded = sum(1 for result in results if result['status_code'] == status.HTTP_200_OK)
+    return FastJSONResponse({"results": results, "succeeded": succeeded, "failed": len(results) - succeeded})
 
-@router.put("/{connection_id}", response_model=Connection)
-async def update_connection(connection_id: str, connection_update: ConnectionUpdate, user_id: str = Depends(get_current_user)):
-    connection = await db.connections.find_one({"id": connection_id, "user_id": user_id}, {"_id": 0})
+@router.get("/{connection_id}", response_model=ConnectionPayload)
+async def get_connection(connection_id: str, request: Request, view: ConnectionView = "full",
+                         fields: Optional[str] = None, user_id: str = Depends(get_current_user)):
+    variant = f"fields={fields}" if fields else (None if view == "full" else f"view={view}")
+    if request.headers.get('if-none-match'):
+        version = await connections.current_version(connection_id, user_id)
+        if version is not None and if_none_match(request, entity_tag({"version": version}, variant)):
+            return not_modified(entity_tag({"version": version}, variant))
+    
+    projection = connection_projection(view, fields)
+    if projection is not None:
+        projection = {**projection, "version": 1}
+    connection = await connections.get(connection_id, user_id, projection)
     if not connection:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
     
+    etag = entity_tag(connection, variant)
+    await DESIGNS.attach([connection])
+    return FastJSONResponse(connection_payload(connection, view, fields), headers={"ETag": etag})
+
+@router.put("/{connection_id}", response_model=Connection)
+async def update_connection(connection_id: str, connection_update: ConnectionUpdate, request: Request,
+                            user_id: str = Depends(get_current_user)):
+    expected_version = if_match_version(request)
+    conditional = expected_version is not None
     update_data = connection_update.model_dump(exclude_unset=True)
+    
+    revalidation = None
+    if update_data.get('parameters') is not None or not update_data:
+        connection = await connections.get(connection_id, user_id)
+        if not connection:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+        if update_data and connection.get('typical_id'):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Connection is an instance of typical {connection['typical_id']}; change its overrides instead"
+            )
+        current_version = connection.get('version') or 0
+        if expected_version is not None and expected_version != current_version:
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Connection was modified by another request")
+        expected_version = current_version
+        if update_data:
+            revalidation = await run_in_threadpool(incremental_revalidation, rule_engine, connection, update_data['parameters'])
+    
+    audit_fields = list(update_data.keys())
     if update_data:
-        update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-        await db.connections.update_one({"id": connection_id}, {"$set": update_data})
+        update_data['updated_at'] = datetime.now(timezone.utc)
+        if revalidation:
+            update_data = {**revalidation['update'], **update_data}
+        connection = await connections.apply_update(
+            connection_id,
+            update_data,
+            user_id,
+            None if expected_version is None else version_filter(expected_version)
+        )
+        if not connection:
+            if await connections.current_version(connection_id, user_id) is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED if conditional else status.HTTP_409_CONFLICT,
+                detail="Connection was modified by another request"
+            )
     
     await audit_service.log_action(AuditLogCreate(
         action=AuditAction.UPDATE_CONNECTION,
         user_id=user_id,
         connection_id=connection_id,
-        details={"updated_fields": list(update_data.keys())}
+        details={"updated_fields": audit_fields}
     ))
     
-    updated_connection = await db.connections.find_one({"id": connection_id}, {"_id": 0})
-    if isinstance(updated_connection['created_at'], str):
-        updated_connection['created_at'] = datetime.fromisoformat(updated_connection['created_at'])
-    if isinstance(updated_connection['updated_at'], str):
-        updated_connection['updated_at'] = datetime.fromisoformat(updated_connection['updated_at'])
+    if revalidation:
+        await audit_service.log_action(AuditLogCreate(
+            action=AuditAction.VALIDATE_CONNECTION,
+            user_id=user_id,
+            connection_id=connection_id,
+            details={
+                "incremental": True,
+                "changed_parameters": revalidation['changed_parameters'],
+                "rerun_rules": revalidation['rerun_rules'],
+                "is_valid": revalidation['is_valid'],
+                "geometry_valid": revalidation['update']['geometry_valid']
+            }
+        ))
     
-    return Connection(**updated_connection)
+    etag = entity_tag(connection)
+    await DESIGNS.attach([connection])
+    return FastJSONResponse(Connection(**unpack_document(connection)), headers={"ETag": etag})
 
-@router.post("/{connection_id}/validate")
-async def validate_connection(connection_id: str, user_id: str = Depends(get_current_user)):
-    connection = await db.connections.find_one({"id": connection_id, "user_id": user_id}, {"_id": 0})
+async def run_validation(connection_id: str, user_id: str) -> Dict[str, Any]:
+    connection = await connections.get(connection_id, user_id)
     if not connection:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
     
+    if connection.get('typical_id'):
+        return await validate_instance(connection, user_id)
+    
     param_validation = ValidationEngine.validate_parameters(
         connection['parameters'],
         connection['connection_type']
@@ -123,30 +405,29 @@ async def validate_connection(connection_id: str, user_id: str = Depends(get_cur
             "validation_results": param_validation
         }
     
-    rule_result = rule_engine.validate_connection(
+    rule_result = await rule_cache.get_or_compute(
         connection['connection_type'],
-        connection['parameters']
+        connection['parameters'],
+        lambda: rule_engine.validate_connection(connection['connection_type'], connection['parameters'])
     )
     
-    geometry = GeometryGenerator.generate_connection(
+    geometry = await geometry_cache.get_or_compute(
         connection['connection_type'],
-        connection['parameters']
+        connection['parameters'],
+        lambda: GeometryGenerator.build(connection['connection_type'], connection['parameters'])
     )
     
     geom_validation = ValidationEngine.validate_geometry(geometry)
     
-    await db.connections.update_one(
-        {"id": connection_id},
-        {
-            "$set": {
-                "validation_results": rule_result.model_dump(),
-                "geometry": geometry,
-                "rule_checks": [check.model_dump() for check in rule_result.checks],
-                "status": ConnectionStatus.VALIDATED if rule_result.is_valid else ConnectionStatus.FAILED,
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }
-        }
-    )
+    rule_validation = rule_result.to_dict()
+    
+    await connections.update(connection_id, {
+        "validation_results": rule_validation,
+        **packed_fields(geometry),
+        "rule_checks": rule_validation['checks'],
+        "status": ConnectionStatus.VALIDATED if rule_result.is_valid else ConnectionStatus.FAILED,
+        "updated_at": datetime.now(timezone.utc)
+    })
     
     await audit_service.log_action(AuditLogCreate(
         action=AuditAction.VALIDATE_CONNECTION,
@@ -158,26 +439,85 @@ async def validate_connection(connection_id: str, user_id: str = Depends(get_cur
         }
     ))
     
-    for check in rule_result.checks:
-        await audit_service.log_action(AuditLogCreate(
+    await audit_service.log_actions([
+        AuditLogCreate(
             action=AuditAction.RULE_CHECK,
             user_id=user_id,
             connection_id=connection_id,
-            details=check.model_dump()
-        ))
+            details=check
+        )
+        for check in rule_validation['checks']
+    ])
     
     return {
         "status": "validated" if rule_result.is_valid else "failed",
-        "rule_validation": rule_result.model_dump(),
+        "rule_validation": rule_validation,
         "geometry_validation": geom_validation,
-        "geometry": geometry
+        "geometry": materialize(geometry)
     }
 
-@router.post("/{connection_id}/export/tekla")
-async def export_to_tekla(connection_id: str, user_id: str = Depends(get_current_user)):
-    connection = await db.connections.find_one({"id": connection_id, "user_id": user_id}, {"_id": 0})
+async def validate_instance(connection: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    stats = await DESIGNS.link([connection])
+    connection = unpack_document((await DESIGNS.attach([await connections.get(connection['id'], user_id)]))[0])
+    rule_validation = connection.get('validation_results') or {}
+    
+    await audit_service.log_action(AuditLogCreate(
+        action=AuditAction.VALIDATE_CONNECTION,
+        user_id=user_id,
+        connection_id=connection['id'],
+        details={
+            "rule_result": rule_validation.get('summary'),
+            "is_valid": rule_validation.get('is_valid', False),
+            "typical_id": connection['typical_id'],
+            "design_key": connection['design_key'],
+            "shared_design": stats['computed'] == 0
+        }
+    ))
+    
+    return {
+        "status": connection['status'],
+        "rule_validation": rule_validation,
+        "geometry": connection.get('geometry'),
+        "design_key": connection['design_key'],
+        "shared_design": stats['computed'] == 0
+    }
+
+@router.post("/{connection_id}/validate")
+async def validate_connection(connection_id: str, request: Request, user_id: str = Depends(get_current_user)):
+    if wants_async(request):
+        if await connections.current_version(connection_id, user_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+        return job_accepted(await JOBS.submit(JobKind.VALIDATE_CONNECTION, user_id, {"connection_id": connection_id}))
+    return FastJSONResponse(await run_validation(connection_id, user_id))
+
+@router.get("/{connection_id}/geometry")
+async def get_connection_geometry(connection_id: str, request: Request, precision: int = 8,
+                                  user_id: str = Depends(get_current_user)):
+    connection = await connections.get(connection_id, user_id, {"_id": 0, "geometry": 1, "geometry_packed": 1, "design_key": 1})
+    if not connection:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+    await DESIGNS.attach([connection])
+    if precision not in (4, 8):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="precision must be 4 or 8")
+    
+    packed = connection.get('geometry_packed')
+    if packed is None and not connection.get('geometry'):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection has no geometry; validate it first")
+    
+    if MEDIA_TYPE not in request.headers.get('accept', ''):
+        return FastJSONResponse(unpack_document(connection)['geometry'])
+    
+    if packed is None:
+        packed = encode_geometry(connection['geometry'], precision)
+    elif PackedGeometry(packed).precision != precision:
+        packed = encode_geometry(PackedGeometry(packed).build(), precision)
+    return Response(content=bytes(packed), media_type=MEDIA_TYPE)
+
+async def run_export(connection_id: str, user_id: str) -> Dict[str, Any]:
+    connection = await connections.get(connection_id, user_id)
     if not connection:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+    connection = unpack_document((await DESIGNS.attach([connection]))[0])
     
     if not connection.get('geometry'):
         raise HTTPException(
@@ -187,10 +527,7 @@ async def export_to_tekla(connection_id: str, user_id: str = Depends(get_current
     
     tekla_output = TeklaExporter.export_connection(connection, connection['geometry'])
     
-    await db.connections.update_one(
-        {"id": connection_id},
-        {"$set": {"status": ConnectionStatus.EXPORTED.value}}
-    )
+    await connections.update(connection_id, {"status": ConnectionStatus.EXPORTED.value})
     
     await audit_service.log_action(AuditLogCreate(
         action=AuditAction.EXPORT_TEKLA,
@@ -206,17 +543,33 @@ async def export_to_tekla(connection_id: str, user_id: str = Depends(get_current
         "disclaimer": "Engineering review and approval required before fabrication"
     }
 
+@router.post("/{connection_id}/export/tekla")
+async def export_to_tekla(connection_id: str, request: Request, user_id: str = Depends(get_current_user)):
+    if wants_async(request):
+        if await connections.current_version(connection_id, user_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+        return job_accepted(await JOBS.submit(JobKind.EXPORT_TEKLA, user_id, {"connection_id": connection_id}))
+    return FastJSONResponse(await run_export(connection_id, user_id))
+
 @router.delete("/{connection_id}")
 async def delete_connection(connection_id: str, user_id: str = Depends(get_current_user)):
-    connection = await db.connections.find_one({"id": connection_id, "user_id": user_id}, {"_id": 0})
+    connection = await connections.get(connection_id, user_id)
     if not connection:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
     
-    result = await db.connections.delete_one({"id": connection_id, "user_id": user_id})
+    await connections.delete(connection_id, user_id)
     
-    await db.projects.update_one(
-        {"id": connection['project_id']},
-        {"$inc": {"connection_count": -1}}
-    )
+    await projects.increment_connection_count(connection['project_id'], -1)
+    if connection.get('typical_id'):
+        await typicals.increment_instance_count(connection['typical_id'], -1)
     
-    return {"message": "Connection deleted successfully"}
\ No newline at end of file
+    return {"message": "Connection deleted successfully"}
+
+async def validate_job(job: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+    return await run_validation(job['payload']['connection_id'], job['user_id'])
+
+async def export_job(job: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+    return await run_export(job['payload']['connection_id'], job['user_id'])
+
+JOBS.register(JobKind.VALIDATE_CONNECTION, validate_job, concurrency=4)
+JOBS.register(JobKind.EXPORT_TEKLA, export_job)
\ No newline at end of file
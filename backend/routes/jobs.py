@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from models.job import Job
+from utils.dependencies import get_current_user
+from utils.responses import FastJSONResponse
+from job_service.scheduler import JOBS
+from database import JobRepo
+from typing import Any, Dict
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+jobs = JobRepo()
+
+LEASE_FIELDS = {"lease_owner", "lease_expires_at"}
+
+def job_payload(job: Dict[str, Any]) -> Dict[str, Any]:
+    return Job(**job).model_dump(exclude=LEASE_FIELDS)
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, user_id: str = Depends(get_current_user)):
+    job = await jobs.get(job_id, user_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    
+    return FastJSONResponse(job_payload(job))
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: str, user_id: str = Depends(get_current_user)):
+    job = await JOBS.cancel(job_id, user_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    
+    return FastJSONResponse(job_payload(job))
\ No newline at end of file
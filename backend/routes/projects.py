@@ -1,78 +1,307 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from motor.motor_asyncio import AsyncIOMotorDatabase
-from models.project import Project, ProjectCreate, ProjectUpdate
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pymongo import UpdateOne
+from models.project import Project, ProjectCreate, ProjectUpdate, ClashCheckRequest
+from models.audit_log import AuditLogCreate, AuditAction
 from utils.dependencies import get_current_user
-from typing import List
-import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from datetime import datetime
+from utils.pagination import keyset_page, ndjson_stream, wants_ndjson
+from utils.responses import FastJSONResponse, dumps
+from utils.etags import entity_tag, if_match_version, if_none_match, not_modified, version_filter
+from clash_service.clash import CLASH_SERVICE
+from audit_service.audit import AuditService
+from database import AuditRepo, ConnectionRepo, ProjectRepo, TypicalRepo
+from validation_engine.designs import DESIGNS
+from import_service.schedule import import_settings, open_schedule, prepare_chunk, schedule_format
+from validation_engine.bulk import CHUNK_SIZE, executor, shutdown_executor, validate_documents, worker_count
+from concurrent.futures.process import BrokenProcessPool
+from zipfile import BadZipFile
+from typing import List, Optional
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+projects = ProjectRepo()
+connections = ConnectionRepo()
+typicals = TypicalRepo()
+
+audit_service = AuditService(AuditRepo())
+
+BULK_WRITE_SIZE = 500
 
 @router.post("/", response_model=Project)
 async def create_project(project_create: ProjectCreate, user_id: str = Depends(get_current_user)):
     project = Project(**project_create.model_dump(), user_id=user_id)
     doc = project.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     
-    await db.projects.insert_one(doc)
-    return project
+    await projects.insert_one(doc)
+    return FastJSONResponse(project, headers={"ETag": entity_tag(doc)})
 
 @router.get("/", response_model=List[Project])
-async def get_projects(user_id: str = Depends(get_current_user)):
-    projects = await db.projects.find({"user_id": user_id}, {"_id": 0}).to_list(1000)
-    
-    for project in projects:
-        if isinstance(project['created_at'], str):
-            project['created_at'] = datetime.fromisoformat(project['created_at'])
-        if isinstance(project['updated_at'], str):
-            project['updated_at'] = datetime.fromisoformat(project['updated_at'])
+async def get_projects(request: Request, response: Response, after: Optional[str] = None,
+                       limit: int = Query(1000, ge=1, le=1000), user_id: str = Depends(get_current_user)):
+    if wants_ndjson(request):
+        return await ndjson_stream(
+            lambda: projects.stream_for_user(user_id, after),
+            lambda p: dumps(Project(**p))
+        )
     
-    return [Project(**p) for p in projects]
+    documents = await keyset_page(projects.page_for_user(user_id, after, limit), response)
+    return [Project(**p) for p in documents]
 
 @router.get("/{project_id}", response_model=Project)
-async def get_project(project_id: str, user_id: str = Depends(get_current_user)):
-    project = await db.projects.find_one({"id": project_id, "user_id": user_id}, {"_id": 0})
+async def get_project(project_id: str, request: Request, user_id: str = Depends(get_current_user)):
+    if request.headers.get('if-none-match'):
+        version = await projects.current_version(project_id, user_id)
+        if version is not None and if_none_match(request, entity_tag({"version": version})):
+            return not_modified(entity_tag({"version": version}))
+    
+    project = await projects.get(project_id, user_id)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
-    if isinstance(project['created_at'], str):
-        project['created_at'] = datetime.fromisoformat(project['created_at'])
-    if isinstance(project['updated_at'], str):
-        project['updated_at'] = datetime.fromisoformat(project['updated_at'])
-    
-    return Project(**project)
+    return FastJSONResponse(Project(**project), headers={"ETag": entity_tag(project)})
 
 @router.put("/{project_id}", response_model=Project)
-async def update_project(project_id: str, project_update: ProjectUpdate, user_id: str = Depends(get_current_user)):
-    project = await db.projects.find_one({"id": project_id, "user_id": user_id}, {"_id": 0})
+async def update_project(project_id: str, project_update: ProjectUpdate, request: Request,
+                         user_id: str = Depends(get_current_user)):
+    expected_version = if_match_version(request)
+    update_data = project_update.model_dump(exclude_unset=True)
+    if update_data:
+        update_data['updated_at'] = datetime.now(timezone.utc)
+        updated_project = await projects.apply_update(
+            project_id,
+            update_data,
+            user_id,
+            None if expected_version is None else version_filter(expected_version)
+        )
+    else:
+        updated_project = await projects.get(project_id, user_id)
+        if updated_project and expected_version is not None and (updated_project.get('version') or 0) != expected_version:
+            updated_project = None
+    
+    if not updated_project:
+        if expected_version is not None and await projects.current_version(project_id, user_id) is not None:
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Project was modified by another request")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    
+    return FastJSONResponse(Project(**updated_project), headers={"ETag": entity_tag(updated_project)})
+
+@router.post("/{project_id}/clash-check")
+async def clash_check(project_id: str, request: ClashCheckRequest = ClashCheckRequest(),
+                      user_id: str = Depends(get_current_user)):
+    project = await projects.get(project_id, user_id, {"_id": 0, "id": 1})
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
-    update_data = project_update.model_dump(exclude_unset=True)
-    if update_data:
-        update_data['updated_at'] = datetime.now().isoformat()
-        await db.projects.update_one({"id": project_id}, {"$set": update_data})
+    documents = await connections.list_for_project(
+        project_id,
+        user_id,
+        {"_id": 0, "id": 1, "connection_type": 1, "parameters": 1, "placement": 1}
+    )
+    
+    return await run_in_threadpool(
+        CLASH_SERVICE.check,
+        project_id,
+        documents,
+        request.min_clearance,
+        request.include_plates,
+        request.max_results
+    )
+
+@router.post("/{project_id}/validate-all")
+async def validate_all_connections(project_id: str, user_id: str = Depends(get_current_user)):
+    project = await projects.get(project_id, user_id, {"_id": 0, "id": 1})
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    
+    async def stream():
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        max_in_flight = worker_count() * 2
+        pending = set()
+        chunk_ids = {}
+        operations = []
+        audit_logs = []
+        counts = {"validated": 0, "failed": 0, "error": 0}
+        
+        async def flush():
+            if operations:
+                await connections.bulk_write(operations, ordered=False)
+                operations.clear()
+            if audit_logs:
+                await audit_service.log_actions(audit_logs)
+                audit_logs.clear()
+        
+        def submit(chunk: List[dict]):
+            future = loop.run_in_executor(executor(), validate_documents, chunk)
+            chunk_ids[future] = [connection['id'] for connection in chunk]
+            pending.add(future)
+        
+        def collect(done) -> List[str]:
+            lines = []
+            updated_at = datetime.now(timezone.utc)
+            for future in done:
+                ids = chunk_ids.pop(future)
+                try:
+                    results = future.result()
+                except BrokenProcessPool:
+                    shutdown_executor()
+                    results = [{"connection_id": i, "status": "error", "message": "Validation worker crashed", "update": None}
+                               for i in ids]
+                for result in results:
+                    update = result.pop('update')
+                    counts[result['status']] = counts.get(result['status'], 0) + 1
+                    if update is not None:
+                        operations.append(UpdateOne(
+                            {"id": result['connection_id']},
+                            {"$set": {**update, "updated_at": updated_at}, "$inc": {"version": 1}}
+                        ))
+                        audit_logs.append(AuditLogCreate(
+                            action=AuditAction.VALIDATE_CONNECTION,
+                            user_id=user_id,
+                            connection_id=result['connection_id'],
+                            project_id=project_id,
+                            details={
+                                "rule_result": result['summary'],
+                                "is_valid": result['is_valid'],
+                                "rule_checks": len(update['rule_checks']),
+                                "bulk": True
+                            }
+                        ))
+                    lines.append(json.dumps({"type": "result", **result}) + "\n")
+            return lines
+        
+        cursor = connections.stream_for_project(
+            project_id,
+            user_id,
+            {"_id": 0, "id": 1, "connection_type": 1, "parameters": 1},
+            batch_size=CHUNK_SIZE * max_in_flight,
+            standalone=True
+        )
+        
+        try:
+            chunk = []
+            async for connection in cursor:
+                chunk.append(connection)
+                if len(chunk) < CHUNK_SIZE:
+                    continue
+                submit(chunk)
+                chunk = []
+                while len(pending) >= max_in_flight:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for line in collect(done):
+                        yield line
+                    if len(operations) >= BULK_WRITE_SIZE:
+                        await flush()
+            if chunk:
+                submit(chunk)
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for line in collect(done):
+                    yield line
+                if len(operations) >= BULK_WRITE_SIZE:
+                    await flush()
+            await flush()
+        finally:
+            for future in pending:
+                future.cancel()
+        
+        for typical in await typicals.list_for_project(project_id, user_id):
+            instances = await connections.list_for_typical(
+                typical['id'],
+                user_id,
+                {"_id": 0, "id": 1, "connection_type": 1, "overrides": 1, "design_key": 1, "status": 1}
+            )
+            stats = await DESIGNS.link(instances, typical)
+            counts["instances"] = counts.get("instances", 0) + stats['instances']
+            yield json.dumps({"type": "typical", "typical_id": typical['id'], **stats}) + "\n"
+        
+        yield json.dumps({
+            "type": "summary",
+            "project_id": project_id,
+            "total": sum(counts.values()),
+            **counts,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/{project_id}/import")
+async def import_connections(project_id: str, file: UploadFile = File(...), user_id: str = Depends(get_current_user)):
+    project = await projects.get(project_id, user_id, {"_id": 0, "id": 1})
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    
+    settings = import_settings()
+    try:
+        schedule = schedule_format(file.filename, file.content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    content = await file.read(settings['max_bytes'] + 1)
+    if len(content) > settings['max_bytes']:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"Schedule exceeds {settings['max_bytes']} bytes")
+    try:
+        chunks = await run_in_threadpool(open_schedule, content, schedule, settings['chunk_size'])
+    except (ValueError, BadZipFile) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Could not read schedule: {e}")
     
-    updated_project = await db.projects.find_one({"id": project_id}, {"_id": 0})
-    if isinstance(updated_project['created_at'], str):
-        updated_project['created_at'] = datetime.fromisoformat(updated_project['created_at'])
-    if isinstance(updated_project['updated_at'], str):
-        updated_project['updated_at'] = datetime.fromisoformat(updated_project['updated_at'])
+    async def stream():
+        started = time.perf_counter()
+        counts = {"rows": 0, "inserted": 0, "failed": 0, "warnings": 0}
+        
+        try:
+            while True:
+                try:
+                    chunk = await run_in_threadpool(next, chunks, None)
+                except ValueError as e:
+                    yield json.dumps({"type": "error", "row": counts["rows"] + 1, "issues": [f"Could not read schedule: {e}"]}) + "\n"
+                    break
+                if chunk is None:
+                    break
+                
+                documents, errors, warnings = await run_in_threadpool(prepare_chunk, chunk, counts["rows"] + 1, project_id, user_id)
+                for start in range(0, len(documents), BULK_WRITE_SIZE):
+                    await connections.insert_many(documents[start:start + BULK_WRITE_SIZE], ordered=False)
+                    counts["inserted"] += len(documents[start:start + BULK_WRITE_SIZE])
+                counts["rows"] += len(chunk)
+                counts["failed"] += len(errors)
+                counts["warnings"] += warnings
+                
+                for error in errors:
+                    yield json.dumps({"type": "error", **error}, default=str) + "\n"
+                yield json.dumps({"type": "progress", **counts}) + "\n"
+        finally:
+            if counts["inserted"]:
+                await projects.increment_connection_count(project_id, counts["inserted"])
+            await audit_service.log_action(AuditLogCreate(
+                action=AuditAction.IMPORT_CONNECTIONS,
+                user_id=user_id,
+                project_id=project_id,
+                details={"filename": file.filename, "format": schedule, **counts}
+            ))
+        
+        yield json.dumps({
+            "type": "summary",
+            "project_id": project_id,
+            **counts,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }) + "\n"
     
-    return Project(**updated_project)
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 @router.delete("/{project_id}")
 async def delete_project(project_id: str, user_id: str = Depends(get_current_user)):
-    result = await db.projects.delete_one({"id": project_id, "user_id": user_id})
-    if result.deleted_count == 0:
+    if not await projects.delete(project_id, user_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
-    await db.connections.delete_many({"project_id": project_id})
+    await connections.delete_for_project(project_id)
+    await typicals.delete_for_project(project_id)
     
     return {"message": "Project deleted successfully"}
\ No newline at end of file
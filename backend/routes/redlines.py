@@ -1,28 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from models.redline import Redline, RedlineCreate, RedlineStatus, AIExtraction
+from models.connection import clean_parameters
 from models.audit_log import AuditLogCreate, AuditAction
+from models.job import JobKind
 from utils.dependencies import get_current_user
+from utils.jobs import job_accepted, wants_async
 from ai_service.ai_assistant import AIService
 from audit_service.audit import AuditService
-import os
+from job_service.scheduler import JOBS, JobContext
+from rule_engine import AISC360RuleEngine
+from validation_engine.incremental import incremental_revalidation
+from database import AuditRepo, ConnectionRepo, RedlineRepo
 import base64
-from motor.motor_asyncio import AsyncIOMotorClient
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 import json
 
 router = APIRouter(prefix="/redlines", tags=["redlines"])
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+redlines = RedlineRepo()
+connections = ConnectionRepo()
 
 ai_service = AIService()
-audit_service = AuditService(db)
+audit_service = AuditService(AuditRepo())
+rule_engine = AISC360RuleEngine()
 
 @router.post("/upload")
 async def upload_redline(connection_id: str, file: UploadFile = File(...), user_id: str = Depends(get_current_user)):
-    connection = await db.connections.find_one({"id": connection_id, "user_id": user_id}, {"_id": 0})
+    connection = await connections.get(connection_id, user_id)
     if not connection:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
     
@@ -37,10 +43,8 @@ async def upload_redline(connection_id: str, file: UploadFile = File(...), user_
     )
     
     doc = redline.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     
-    await db.redlines.insert_one(doc)
+    await redlines.insert_one(doc)
     
     return {
         "redline_id": redline.id,
@@ -48,20 +52,16 @@ async def upload_redline(connection_id: str, file: UploadFile = File(...), user_
         "message": "Redline uploaded successfully. Ready for AI interpretation."
     }
 
-@router.post("/{redline_id}/interpret")
-async def interpret_redline(redline_id: str, user_id: str = Depends(get_current_user)):
-    redline = await db.redlines.find_one({"id": redline_id, "user_id": user_id}, {"_id": 0})
+async def run_interpretation(redline_id: str, user_id: str, context: Optional[JobContext] = None) -> Dict[str, Any]:
+    redline = await redlines.get(redline_id, user_id)
     if not redline:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Redline not found")
     
-    connection = await db.connections.find_one({"id": redline['connection_id']}, {"_id": 0})
+    connection = await connections.get(redline['connection_id'])
     if not connection:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
     
-    await db.redlines.update_one(
-        {"id": redline_id},
-        {"$set": {"status": RedlineStatus.PROCESSING.value}}
-    )
+    await redlines.update(redline_id, {"status": RedlineStatus.PROCESSING.value})
     
     connection_context = {
         "connection_id": connection['id'],
@@ -69,7 +69,13 @@ async def interpret_redline(redline_id: str, user_id: str = Depends(get_current_
         "current_parameters": connection['parameters']
     }
     
-    ai_result = await ai_service.interpret_redline("", connection_context)
+    if context is not None:
+        await context.progress(0.1, "Interpreting redline")
+    try:
+        ai_result = await ai_service.interpret_redline("", connection_context)
+    except BaseException:
+        await redlines.update(redline_id, {"status": RedlineStatus.UPLOADED.value})
+        raise
     
     extraction = AIExtraction(
         intent=ai_result.get('intent', ''),
@@ -78,16 +84,11 @@ async def interpret_redline(redline_id: str, user_id: str = Depends(get_current_
         reasoning=ai_result.get('reasoning', '')
     )
     
-    await db.redlines.update_one(
-        {"id": redline_id},
-        {
-            "$set": {
-                "status": RedlineStatus.EXTRACTED.value,
-                "ai_extraction": extraction.model_dump(),
-                "updated_at": datetime.now().isoformat()
-            }
-        }
-    )
+    await redlines.update(redline_id, {
+        "status": RedlineStatus.EXTRACTED.value,
+        "ai_extraction": extraction.model_dump(),
+        "updated_at": datetime.now(timezone.utc)
+    })
     
     await audit_service.log_action(AuditLogCreate(
         action=AuditAction.AI_REDLINE,
@@ -109,40 +110,50 @@ async def interpret_redline(redline_id: str, user_id: str = Depends(get_current_
         "warnings": ai_result.get('warnings', [])
     }
 
+@router.post("/{redline_id}/interpret")
+async def interpret_redline(redline_id: str, request: Request, user_id: str = Depends(get_current_user)):
+    if wants_async(request):
+        if not await redlines.get(redline_id, user_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Redline not found")
+        return job_accepted(await JOBS.submit(JobKind.INTERPRET_REDLINE, user_id, {"redline_id": redline_id}))
+    return await run_interpretation(redline_id, user_id)
+
 @router.post("/{redline_id}/approve")
 async def approve_redline_changes(redline_id: str, approved_params: dict, user_id: str = Depends(get_current_user)):
-    redline = await db.redlines.find_one({"id": redline_id, "user_id": user_id}, {"_id": 0})
+    try:
+        approved_params = clean_parameters(approved_params)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    
+    redline = await redlines.get(redline_id, user_id)
     if not redline:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Redline not found")
     
-    connection = await db.connections.find_one({"id": redline['connection_id']}, {"_id": 0})
+    connection = await connections.get(redline['connection_id'])
     if not connection:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+    if connection.get('typical_id'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Connection is an instance of typical {connection['typical_id']}; change its overrides instead"
+        )
     
     current_params = connection['parameters']
     updated_params = {**current_params, **approved_params}
     
-    await db.connections.update_one(
-        {"id": connection['id']},
-        {
-            "$set": {
-                "parameters": updated_params,
-                "updated_at": datetime.now().isoformat(),
-                "status": "draft"
-            }
-        }
-    )
+    revalidation = await run_in_threadpool(incremental_revalidation, rule_engine, connection, updated_params)
     
-    await db.redlines.update_one(
-        {"id": redline_id},
-        {
-            "$set": {
-                "status": RedlineStatus.APPROVED.value,
-                "approved_changes": approved_params,
-                "updated_at": datetime.now().isoformat()
-            }
-        }
-    )
+    await connections.update(connection['id'], {
+        **(revalidation['update'] if revalidation else {"status": "draft"}),
+        "parameters": updated_params,
+        "updated_at": datetime.now(timezone.utc)
+    })
+    
+    await redlines.update(redline_id, {
+        "status": RedlineStatus.APPROVED.value,
+        "approved_changes": approved_params,
+        "updated_at": datetime.now(timezone.utc)
+    })
     
     await audit_service.log_action(AuditLogCreate(
         action=AuditAction.USER_APPROVAL,
@@ -153,7 +164,31 @@ async def approve_redline_changes(redline_id: str, approved_params: dict, user_i
             "approved_changes": approved_params,
             "human_approved": True
         }
-    ))
+    ), durable=True)
+    
+    if revalidation:
+        await audit_service.log_action(AuditLogCreate(
+            action=AuditAction.VALIDATE_CONNECTION,
+            user_id=user_id,
+            connection_id=connection['id'],
+            details={
+                "incremental": True,
+                "redline_id": redline_id,
+                "changed_parameters": revalidation['changed_parameters'],
+                "rerun_rules": revalidation['rerun_rules'],
+                "is_valid": revalidation['is_valid'],
+                "geometry_valid": revalidation['update']['geometry_valid']
+            }
+        ))
+        return {
+            "message": "Changes approved and applied to connection",
+            "connection_id": connection['id'],
+            "updated_parameters": updated_params,
+            "status": revalidation['update']['status'],
+            "rerun_rules": revalidation['rerun_rules'],
+            "geometry_validation": revalidation['geometry_validation'],
+            "note": "Rule checks affected by the approved changes were re-run against the updated parameters."
+        }
     
     return {
         "message": "Changes approved and applied to connection",
@@ -164,15 +199,11 @@ async def approve_redline_changes(redline_id: str, approved_params: dict, user_i
 
 @router.get("/{connection_id}/list")
 async def get_connection_redlines(connection_id: str, user_id: str = Depends(get_current_user)):
-    redlines = await db.redlines.find(
-        {"connection_id": connection_id, "user_id": user_id},
-        {"_id": 0}
-    ).to_list(100)
-    
-    for redline in redlines:
-        if isinstance(redline['created_at'], str):
-            redline['created_at'] = datetime.fromisoformat(redline['created_at'])
-        if isinstance(redline['updated_at'], str):
-            redline['updated_at'] = datetime.fromisoformat(redline['updated_at'])
-    
-    return [Redline(**r) for r in redlines]
\ No newline at end of file
+    documents = await redlines.list_for_connection(connection_id, user_id)
+    
+    return [Redline(**r) for r in documents]
+
+async def interpret_job(job: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+    return await run_interpretation(job['payload']['redline_id'], job['user_id'], context)
+
+JOBS.register(JobKind.INTERPRET_REDLINE, interpret_job)
\ No newline at end of file
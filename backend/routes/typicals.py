@@ -0,0 +1,298 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from models.typical import Typical, TypicalCreate, TypicalUpdate, InstanceBatchCreate, InstanceUpdate
+from models.connection import Connection, ConnectionStatus
+from models.audit_log import AuditLogCreate, AuditAction
+from utils.dependencies import get_current_user
+from utils.pagination import keyset_page, ndjson_stream, wants_ndjson
+from utils.responses import FastJSONResponse, dumps
+from utils.etags import entity_tag, if_match_version, if_none_match, not_modified, version_filter
+from validation_engine.designs import DESIGNS, design_key, resolve_parameters
+from geometry_engine.encoding import stored_geometry, unpack_document
+from export_service.tekla_exporter import TeklaExporter
+from audit_service.audit import AuditService
+from database import AuditRepo, ConnectionRepo, ProjectRepo, TypicalRepo
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+
+router = APIRouter(prefix="/typicals", tags=["typicals"])
+
+typicals = TypicalRepo()
+connections = ConnectionRepo()
+projects = ProjectRepo()
+
+audit_service = AuditService(AuditRepo())
+
+INSTANCE_PROJECTION = {"_id": 0, "id": 1, "connection_type": 1, "overrides": 1, "design_key": 1, "status": 1}
+
+async def get_typical_or_404(typical_id: str, user_id: str) -> Dict[str, Any]:
+    typical = await typicals.get(typical_id, user_id)
+    if not typical:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Typical not found")
+    return typical
+
+async def typical_design(typical: Dict[str, Any]) -> Dict[str, Any]:
+    key = design_key(typical['connection_type'], typical['parameters'])
+    designs, _ = await DESIGNS.ensure({key: (typical['connection_type'], typical['parameters'])})
+    return {"design_key": key, "status": designs[key]['status']}
+
+@router.post("/", response_model=Typical)
+async def create_typical(typical_create: TypicalCreate, user_id: str = Depends(get_current_user)):
+    project = await projects.get(typical_create.project_id, user_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    
+    doc = Typical(**typical_create.model_dump(), user_id=user_id).model_dump()
+    doc.update(await typical_design(doc))
+    
+    await typicals.insert_one(doc)
+    
+    await audit_service.log_action(AuditLogCreate(
+        action=AuditAction.CREATE_TYPICAL,
+        user_id=user_id,
+        project_id=doc['project_id'],
+        details={"typical_id": doc['id'], "connection_type": doc['connection_type'], "design_key": doc['design_key']}
+    ))
+    
+    return FastJSONResponse(Typical(**doc), headers={"ETag": entity_tag(doc)})
+
+@router.get("/", response_model=List[Typical])
+async def get_typicals(request: Request, response: Response, project_id: str = None,
+                       after: Optional[str] = None, limit: int = Query(1000, ge=1, le=1000),
+                       user_id: str = Depends(get_current_user)):
+    if wants_ndjson(request):
+        return await ndjson_stream(
+            lambda: typicals.stream_for_user(user_id, project_id, after),
+            lambda t: dumps(Typical(**t))
+        )
+    
+    documents = await keyset_page(typicals.page_for_user(user_id, project_id, after, limit), response)
+    return [Typical(**t) for t in documents]
+
+@router.get("/{typical_id}", response_model=Typical)
+async def get_typical(typical_id: str, request: Request, user_id: str = Depends(get_current_user)):
+    if request.headers.get('if-none-match'):
+        version = await typicals.current_version(typical_id, user_id)
+        if version is not None and if_none_match(request, entity_tag({"version": version})):
+            return not_modified(entity_tag({"version": version}))
+    
+    typical = await get_typical_or_404(typical_id, user_id)
+    return FastJSONResponse(Typical(**typical), headers={"ETag": entity_tag(typical)})
+
+@router.put("/{typical_id}", response_model=Typical)
+async def update_typical(typical_id: str, typical_update: TypicalUpdate, request: Request,
+                         user_id: str = Depends(get_current_user)):
+    expected_version = if_match_version(request)
+    typical = await get_typical_or_404(typical_id, user_id)
+    if expected_version is not None and (typical.get('version') or 0) != expected_version:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Typical was modified by another request")
+    
+    update_data = typical_update.model_dump(exclude_unset=True)
+    if update_data.get('parameters') is None:
+        update_data.pop('parameters', None)
+    if not update_data:
+        return FastJSONResponse(Typical(**typical), headers={"ETag": entity_tag(typical)})
+    
+    audit_fields = list(update_data.keys())
+    if 'parameters' in update_data:
+        update_data.update(await typical_design({**typical, **update_data}))
+    update_data['updated_at'] = datetime.now(timezone.utc)
+    
+    updated_typical = await typicals.apply_update(
+        typical_id,
+        update_data,
+        user_id,
+        version_filter(typical.get('version') or 0)
+    )
+    if not updated_typical:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED if expected_version is not None else status.HTTP_409_CONFLICT,
+            detail="Typical was modified by another request"
+        )
+    
+    fan_out = None
+    if 'parameters' in update_data:
+        fan_out = await DESIGNS.link(await connections.list_for_typical(typical_id, user_id, INSTANCE_PROJECTION), updated_typical)
+    
+    await audit_service.log_action(AuditLogCreate(
+        action=AuditAction.UPDATE_TYPICAL,
+        user_id=user_id,
+        project_id=updated_typical['project_id'],
+        details={"typical_id": typical_id, "updated_fields": audit_fields, "fan_out": fan_out}
+    ))
+    
+    return FastJSONResponse(Typical(**updated_typical), headers={"ETag": entity_tag(updated_typical)})
+
+@router.post("/{typical_id}/instances")
+async def create_instances(typical_id: str, batch: InstanceBatchCreate, user_id: str = Depends(get_current_user)):
+    typical = await get_typical_or_404(typical_id, user_id)
+    
+    documents = []
+    for offset, instance in enumerate(batch.instances):
+        connection = Connection(
+            name=instance.name or f"{typical['name']}-{typical.get('instance_count', 0) + offset + 1}",
+            connection_type=typical['connection_type'],
+            description=typical.get('description'),
+            project_id=typical['project_id'],
+            user_id=user_id,
+            parameters=resolve_parameters(typical['parameters'], instance.overrides),
+            placement=instance.placement,
+            typical_id=typical_id,
+            overrides=instance.overrides
+        )
+        documents.append(connection.model_dump())
+    
+    assignments, stats = await DESIGNS.assign(documents, typical)
+    for document, fields in assignments:
+        document.update(fields)
+    
+    await connections.insert_many(documents, ordered=False)
+    
+    await projects.increment_connection_count(typical['project_id'], len(documents))
+    await typicals.increment_instance_count(typical_id, len(documents))
+    
+    await audit_service.log_actions([
+        AuditLogCreate(
+            action=AuditAction.CREATE_CONNECTION,
+            user_id=user_id,
+            connection_id=document['id'],
+            project_id=typical['project_id'],
+            details={"connection_type": document['connection_type'], "typical_id": typical_id, "design_key": document['design_key']}
+        )
+        for document in documents
+    ])
+    
+    return FastJSONResponse({
+        "typical_id": typical_id,
+        "connection_ids": [document['id'] for document in documents],
+        **stats
+    }, status_code=status.HTTP_201_CREATED)
+
+@router.patch("/{typical_id}/instances/{instance_id}", response_model=Connection)
+async def update_instance(typical_id: str, instance_id: str, instance_update: InstanceUpdate, request: Request,
+                          user_id: str = Depends(get_current_user)):
+    expected_version = if_match_version(request)
+    typical = await get_typical_or_404(typical_id, user_id)
+    instance = await connections.get(instance_id, user_id, {**INSTANCE_PROJECTION, "version": 1, "typical_id": 1})
+    if not instance or instance.get('typical_id') != typical_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Instance not found")
+    current_version = instance.get('version') or 0
+    if expected_version is not None and expected_version != current_version:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Connection was modified by another request")
+    
+    update_data = {name: value for name, value in instance_update.model_dump(exclude_unset=True).items() if value is not None}
+    audit_fields = list(update_data.keys())
+    stats = None
+    if 'overrides' in update_data and update_data['overrides'] != (instance.get('overrides') or {}):
+        assignments, stats = await DESIGNS.assign([{**instance, "overrides": update_data['overrides']}], typical)
+        for _, fields in assignments:
+            update_data.update(fields)
+    
+    if update_data:
+        update_data['updated_at'] = datetime.now(timezone.utc)
+        connection = await connections.apply_update(instance_id, update_data, user_id, version_filter(current_version))
+    else:
+        connection = await connections.get(instance_id, user_id)
+    if not connection:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED if expected_version is not None else status.HTTP_409_CONFLICT,
+            detail="Connection was modified by another request"
+        )
+    
+    await audit_service.log_action(AuditLogCreate(
+        action=AuditAction.UPDATE_CONNECTION,
+        user_id=user_id,
+        connection_id=instance_id,
+        project_id=typical['project_id'],
+        details={"updated_fields": audit_fields, "typical_id": typical_id, "revalidation": stats}
+    ))
+    
+    etag = entity_tag(connection)
+    await DESIGNS.attach([connection])
+    return FastJSONResponse(Connection(**unpack_document(connection)), headers={"ETag": etag})
+
+@router.post("/{typical_id}/validate")
+async def validate_typical(typical_id: str, user_id: str = Depends(get_current_user)):
+    typical = await get_typical_or_404(typical_id, user_id)
+    
+    design = await typical_design(typical)
+    if design['design_key'] != typical.get('design_key') or design['status'] != typical.get('status'):
+        await typicals.update(typical_id, {**design, "updated_at": datetime.now(timezone.utc)})
+    
+    stats = await DESIGNS.link(await connections.list_for_typical(typical_id, user_id, INSTANCE_PROJECTION), typical)
+    
+    await audit_service.log_action(AuditLogCreate(
+        action=AuditAction.VALIDATE_TYPICAL,
+        user_id=user_id,
+        project_id=typical['project_id'],
+        details={"typical_id": typical_id, **stats}
+    ))
+    
+    return FastJSONResponse({"typical_id": typical_id, **design, **stats})
+
+@router.post("/{typical_id}/export/tekla")
+async def export_typical_to_tekla(typical_id: str, user_id: str = Depends(get_current_user)):
+    typical = await get_typical_or_404(typical_id, user_id)
+    instances = await connections.list_for_typical(typical_id, user_id, {"_id": 0, "id": 1, "design_key": 1, "status": 1})
+    
+    groups: Dict[str, List[str]] = {}
+    for instance in instances:
+        if not instance.get('design_key') or instance.get('status') == ConnectionStatus.DRAFT.value:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="All instances must be validated before export"
+            )
+        groups.setdefault(instance['design_key'], []).append(instance['id'])
+    
+    designs = await DESIGNS.repo.get_many(list(groups), {"parameters": 1, "validation_results": 1, "geometry": 1, "geometry_packed": 1})
+    exports = []
+    for key, instance_ids in groups.items():
+        design = designs.get(key)
+        geometry = stored_geometry(design) if design else None
+        if not geometry:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="All instances must be validated before export"
+            )
+        exports.append({
+            "design_key": key,
+            "instance_ids": instance_ids,
+            "tekla_export": TeklaExporter.export_connection({
+                "name": typical['name'],
+                "id": key,
+                "validation_results": design.get('validation_results'),
+                "parameters": design.get('parameters')
+            }, geometry)
+        })
+    
+    if instances:
+        await connections.update_many(
+            {"typical_id": typical_id, "user_id": user_id},
+            {"$set": {"status": ConnectionStatus.EXPORTED.value}, "$inc": {"version": 1}}
+        )
+    
+    await audit_service.log_action(AuditLogCreate(
+        action=AuditAction.EXPORT_TEKLA,
+        user_id=user_id,
+        project_id=typical['project_id'],
+        details={"export_format": "tekla_parametric", "typical_id": typical_id,
+                 "instances": len(instances), "unique_designs": len(exports)}
+    ))
+    
+    return FastJSONResponse({
+        "typical_id": typical_id,
+        "designs": exports,
+        "format": "tekla_parametric_json",
+        "editable": True,
+        "disclaimer": "Engineering review and approval required before fabrication"
+    })
+
+@router.delete("/{typical_id}")
+async def delete_typical(typical_id: str, user_id: str = Depends(get_current_user)):
+    typical = await get_typical_or_404(typical_id, user_id)
+    
+    await typicals.delete(typical_id, user_id)
+    removed = await connections.delete_for_typical(typical_id, user_id)
+    if removed:
+        await projects.increment_connection_count(typical['project_id'], -removed)
+    
+    return {"message": "Typical deleted successfully", "instances_deleted": removed}
\ No newline at end of file
@@ -1,4 +1,6 @@
 from .aisc360 import AISC360RuleEngine
-from .base import RuleCheck, RuleResult, RuleEngine
+from .base import RuleCheck, RuleResult, RuleEngine, BatchRuleResult, CheckRecord, CompactRuleResult
+from .registry import Rule, RuleRegistry
+from .optimizer import DesignOptimizer
 
-__all__ = ['AISC360RuleEngine', 'RuleCheck', 'RuleResult', 'RuleEngine']
\ No newline at end of file
+__all__ = ['AISC360RuleEngine', 'RuleCheck', 'RuleResult', 'RuleEngine', 'BatchRuleResult', 'CheckRecord', 'CompactRuleResult', 'Rule', 'RuleRegistry', 'DesignOptimizer']
\ No newline at end of file
@@ -1,20 +1,250 @@
 import math
-from typing import Dict, Any, List
-from .base import RuleEngine, RuleResult, RuleCheck, RuleStatus
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, List, Mapping, Sequence, Union, Iterable, Optional
+from .base import RuleEngine, CompactRuleResult, CheckRecord, RuleStatus, BatchRuleResult
+from .registry import Rule, RuleRegistry
+from geometry_engine import generator
+from utils.fingerprint import source_fingerprint
+from shape_service.shapes import SECTION_PARAMETERS, resolve_sections, resolve_section_columns, derived_parameters
+from .bolt_group import ic_coefficient, ic_coefficient_array, bolt_design_shear, bolt_design_shear_array
+from .weld_group import (
+    DEFAULT_ELECTRODE_STRENGTH, effective_weld_size, effective_weld_size_array, minimum_weld_size,
+    minimum_weld_size_array, single_plate_weld_strength, single_plate_weld_strength_array,
+    end_plate_weld_strength, end_plate_weld_strength_array
+)
+
+SUPPORTED_CONNECTION_TYPES = ["beam_to_column_shear", "beam_to_beam_shear", "single_plate", "double_angle", "end_plate"]
+
+SINGLE_COLUMN_CONNECTION_TYPES = ["beam_to_column_shear", "beam_to_beam_shear", "single_plate", "double_angle"]
+
+WELDED_CONNECTION_TYPES = ["single_plate", "end_plate"]
+
+WELD_FUNCTIONS = {
+    "effective_weld_size": (effective_weld_size, effective_weld_size_array),
+    "minimum_weld_size": (minimum_weld_size, minimum_weld_size_array),
+    "single_plate_weld_strength": (single_plate_weld_strength, single_plate_weld_strength_array),
+    "end_plate_weld_strength": (end_plate_weld_strength, end_plate_weld_strength_array)
+}
+
+PARAMETER_DEFAULTS = {
+    'bolt_diameter': 0.75,
+    'num_bolts': 4,
+    'bolt_spacing': 3.0,
+    'edge_distance': 1.5,
+    'plate_thickness': 0.5,
+    'plate_length': 12.0,
+    'beam_depth': 12.0,
+    'connection_depth': 10.0,
+    'bolt_grade': 'A325',
+    'shear_load': 0.0,
+    'eccentricity': 3.0,
+    'plate_width': 5.0,
+    'num_bolts_vertical': 4,
+    'bolt_spacing_vertical': 3.0,
+    'weld_size': 0.0,
+    'electrode_strength': DEFAULT_ELECTRODE_STRENGTH
+}
+
+AISC360_RULES = RuleRegistry(PARAMETER_DEFAULTS, [
+    Rule(
+        rule_id="AISC_J3_3",
+        rule_name="Minimum Bolt Spacing",
+        group="bolts",
+        inputs=("bolt_spacing", "bolt_diameter"),
+        value="bolt_spacing",
+        limit="2.67 * bolt_diameter",
+        comparison=">=",
+        severity=RuleStatus.FAIL,
+        code_reference="AISC 360-16 Table J3.3",
+        pass_message="Bolt spacing {value:.2f} in >= {limit:.2f} in (2.67d)",
+        fail_message="Bolt spacing {value:.2f} in < {limit:.2f} in (2.67d) - VIOLATION"
+    ),
+    Rule(
+        rule_id="AISC_J3_5",
+        rule_name="Maximum Bolt Spacing",
+        group="bolts",
+        inputs=("bolt_spacing", "plate_thickness"),
+        value="bolt_spacing",
+        limit="min(14 * plate_thickness, 7.0)",
+        comparison="<=",
+        severity=RuleStatus.WARNING,
+        code_reference="AISC 360-16 Table J3.5",
+        pass_message="Bolt spacing {value:.2f} in <= {limit:.2f} in",
+        fail_message="Bolt spacing {value:.2f} in > {limit:.2f} in - Check required"
+    ),
+    Rule(
+        rule_id="AISC_J3_4",
+        rule_name="Minimum Edge Distance",
+        group="bolts",
+        inputs=("edge_distance", "bolt_diameter"),
+        value="edge_distance",
+        limit="max(1.5 * (bolt_diameter + 0.125), 1.25)",
+        comparison=">=",
+        severity=RuleStatus.FAIL,
+        code_reference="AISC 360-16 Table J3.4",
+        pass_message="Edge distance {value:.2f} in >= {limit:.2f} in",
+        fail_message="Edge distance {value:.2f} in < {limit:.2f} in - VIOLATION"
+    ),
+    Rule(
+        rule_id="AISC_J3_MIN",
+        rule_name="Minimum Number of Bolts",
+        group="bolts",
+        inputs=("num_bolts",),
+        value="num_bolts",
+        limit="2.0",
+        comparison=">=",
+        severity=RuleStatus.FAIL,
+        code_reference="AISC 360-16 J3",
+        pass_message="Number of bolts {num_bolts} >= 2",
+        fail_message="Number of bolts {num_bolts} < 2 - VIOLATION"
+    ),
+    Rule(
+        rule_id="AISC_PLATE_MIN",
+        rule_name="Minimum Plate Thickness",
+        group="plate",
+        inputs=("plate_thickness",),
+        value="plate_thickness",
+        limit="0.1875",
+        comparison=">=",
+        severity=RuleStatus.FAIL,
+        code_reference="AISC 360-16 J4",
+        pass_message="Plate thickness {value:.3f} in >= 0.1875 in (3/16 in)",
+        fail_message="Plate thickness {value:.3f} in < 0.1875 in - VIOLATION"
+    ),
+    Rule(
+        rule_id="AISC_PLATE_SLENDER",
+        rule_name="Plate Slenderness",
+        group="plate",
+        inputs=("plate_length", "plate_thickness"),
+        value="plate_length / plate_thickness",
+        limit="25.0",
+        comparison="<=",
+        severity=RuleStatus.WARNING,
+        code_reference="AISC 360-16 B4",
+        pass_message="Plate slenderness {value:.1f} <= {limit:.1f}",
+        fail_message="Plate slenderness {value:.1f} > {limit:.1f} - Check buckling"
+    ),
+    Rule(
+        rule_id="AISC_GEOM_1",
+        rule_name="Connection Depth Check",
+        group="geometry",
+        inputs=("connection_depth", "beam_depth"),
+        value="connection_depth",
+        limit="beam_depth - 1.0",
+        comparison="<=",
+        severity=RuleStatus.FAIL,
+        code_reference="AISC Design Guide 4",
+        pass_message="Connection depth {value:.1f} in fits within beam depth {beam_depth:.1f} in",
+        fail_message="Connection depth {value:.1f} in exceeds beam depth {beam_depth:.1f} in - VIOLATION"
+    ),
+    Rule(
+        rule_id="AISC_J3_6_IC",
+        rule_name="Eccentric Bolt Group Shear Strength",
+        group="bolts",
+        inputs=("shear_load", "eccentricity", "num_bolts", "bolt_spacing", "bolt_diameter", "bolt_grade"),
+        value="shear_load",
+        limit="ic_coefficient(num_bolts, bolt_spacing, eccentricity) * bolt_design_shear(bolt_diameter, bolt_grade)",
+        comparison="<=",
+        severity=RuleStatus.FAIL,
+        code_reference="AISC 360-16 J3.6; AISC Manual Part 7 (IC method)",
+        pass_message="Bolt group strength {limit:.1f} kips >= required {value:.1f} kips at e = {eccentricity:.2f} in",
+        fail_message="Bolt group strength {limit:.1f} kips < required {value:.1f} kips at e = {eccentricity:.2f} in - VIOLATION",
+        requires=("shear_load",),
+        connection_types=SINGLE_COLUMN_CONNECTION_TYPES,
+        functions={
+            "ic_coefficient": (ic_coefficient, ic_coefficient_array),
+            "bolt_design_shear": (bolt_design_shear, bolt_design_shear_array)
+        }
+    ),
+    Rule(
+        rule_id="AISC_J2_4",
+        rule_name="Minimum Fillet Weld Size",
+        group="welds",
+        inputs=("weld_size", "plate_thickness"),
+        value="effective_weld_size(weld_size, plate_thickness)",
+        limit="minimum_weld_size(plate_thickness)",
+        comparison=">=",
+        severity=RuleStatus.FAIL,
+        code_reference="AISC 360-16 Table J2.4",
+        pass_message="Fillet weld {value:.4f}\" >= minimum {limit:.4f}\"",
+        fail_message="Fillet weld {value:.4f}\" < minimum {limit:.4f}\" - VIOLATION",
+        connection_types=WELDED_CONNECTION_TYPES,
+        functions=WELD_FUNCTIONS
+    ),
+    Rule(
+        rule_id="AISC_J2_WELD_SP",
+        rule_name="Plate-to-Support Weld Group Strength",
+        group="welds",
+        inputs=("shear_load", "num_bolts", "bolt_spacing", "edge_distance", "plate_width", "plate_thickness",
+                "weld_size", "electrode_strength"),
+        value="shear_load",
+        limit="single_plate_weld_strength(num_bolts, bolt_spacing, edge_distance, plate_width, "
+              "effective_weld_size(weld_size, plate_thickness), electrode_strength)",
+        comparison="<=",
+        severity=RuleStatus.FAIL,
+        code_reference="AISC 360-16 J2.4; AISC Manual Part 8 (IC method)",
+        pass_message="Weld group strength {limit:.1f} kips >= required {value:.1f} kips",
+        fail_message="Weld group strength {limit:.1f} kips < required {value:.1f} kips - VIOLATION",
+        requires=("shear_load",),
+        connection_types=["single_plate"],
+        functions=WELD_FUNCTIONS
+    ),
+    Rule(
+        rule_id="AISC_J2_WELD_EP",
+        rule_name="Beam Web-to-End Plate Weld Strength",
+        group="welds",
+        inputs=("shear_load", "num_bolts_vertical", "bolt_spacing_vertical", "plate_thickness", "weld_size",
+                "electrode_strength"),
+        value="shear_load",
+        limit="end_plate_weld_strength(num_bolts_vertical, bolt_spacing_vertical, "
+              "effective_weld_size(weld_size, plate_thickness), electrode_strength)",
+        comparison="<=",
+        severity=RuleStatus.FAIL,
+        code_reference="AISC 360-16 J2.4",
+        pass_message="Web weld strength {limit:.1f} kips >= required {value:.1f} kips",
+        fail_message="Web weld strength {limit:.1f} kips < required {value:.1f} kips - VIOLATION",
+        requires=("shear_load",),
+        connection_types=["end_plate"],
+        functions=WELD_FUNCTIONS
+    )
+])
+
+ParamsTable = Union[Mapping[str, Sequence[Any]], Sequence[Dict[str, Any]]]
 
 class AISC360RuleEngine(RuleEngine):
     
-    def __init__(self):
+    VERSION = f"aisc360-16.1+{source_fingerprint(Path(__file__).parent, *generator.SOURCES)}"
+    
+    def __init__(self, registry: RuleRegistry = AISC360_RULES):
         self.GAMMA_M0 = 1.0
-        
-    def validate_connection(self, connection_type: str, parameters: Dict[str, Any]) -> RuleResult:
+        self.registry = registry
+    
+    def validate_connection(self, connection_type: str, parameters: Dict[str, Any]) -> CompactRuleResult:
         checks = []
         
-        if connection_type in ["beam_to_column_shear", "beam_to_beam_shear", "single_plate", "double_angle", "end_plate"]:
-            checks.extend(self._validate_bolts(parameters))
-            checks.extend(self._validate_plate(parameters))
-            checks.extend(self._validate_geometry(parameters))
+        if connection_type in SUPPORTED_CONNECTION_TYPES:
+            checks = self.registry.checks(resolve_sections(parameters), connection_type)
+        
+        return self._build_result(checks)
+    
+    def revalidate(self, connection_type: str, parameters: Dict[str, Any], previous: Optional[Dict[str, Any]],
+                   changed: Iterable[str]) -> CompactRuleResult:
+        previous_checks = (previous or {}).get('checks') or []
+        known = set(self.registry.rule_ids)
+        if connection_type not in SUPPORTED_CONNECTION_TYPES or not previous_checks or \
+                any(check.get('rule_id') not in known for check in previous_checks):
+            return self.validate_connection(connection_type, parameters)
         
+        checks = self.registry.recheck(
+            resolve_sections(parameters),
+            connection_type,
+            {check['rule_id']: CheckRecord.from_dict(check) for check in previous_checks},
+            self.registry.dependent_rules(derived_parameters(changed))
+        )
+        return self._build_result(checks)
+    
+    def _build_result(self, checks: List[CheckRecord]) -> CompactRuleResult:
         overall_status = RuleStatus.PASS
         for check in checks:
             if check.status == RuleStatus.FAIL:
@@ -26,196 +256,75 @@ class AISC360RuleEngine(RuleEngine):
         is_valid = overall_status != RuleStatus.FAIL
         summary = self._generate_summary(checks, overall_status)
         
-        return RuleResult(
-            overall_status=overall_status,
-            checks=checks,
-            summary=summary,
-            is_valid=is_valid
-        )
+        return CompactRuleResult(overall_status, checks, summary, is_valid)
     
-    def _validate_bolts(self, params: Dict[str, Any]) -> List[RuleCheck]:
-        checks = []
+    def validate_batch(self, connection_type: str, params_table: ParamsTable) -> BatchRuleResult:
+        rows, columns, present = self._batch_columns(params_table)
+        n = len(next(iter(columns.values())))
         
-        bolt_diameter = params.get('bolt_diameter', 0.75)
-        bolt_grade = params.get('bolt_grade', 'A325')
-        num_bolts = params.get('num_bolts', 4)
-        bolt_spacing = params.get('bolt_spacing', 3.0)
-        edge_distance = params.get('edge_distance', 1.5)
+        if connection_type not in SUPPORTED_CONNECTION_TYPES:
+            empty = np.zeros((n, 0))
+            return BatchRuleResult([], empty.astype(np.int8), empty, empty, empty,
+                                   row_builder=lambda i: self.validate_connection(connection_type, rows(i)))
         
-        min_spacing = 2.67 * bolt_diameter
-        if bolt_spacing >= min_spacing:
-            checks.append(RuleCheck(
-                rule_id="AISC_J3_3",
-                rule_name="Minimum Bolt Spacing",
-                status=RuleStatus.PASS,
-                message=f"Bolt spacing {bolt_spacing:.2f} in >= {min_spacing:.2f} in (2.67d)",
-                code_reference="AISC 360-16 Table J3.3",
-                calculated_value=bolt_spacing,
-                limit_value=min_spacing
-            ))
-        else:
-            checks.append(RuleCheck(
-                rule_id="AISC_J3_3",
-                rule_name="Minimum Bolt Spacing",
-                status=RuleStatus.FAIL,
-                message=f"Bolt spacing {bolt_spacing:.2f} in < {min_spacing:.2f} in (2.67d) - VIOLATION",
-                code_reference="AISC 360-16 Table J3.3",
-                calculated_value=bolt_spacing,
-                limit_value=min_spacing
-            ))
+        status, calculated, limits, utilization = self.registry.evaluate_columns(columns, n, connection_type, present)
         
-        max_spacing = min(14 * params.get('plate_thickness', 0.5), 7.0)
-        if bolt_spacing <= max_spacing:
-            checks.append(RuleCheck(
-                rule_id="AISC_J3_5",
-                rule_name="Maximum Bolt Spacing",
-                status=RuleStatus.PASS,
-                message=f"Bolt spacing {bolt_spacing:.2f} in <= {max_spacing:.2f} in",
-                code_reference="AISC 360-16 Table J3.5",
-                calculated_value=bolt_spacing,
-                limit_value=max_spacing
-            ))
-        else:
-            checks.append(RuleCheck(
-                rule_id="AISC_J3_5",
-                rule_name="Maximum Bolt Spacing",
-                status=RuleStatus.WARNING,
-                message=f"Bolt spacing {bolt_spacing:.2f} in > {max_spacing:.2f} in - Check required",
-                code_reference="AISC 360-16 Table J3.5",
-                calculated_value=bolt_spacing,
-                limit_value=max_spacing
-            ))
-        
-        hole_diameter = bolt_diameter + 0.125
-        min_edge = max(1.5 * hole_diameter, 1.25)
-        if edge_distance >= min_edge:
-            checks.append(RuleCheck(
-                rule_id="AISC_J3_4",
-                rule_name="Minimum Edge Distance",
-                status=RuleStatus.PASS,
-                message=f"Edge distance {edge_distance:.2f} in >= {min_edge:.2f} in",
-                code_reference="AISC 360-16 Table J3.4",
-                calculated_value=edge_distance,
-                limit_value=min_edge
-            ))
-        else:
-            checks.append(RuleCheck(
-                rule_id="AISC_J3_4",
-                rule_name="Minimum Edge Distance",
-                status=RuleStatus.FAIL,
-                message=f"Edge distance {edge_distance:.2f} in < {min_edge:.2f} in - VIOLATION",
-                code_reference="AISC 360-16 Table J3.4",
-                calculated_value=edge_distance,
-                limit_value=min_edge
-            ))
-        
-        if num_bolts >= 2:
-            checks.append(RuleCheck(
-                rule_id="AISC_J3_MIN",
-                rule_name="Minimum Number of Bolts",
-                status=RuleStatus.PASS,
-                message=f"Number of bolts {num_bolts} >= 2",
-                code_reference="AISC 360-16 J3",
-                calculated_value=float(num_bolts),
-                limit_value=2.0
-            ))
-        else:
-            checks.append(RuleCheck(
-                rule_id="AISC_J3_MIN",
-                rule_name="Minimum Number of Bolts",
-                status=RuleStatus.FAIL,
-                message=f"Number of bolts {num_bolts} < 2 - VIOLATION",
-                code_reference="AISC 360-16 J3",
-                calculated_value=float(num_bolts),
-                limit_value=2.0
-            ))
-        
-        return checks
+        return BatchRuleResult(
+            self.registry.rule_ids,
+            status,
+            calculated,
+            limits,
+            utilization,
+            row_builder=lambda i: self.validate_connection(connection_type, rows(i))
+        )
     
-    def _validate_plate(self, params: Dict[str, Any]) -> List[RuleCheck]:
-        checks = []
+    def _batch_columns(self, params_table: ParamsTable):
+        defaults = self.registry.defaults
         
-        plate_thickness = params.get('plate_thickness', 0.5)
-        plate_grade = params.get('plate_grade', 'A36')
-        plate_length = params.get('plate_length', 12.0)
-        plate_width = params.get('plate_width', 6.0)
+        if isinstance(params_table, Sequence):
+            records = list(params_table)
+            n = len(records)
+            columns = {}
+            present = {}
+            for name, default in defaults.items():
+                values = [p.get(name) for p in records]
+                present[name] = np.fromiter((v is not None for v in values), dtype=bool, count=n)
+                if isinstance(default, str):
+                    columns[name] = np.array([default if v is None else v for v in values], dtype=object)
+                else:
+                    columns[name] = np.fromiter((default if v is None else v for v in values), dtype=np.float64, count=n)
+            sections = {name: [p.get(name) for p in records] for name in SECTION_PARAMETERS if any(name in p for p in records)}
+            resolve_section_columns(sections, columns, present)
+            return (lambda i: records[i]), columns, present
         
-        if plate_thickness >= 0.1875:
-            checks.append(RuleCheck(
-                rule_id="AISC_PLATE_MIN",
-                rule_name="Minimum Plate Thickness",
-                status=RuleStatus.PASS,
-                message=f"Plate thickness {plate_thickness:.3f} in >= 0.1875 in (3/16 in)",
-                code_reference="AISC 360-16 J4",
-                calculated_value=plate_thickness,
-                limit_value=0.1875
-            ))
-        else:
-            checks.append(RuleCheck(
-                rule_id="AISC_PLATE_MIN",
-                rule_name="Minimum Plate Thickness",
-                status=RuleStatus.FAIL,
-                message=f"Plate thickness {plate_thickness:.3f} in < 0.1875 in - VIOLATION",
-                code_reference="AISC 360-16 J4",
-                calculated_value=plate_thickness,
-                limit_value=0.1875
-            ))
-        
-        slenderness = plate_length / plate_thickness
-        max_slenderness = 25.0
-        if slenderness <= max_slenderness:
-            checks.append(RuleCheck(
-                rule_id="AISC_PLATE_SLENDER",
-                rule_name="Plate Slenderness",
-                status=RuleStatus.PASS,
-                message=f"Plate slenderness {slenderness:.1f} <= {max_slenderness:.1f}",
-                code_reference="AISC 360-16 B4",
-                calculated_value=slenderness,
-                limit_value=max_slenderness
-            ))
-        else:
-            checks.append(RuleCheck(
-                rule_id="AISC_PLATE_SLENDER",
-                rule_name="Plate Slenderness",
-                status=RuleStatus.WARNING,
-                message=f"Plate slenderness {slenderness:.1f} > {max_slenderness:.1f} - Check buckling",
-                code_reference="AISC 360-16 B4",
-                calculated_value=slenderness,
-                limit_value=max_slenderness
-            ))
-        
-        return checks
-    
-    def _validate_geometry(self, params: Dict[str, Any]) -> List[RuleCheck]:
-        checks = []
+        raw = {name: np.asarray(values) for name, values in params_table.items()}
+        n = len(next(iter(raw.values()))) if raw else 0
+        columns = {}
+        present = {}
+        for name, default in defaults.items():
+            if name not in raw:
+                present[name] = np.zeros(n, dtype=bool)
+                columns[name] = np.full(n, default, dtype=object if isinstance(default, str) else np.float64)
+            elif isinstance(default, str):
+                column = raw[name].astype(object)
+                present[name] = np.array([v is not None and v == v for v in column], dtype=bool)
+                columns[name] = np.where(present[name], column, default)
+            else:
+                column = raw[name].astype(np.float64)
+                present[name] = ~np.isnan(column)
+                columns[name] = np.where(present[name], column, default)
+        resolve_section_columns({name: raw[name] for name in SECTION_PARAMETERS if name in raw}, columns, present)
         
-        beam_depth = params.get('beam_depth', 12.0)
-        connection_depth = params.get('connection_depth', 10.0)
-        
-        if connection_depth <= beam_depth - 1.0:
-            checks.append(RuleCheck(
-                rule_id="AISC_GEOM_1",
-                rule_name="Connection Depth Check",
-                status=RuleStatus.PASS,
-                message=f"Connection depth {connection_depth:.1f} in fits within beam depth {beam_depth:.1f} in",
-                code_reference="AISC Design Guide 4",
-                calculated_value=connection_depth,
-                limit_value=beam_depth - 1.0
-            ))
-        else:
-            checks.append(RuleCheck(
-                rule_id="AISC_GEOM_1",
-                rule_name="Connection Depth Check",
-                status=RuleStatus.FAIL,
-                message=f"Connection depth {connection_depth:.1f} in exceeds beam depth {beam_depth:.1f} in - VIOLATION",
-                code_reference="AISC Design Guide 4",
-                calculated_value=connection_depth,
-                limit_value=beam_depth - 1.0
-            ))
+        def row(i: int) -> Dict[str, Any]:
+            return {
+                name: values[i].item() if hasattr(values[i], 'item') else values[i]
+                for name, values in raw.items()
+                if not (values[i] is None or isinstance(values[i], float) and math.isnan(values[i]))
+            }
         
-        return checks
+        return row, columns, present
     
-    def _generate_summary(self, checks: List[RuleCheck], status: RuleStatus) -> str:
+    def _generate_summary(self, checks: List[CheckRecord], status: RuleStatus) -> str:
         total = len(checks)
         passed = sum(1 for c in checks if c.status == RuleStatus.PASS)
         failed = sum(1 for c in checks if c.status == RuleStatus.FAIL)
@@ -1,7 +1,8 @@
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional, Callable
 from enum import Enum
 from abc import ABC, abstractmethod
+import numpy as np
 
 class RuleStatus(str, Enum):
     PASS = "pass"
@@ -16,7 +17,7 @@ class RuleCheck(BaseModel):
     code_reference: str
     calculated_value: Optional[float] = None
     limit_value: Optional[float] = None
-    details: Dict[str, Any] = {}
+    details: Dict[str, Any] = Field(default_factory=dict)
 
 class RuleResult(BaseModel):
     overall_status: RuleStatus
@@ -24,7 +25,122 @@ class RuleResult(BaseModel):
     summary: str
     is_valid: bool
 
+class CheckRecord:
+    __slots__ = ('rule_id', 'rule_name', 'status', 'code_reference', 'calculated_value', 'limit_value',
+                 'details', '_message', '_rule', '_args')
+    
+    def __init__(self, rule_id: str, rule_name: str, status: RuleStatus, code_reference: str,
+                 calculated_value: Any = None, limit_value: Any = None, details: Optional[Dict[str, Any]] = None,
+                 message: Optional[str] = None, rule: Any = None, args: Optional[tuple] = None):
+        self.rule_id = rule_id
+        self.rule_name = rule_name
+        self.status = status
+        self.code_reference = code_reference
+        self.calculated_value = calculated_value
+        self.limit_value = limit_value
+        self.details = details
+        self._message = message
+        self._rule = rule
+        self._args = args
+    
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = self._rule.message(self.status, self._args, self.calculated_value, self.limit_value)
+        return self._message
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CheckRecord":
+        return cls(
+            data['rule_id'],
+            data['rule_name'],
+            RuleStatus(data['status']),
+            data['code_reference'],
+            data.get('calculated_value'),
+            data.get('limit_value'),
+            data.get('details') or None,
+            data.get('message', "")
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rule_id": self.rule_id,
+            "rule_name": self.rule_name,
+            "status": self.status,
+            "message": self.message,
+            "code_reference": self.code_reference,
+            "calculated_value": None if self.calculated_value is None else float(self.calculated_value),
+            "limit_value": None if self.limit_value is None else float(self.limit_value),
+            "details": dict(self.details) if self.details else {}
+        }
+    
+    def to_model(self) -> RuleCheck:
+        return RuleCheck(**self.to_dict())
+
+class CompactRuleResult:
+    __slots__ = ('overall_status', 'checks', 'summary', 'is_valid')
+    
+    def __init__(self, overall_status: RuleStatus, checks: List[CheckRecord], summary: str, is_valid: bool):
+        self.overall_status = overall_status
+        self.checks = checks
+        self.summary = summary
+        self.is_valid = is_valid
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactRuleResult":
+        return cls(
+            RuleStatus(data['overall_status']),
+            [CheckRecord.from_dict(check) for check in data.get('checks', [])],
+            data['summary'],
+            data['is_valid']
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "overall_status": self.overall_status,
+            "checks": [check.to_dict() for check in self.checks],
+            "summary": self.summary,
+            "is_valid": self.is_valid
+        }
+    
+    def to_model(self) -> RuleResult:
+        return RuleResult(**self.to_dict())
+
 class RuleEngine(ABC):
     @abstractmethod
-    def validate_connection(self, connection_type: str, parameters: Dict[str, Any]) -> RuleResult:
-        pass
\ No newline at end of file
+    def validate_connection(self, connection_type: str, parameters: Dict[str, Any]) -> CompactRuleResult:
+        pass
+
+STATUS_ORDER = (RuleStatus.PASS, RuleStatus.WARNING, RuleStatus.FAIL)
+STATUS_CODES = {status: code for code, status in enumerate(STATUS_ORDER)}
+STATUS_NOT_APPLICABLE = -1
+
+class BatchRuleResult:
+    
+    def __init__(self, rule_ids: List[str], status: np.ndarray, calculated: np.ndarray, limits: np.ndarray, utilization: np.ndarray, row_builder: Optional[Callable[[int], CompactRuleResult]] = None):
+        self.rule_ids = list(rule_ids)
+        self.status = status
+        self.calculated = calculated
+        self.limits = limits
+        self.utilization = utilization
+        self.overall_status = np.maximum(status.max(axis=1), 0) if status.shape[1] else np.zeros(status.shape[0], dtype=status.dtype)
+        self.is_valid = self.overall_status != STATUS_CODES[RuleStatus.FAIL]
+        self._row_builder = row_builder
+    
+    def __len__(self) -> int:
+        return self.status.shape[0]
+    
+    def row_status(self, index: int) -> Dict[str, RuleStatus]:
+        return {
+            rule_id: STATUS_ORDER[code]
+            for rule_id, code in zip(self.rule_ids, self.status[index])
+            if code != STATUS_NOT_APPLICABLE
+        }
+    
+    def overall(self, index: int) -> RuleStatus:
+        return STATUS_ORDER[self.overall_status[index]]
+    
+    def result(self, index: int) -> CompactRuleResult:
+        if self._row_builder is None:
+            raise ValueError("Batch result was built without a row builder")
+        return self._row_builder(index)
\ No newline at end of file
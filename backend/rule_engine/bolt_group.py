@@ -0,0 +1,184 @@
+import logging
+import math
+import os
+import numpy as np
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from geometry_engine import GeometryGenerator
+
+logger = logging.getLogger(__name__)
+
+DELTA_MAX = 0.34
+
+TABLE_VERSION = 2
+TABLE_NUM_BOLTS = np.arange(2, 13)
+TABLE_SPACINGS = np.array([2.5, 3.0, 4.0, 6.0])
+TABLE_ECCENTRICITIES = np.arange(0.0, 36.0 + 1e-9, 0.25)
+
+DEFAULT_TABLE_PATH = Path(__file__).parent / "data" / f"ic_coefficients_v{TABLE_VERSION}.npy"
+
+BOLT_SHEAR_STRESS = {
+    "A325": 54.0,
+    "F1852": 54.0,
+    "A490": 68.0,
+    "F2280": 68.0
+}
+
+PHI_BOLT_SHEAR = 0.75
+
+def ic_coefficients(positions: np.ndarray, eccentricities: np.ndarray, iterations: int = 60) -> np.ndarray:
+    positions = np.asarray(positions, dtype=np.float64)
+    eccentricities = np.atleast_1d(np.asarray(eccentricities, dtype=np.float64))
+    n = len(positions)
+    if n < 2:
+        return np.full(eccentricities.shape, float(n))
+    
+    relative = positions - positions.mean(axis=0)
+    x = relative[:, 0][np.newaxis, :]
+    y = relative[:, 1][np.newaxis, :]
+    ex = np.abs(eccentricities)[:, np.newaxis]
+    scale = max(float(np.abs(relative).max()), 1.0)
+    
+    def residual(r0: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        dx = x + r0
+        d = np.maximum(np.hypot(dx, y), 1e-12)
+        deformation = DELTA_MAX * d / d.max(axis=1, keepdims=True)
+        force = (1 - np.exp(-10 * deformation)) ** 0.55
+        vertical = (force * dx / d).sum(axis=1, keepdims=True)
+        moment = (force * d).sum(axis=1, keepdims=True)
+        return vertical - moment / (ex + r0), vertical
+    
+    low = np.full(ex.shape, np.log(1e-6 * scale))
+    high = np.full(ex.shape, np.log(1e6 * scale))
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        f, _ = residual(np.exp(middle))
+        below = f < 0
+        low = np.where(below, middle, low)
+        high = np.where(below, high, middle)
+    
+    _, vertical = residual(np.exp((low + high) / 2))
+    return np.where(ex[:, 0] <= 1e-9, float(n), np.minimum(vertical[:, 0], float(n)))
+
+def single_column_positions(num_bolts: int, bolt_spacing: float) -> np.ndarray:
+    return GeometryGenerator.bolt_positions("single_plate", {
+        "num_bolts": int(num_bolts),
+        "bolt_spacing": float(bolt_spacing),
+        "edge_distance": 0.0,
+        "plate_width": 0.0
+    })[:, :2]
+
+def build_table() -> np.ndarray:
+    table = np.empty((len(TABLE_NUM_BOLTS), len(TABLE_SPACINGS), len(TABLE_ECCENTRICITIES)))
+    for i, num_bolts in enumerate(TABLE_NUM_BOLTS):
+        for j, spacing in enumerate(TABLE_SPACINGS):
+            table[i, j] = ic_coefficients(single_column_positions(num_bolts, spacing), TABLE_ECCENTRICITIES)
+    return table
+
+def load_table(path: Path, expected: Tuple[int, ...], build: Callable[[], np.ndarray], label: str) -> np.ndarray:
+    try:
+        table = np.load(path, mmap_mode='r')
+        if table.shape != expected:
+            raise ValueError(f"unexpected table shape {table.shape}")
+    except (OSError, ValueError) as e:
+        logger.info(f"Building {label} at {path} ({e})")
+        table = build()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(temporary, 'wb') as f:
+                np.save(f, table)
+            os.replace(temporary, path)
+            table = np.load(path, mmap_mode='r')
+        except OSError as e:
+            logger.warning(f"Could not persist {label}: {e}")
+    return table
+
+class CoefficientTable:
+    
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or os.environ.get('IC_TABLE_PATH', DEFAULT_TABLE_PATH))
+        self._table: Optional[np.ndarray] = None
+        self._index: Dict[Tuple[int, float], Tuple[int, int]] = {
+            (int(n), float(s)): (i, j)
+            for i, n in enumerate(TABLE_NUM_BOLTS)
+            for j, s in enumerate(TABLE_SPACINGS)
+        }
+        self._solved: Dict[Tuple[int, float, float], float] = {}
+    
+    def load(self) -> np.ndarray:
+        if self._table is None:
+            expected = (len(TABLE_NUM_BOLTS), len(TABLE_SPACINGS), len(TABLE_ECCENTRICITIES))
+            self._table = load_table(self.path, expected, build_table, "IC coefficient table")
+        return self._table
+    
+    def coefficient(self, num_bolts: Any, bolt_spacing: Any, eccentricity: Any) -> float:
+        if not all(math.isfinite(float(value)) for value in (num_bolts, bolt_spacing, eccentricity)):
+            return math.nan
+        num_bolts = int(num_bolts)
+        bolt_spacing = float(bolt_spacing)
+        eccentricity = abs(float(eccentricity))
+        cell = self._index.get((num_bolts, bolt_spacing))
+        if cell is not None and eccentricity <= TABLE_ECCENTRICITIES[-1]:
+            return float(np.interp(eccentricity, TABLE_ECCENTRICITIES, self.load()[cell]))
+        key = (num_bolts, round(bolt_spacing, 6), round(eccentricity, 6))
+        value = self._solved.get(key)
+        if value is None:
+            value = float(ic_coefficients(single_column_positions(num_bolts, bolt_spacing), [eccentricity])[0])
+            if len(self._solved) < 65536:
+                self._solved[key] = value
+        return value
+    
+    def coefficients(self, num_bolts: Any, bolt_spacing: Any, eccentricity: Any) -> np.ndarray:
+        num_bolts, bolt_spacing, eccentricity = np.broadcast_arrays(
+            np.asarray(num_bolts, dtype=np.float64),
+            np.asarray(bolt_spacing, dtype=np.float64),
+            np.abs(np.asarray(eccentricity, dtype=np.float64))
+        )
+        shape = num_bolts.shape
+        n = np.trunc(num_bolts.ravel())
+        s = bolt_spacing.ravel()
+        e = eccentricity.ravel()
+        result = np.full(n.shape, np.nan)
+        finite = np.isfinite(n) & np.isfinite(s) & np.isfinite(e)
+        
+        i = np.clip(np.searchsorted(TABLE_NUM_BOLTS, n), 0, len(TABLE_NUM_BOLTS) - 1)
+        j = np.clip(np.searchsorted(TABLE_SPACINGS, s), 0, len(TABLE_SPACINGS) - 1)
+        on_table = finite & (TABLE_NUM_BOLTS[i] == n) & (TABLE_SPACINGS[j] == s) & (e <= TABLE_ECCENTRICITIES[-1])
+        if on_table.any():
+            i, j, e_on = i[on_table], j[on_table], e[on_table]
+            k = np.clip(np.searchsorted(TABLE_ECCENTRICITIES, e_on, side='right') - 1, 0, len(TABLE_ECCENTRICITIES) - 2)
+            fraction = (e_on - TABLE_ECCENTRICITIES[k]) / (TABLE_ECCENTRICITIES[k + 1] - TABLE_ECCENTRICITIES[k])
+            table = self.load()
+            result[on_table] = table[i, j, k] * (1 - fraction) + table[i, j, k + 1] * fraction
+        
+        off_table = np.flatnonzero(finite & ~on_table & (s > 0))
+        if off_table.size:
+            ratio = e[off_table] / s[off_table]
+            for pattern_n in np.unique(n[off_table]):
+                rows = n[off_table] == pattern_n
+                unique_ratios, inverse = np.unique(ratio[rows], return_inverse=True)
+                solved = ic_coefficients(single_column_positions(int(pattern_n), 1.0), unique_ratios)
+                result[off_table[rows]] = solved[inverse.ravel()]
+        
+        degenerate = np.flatnonzero(finite & ~on_table & (s <= 0))
+        for row in degenerate:
+            result[row] = self.coefficient(n[row], s[row], e[row])
+        return result.reshape(shape)
+
+COEFFICIENT_TABLE = CoefficientTable()
+
+def bolt_design_shear(bolt_diameter: Any, bolt_grade: Any) -> float:
+    area = math.pi * float(bolt_diameter) ** 2 / 4
+    return PHI_BOLT_SHEAR * BOLT_SHEAR_STRESS.get(str(bolt_grade), BOLT_SHEAR_STRESS["A325"]) * area
+
+def bolt_design_shear_array(bolt_diameter: Any, bolt_grade: Any) -> np.ndarray:
+    grades = np.asarray(bolt_grade, dtype=object)
+    stress = np.vectorize(lambda grade: BOLT_SHEAR_STRESS.get(str(grade), BOLT_SHEAR_STRESS["A325"]), otypes=[np.float64])(grades)
+    return PHI_BOLT_SHEAR * stress * np.pi * np.asarray(bolt_diameter, dtype=np.float64) ** 2 / 4
+
+def ic_coefficient(num_bolts: Any, bolt_spacing: Any, eccentricity: Any) -> float:
+    return COEFFICIENT_TABLE.coefficient(num_bolts, bolt_spacing, eccentricity)
+
+def ic_coefficient_array(num_bolts: Any, bolt_spacing: Any, eccentricity: Any) -> np.ndarray:
+    return COEFFICIENT_TABLE.coefficients(num_bolts, bolt_spacing, eccentricity)
\ No newline at end of file
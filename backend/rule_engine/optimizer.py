@@ -0,0 +1,168 @@
+import time
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence
+from .aisc360 import AISC360RuleEngine
+from .base import RuleStatus, STATUS_CODES
+from geometry_engine import GeometryGenerator
+from shape_service.shapes import resolve_sections
+
+OPTIMIZATION_VARIABLES = ("num_bolts", "bolt_diameter", "bolt_spacing", "edge_distance", "plate_thickness")
+
+OPTIMIZABLE_CONNECTION_TYPES = ["single_plate", "double_angle", "beam_to_column_shear", "beam_to_beam_shear"]
+
+OBJECTIVES = ("plate_weight", "bolt_count")
+
+STEEL_DENSITY = 0.2836
+
+MAX_GRID_SIZE = 5_000_000
+
+class DesignOptimizer:
+    
+    def __init__(self, engine: Optional[AISC360RuleEngine] = None):
+        self.engine = engine or AISC360RuleEngine()
+    
+    def optimize(self, connection_type: str, constraints: Dict[str, Any], ranges: Dict[str, Sequence[float]],
+                 objective: str = "plate_weight", allow_warnings: bool = False, max_results: int = 20) -> Dict[str, Any]:
+        if connection_type not in OPTIMIZABLE_CONNECTION_TYPES:
+            raise ValueError(f"Optimization is not supported for connection type '{connection_type}'")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective '{objective}'")
+        unknown = [name for name in ranges if name not in OPTIMIZATION_VARIABLES]
+        if unknown:
+            raise ValueError(f"Cannot optimize parameters: {unknown}")
+        
+        started = time.perf_counter()
+        registry = self.engine.registry
+        constraints = resolve_sections(constraints)
+        
+        axes = {}
+        for name in OPTIMIZATION_VARIABLES:
+            if name in ranges:
+                values = np.unique(np.asarray(ranges[name], dtype=np.float64))
+            else:
+                values = np.array([float(constraints.get(name, registry.defaults[name]))])
+            if name == "num_bolts":
+                values = np.unique(np.round(values))
+            axes[name] = values
+        
+        grid_size = int(np.prod([len(values) for values in axes.values()]))
+        if grid_size > MAX_GRID_SIZE:
+            raise ValueError(f"Grid of {grid_size} combinations exceeds the limit of {MAX_GRID_SIZE}")
+        
+        fixed = {name: value for name, value in constraints.items() if name not in OPTIMIZATION_VARIABLES}
+        derived = {"plate_length", "connection_depth"}
+        accepted = self._accepted_codes(allow_warnings)
+        
+        applicable = registry.applicable(connection_type, {**fixed, **{name: axes[name] for name in OPTIMIZATION_VARIABLES}})
+        single_axis = [rule for rule in applicable
+                       if sum(name in OPTIMIZATION_VARIABLES for name in rule.inputs) == 1 and not derived & set(rule.inputs)]
+        for rule in single_axis:
+            axis = next(name for name in rule.inputs if name in OPTIMIZATION_VARIABLES)
+            args = [axes[name] if name == axis else fixed.get(name, registry.defaults[name]) for name in rule.inputs]
+            status = rule.evaluate_arrays(args)[0]
+            axes[axis] = axes[axis][np.isin(np.broadcast_to(status, axes[axis].shape), accepted)]
+        
+        shape = tuple(len(axes[name]) for name in OPTIMIZATION_VARIABLES)
+        if 0 in shape:
+            return self._result(connection_type, objective, grid_size, 0, [], started)
+        
+        grid = {}
+        for position, name in enumerate(OPTIMIZATION_VARIABLES):
+            view = [1] * len(OPTIMIZATION_VARIABLES)
+            view[position] = -1
+            grid[name] = axes[name].reshape(view)
+        
+        plate_length = (grid["num_bolts"] - 1) * grid["bolt_spacing"] + 2 * grid["edge_distance"]
+        grid["plate_length"] = plate_length
+        grid["connection_depth"] = plate_length
+        
+        feasible = np.ones(shape, dtype=bool)
+        for rule in applicable:
+            if rule in single_axis or not rule.closed_form:
+                continue
+            args = [grid[name] if name in grid else fixed.get(name, registry.defaults[name]) for name in rule.inputs]
+            status = rule.evaluate_arrays(args)[0]
+            feasible &= np.isin(status, accepted)
+            if not feasible.any():
+                return self._result(connection_type, objective, grid_size, 0, [], started)
+        
+        solved = [rule for rule in applicable if rule not in single_axis and not rule.closed_form]
+        if solved:
+            candidates = np.flatnonzero(feasible)
+            index = np.unravel_index(candidates, shape)
+            columns = {name: axes[name][index[position]] for position, name in enumerate(OPTIMIZATION_VARIABLES)}
+            columns["plate_length"] = (columns["num_bolts"] - 1) * columns["bolt_spacing"] + 2 * columns["edge_distance"]
+            columns["connection_depth"] = columns["plate_length"]
+            for rule in solved:
+                args = [columns[name] if name in columns else fixed.get(name, registry.defaults[name]) for name in rule.inputs]
+                status = rule.evaluate_arrays(args)[0]
+                keep = np.isin(np.broadcast_to(status, candidates.shape), accepted)
+                feasible.flat[candidates[~keep]] = False
+                candidates = candidates[keep]
+                columns = {name: values[keep] for name, values in columns.items()}
+                if not candidates.size:
+                    return self._result(connection_type, objective, grid_size, 0, [], started)
+        
+        plies = 2 if GeometryGenerator.branch(connection_type, fixed) == "double_angle" else 1
+        plate_width = float(fixed.get("plate_width", 5.0))
+        weight = plies * STEEL_DENSITY * plate_width * plate_length * grid["plate_thickness"]
+        weight = np.where(feasible, np.broadcast_to(weight, shape), np.inf)
+        
+        per_bolt_count = weight.reshape(shape[0], -1)
+        best = per_bolt_count.argmin(axis=1)
+        best_weight = per_bolt_count[np.arange(shape[0]), best]
+        
+        front = []
+        lightest = np.inf
+        for i in np.argsort(axes["num_bolts"]):
+            if not np.isfinite(best_weight[i]) or best_weight[i] >= lightest:
+                continue
+            lightest = best_weight[i]
+            index = (i,) + np.unravel_index(best[i], shape[1:])
+            front.append((index, float(best_weight[i])))
+        
+        if objective == "plate_weight":
+            front.sort(key=lambda item: item[1])
+        
+        designs = [self._design(connection_type, fixed, axes, index, design_weight) for index, design_weight in front[:max_results]]
+        return self._result(connection_type, objective, grid_size, int(feasible.sum()), designs, started)
+    
+    def _accepted_codes(self, allow_warnings: bool) -> List[int]:
+        accepted = [STATUS_CODES[RuleStatus.PASS]]
+        if allow_warnings:
+            accepted.append(STATUS_CODES[RuleStatus.WARNING])
+        return accepted
+    
+    def _design(self, connection_type: str, fixed: Dict[str, Any], axes: Dict[str, np.ndarray], index: tuple,
+                weight: float) -> Dict[str, Any]:
+        parameters = dict(fixed)
+        for position, name in enumerate(OPTIMIZATION_VARIABLES):
+            parameters[name] = axes[name][index[position]].item()
+        parameters["num_bolts"] = int(parameters["num_bolts"])
+        
+        geometry = GeometryGenerator.build(connection_type, parameters)
+        plate_length = (parameters["num_bolts"] - 1) * parameters["bolt_spacing"] + 2 * parameters["edge_distance"]
+        parameters["plate_length"] = plate_length
+        parameters["connection_depth"] = plate_length
+        
+        rule_result = self.engine.validate_connection(connection_type, parameters)
+        
+        return {
+            "parameters": parameters,
+            "plate_weight_lb": round(weight, 3),
+            "bolt_count": parameters["num_bolts"],
+            "overall_status": rule_result.overall_status,
+            "summary": rule_result.summary,
+            "dimensions": geometry.get("dimensions", {})
+        }
+    
+    def _result(self, connection_type: str, objective: str, grid_size: int, feasible: int,
+                designs: List[Dict[str, Any]], started: float) -> Dict[str, Any]:
+        return {
+            "connection_type": connection_type,
+            "objective": objective,
+            "grid_size": grid_size,
+            "feasible_count": feasible,
+            "pareto_designs": designs,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
\ No newline at end of file
@@ -0,0 +1,167 @@
+import numpy as np
+from typing import Dict, Any, List, Set, Tuple, Iterable, Callable, Optional
+from .base import CheckRecord, RuleStatus, STATUS_CODES, STATUS_NOT_APPLICABLE
+
+SCALAR_FUNCTIONS: Dict[str, Callable] = {'min': min, 'max': max, 'abs': abs}
+VECTOR_FUNCTIONS: Dict[str, Callable] = {'min': np.minimum, 'max': np.maximum, 'abs': np.abs}
+
+COMPARISONS = ('>=', '<=')
+
+def _compile(rule_id: str, inputs: Tuple[str, ...], expression: str, functions: Dict[str, Callable]) -> Callable:
+    source = f"lambda {', '.join(inputs)}: {expression}"
+    return eval(compile(source, f"<rule {rule_id}>", "eval"), dict(functions))
+
+class Rule:
+    __slots__ = (
+        'rule_id', 'rule_name', 'group', 'inputs', 'value_expression', 'limit_expression',
+        'comparison', 'severity', 'code_reference', 'pass_message', 'fail_message', 'requires', 'connection_types',
+        'closed_form', '_value', '_limit', '_vector_value', '_vector_limit', '_is_minimum', '_failure_code'
+    )
+    
+    def __init__(self, rule_id: str, rule_name: str, group: str, inputs: Iterable[str], value: str, limit: str,
+                 comparison: str, severity: RuleStatus, code_reference: str, pass_message: str, fail_message: str,
+                 requires: Iterable[str] = (), connection_types: Optional[Iterable[str]] = None,
+                 functions: Optional[Dict[str, Tuple[Callable, Callable]]] = None):
+        if comparison not in COMPARISONS:
+            raise ValueError(f"Unsupported comparison '{comparison}' for rule {rule_id}")
+        self.rule_id = rule_id
+        self.rule_name = rule_name
+        self.group = group
+        self.inputs = tuple(inputs)
+        self.value_expression = value
+        self.limit_expression = limit
+        self.comparison = comparison
+        self.severity = severity
+        self.code_reference = code_reference
+        self.pass_message = pass_message
+        self.fail_message = fail_message
+        self.requires = tuple(requires)
+        self.connection_types = frozenset(connection_types) if connection_types is not None else None
+        self.closed_form = not functions
+        scalar_functions = {**SCALAR_FUNCTIONS, **{name: pair[0] for name, pair in (functions or {}).items()}}
+        vector_functions = {**VECTOR_FUNCTIONS, **{name: pair[1] for name, pair in (functions or {}).items()}}
+        self._value = _compile(rule_id, self.inputs, value, scalar_functions)
+        self._limit = _compile(rule_id, self.inputs, limit, scalar_functions)
+        self._vector_value = _compile(rule_id, self.inputs, value, vector_functions)
+        self._vector_limit = _compile(rule_id, self.inputs, limit, vector_functions)
+        self._is_minimum = comparison == '>='
+        self._failure_code = STATUS_CODES[severity]
+    
+    def applies(self, connection_type: str, params: Dict[str, Any]) -> bool:
+        if self.connection_types is not None and connection_type not in self.connection_types:
+            return False
+        for name in self.requires:
+            if params.get(name) is None:
+                return False
+        return True
+    
+    def arguments(self, params: Dict[str, Any], defaults: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple([params.get(name, defaults[name]) for name in self.inputs])
+    
+    def evaluate(self, args: Tuple[Any, ...]) -> Tuple[RuleStatus, Any, Any]:
+        value = self._value(*args)
+        limit = self._limit(*args)
+        passed = value >= limit if self._is_minimum else value <= limit
+        return (RuleStatus.PASS if passed else self.severity), value, limit
+    
+    def evaluate_arrays(self, args: List[Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = np.asarray(self._vector_value(*args), dtype=np.float64)
+            limit = np.asarray(self._vector_limit(*args), dtype=np.float64)
+        passed = value >= limit if self._is_minimum else value <= limit
+        status = np.where(passed, np.int8(STATUS_CODES[RuleStatus.PASS]), np.int8(self._failure_code))
+        return status, value, limit
+    
+    def evaluate_columns(self, columns: Dict[str, np.ndarray], n: int, connection_type: str,
+                         present: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self.connection_types is not None and connection_type not in self.connection_types:
+            nan = np.full(n, np.nan)
+            return np.full(n, np.int8(STATUS_NOT_APPLICABLE)), nan, nan
+        applicable = np.ones(n, dtype=bool)
+        for name in self.requires:
+            applicable &= present[name]
+        status, value, limit = self.evaluate_arrays([columns[name] for name in self.inputs])
+        status = np.where(applicable, np.broadcast_to(status, (n,)), np.int8(STATUS_NOT_APPLICABLE))
+        return status, np.broadcast_to(value, (n,)), np.broadcast_to(limit, (n,))
+    
+    def utilization(self, value: Any, limit: Any) -> Any:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return limit / value if self._is_minimum else value / limit
+    
+    def message(self, status: RuleStatus, args: Tuple[Any, ...], value: Any, limit: Any) -> str:
+        template = self.pass_message if status == RuleStatus.PASS else self.fail_message
+        return template.format(value=value, limit=limit, **dict(zip(self.inputs, args)))
+    
+    def check(self, args: Tuple[Any, ...]) -> CheckRecord:
+        status, value, limit = self.evaluate(args)
+        return CheckRecord(self.rule_id, self.rule_name, status, self.code_reference, value, limit, rule=self, args=args)
+
+class RuleRegistry:
+    
+    def __init__(self, defaults: Dict[str, Any], rules: Optional[List[Rule]] = None):
+        self.defaults = dict(defaults)
+        self.rules: List[Rule] = []
+        self._by_id: Dict[str, Rule] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        for rule in rules or []:
+            self.register(rule)
+    
+    def register(self, rule: Rule) -> Rule:
+        if rule.rule_id in self._by_id:
+            raise ValueError(f"Rule {rule.rule_id} is already registered")
+        missing = [name for name in rule.inputs if name not in self.defaults]
+        if missing:
+            raise ValueError(f"Rule {rule.rule_id} uses inputs without defaults: {missing}")
+        self.rules.append(rule)
+        self._by_id[rule.rule_id] = rule
+        for name in rule.inputs:
+            self._dependents.setdefault(name, []).append(rule.rule_id)
+        return rule
+    
+    def get(self, rule_id: str) -> Rule:
+        return self._by_id[rule_id]
+    
+    def dependent_rules(self, parameters: Iterable[str]) -> Set[str]:
+        affected = set()
+        for name in parameters:
+            affected.update(self._dependents.get(name, ()))
+        return affected
+    
+    @property
+    def dependency_map(self) -> Dict[str, List[str]]:
+        return {name: list(rule_ids) for name, rule_ids in self._dependents.items()}
+    
+    @property
+    def rule_ids(self) -> List[str]:
+        return [rule.rule_id for rule in self.rules]
+    
+    def applicable(self, connection_type: str, params: Dict[str, Any]) -> List[Rule]:
+        return [rule for rule in self.rules if rule.applies(connection_type, params)]
+    
+    def checks(self, params: Dict[str, Any], connection_type: str) -> List[CheckRecord]:
+        defaults = self.defaults
+        return [rule.check(rule.arguments(params, defaults)) for rule in self.applicable(connection_type, params)]
+    
+    def recheck(self, params: Dict[str, Any], connection_type: str, previous: Dict[str, CheckRecord],
+                rule_ids: Set[str]) -> List[CheckRecord]:
+        defaults = self.defaults
+        return [
+            rule.check(rule.arguments(params, defaults))
+            if rule.rule_id in rule_ids or rule.rule_id not in previous else previous[rule.rule_id]
+            for rule in self.applicable(connection_type, params)
+        ]
+    
+    def statuses(self, params: Dict[str, Any], connection_type: str) -> List[RuleStatus]:
+        defaults = self.defaults
+        return [rule.evaluate(rule.arguments(params, defaults))[0] for rule in self.applicable(connection_type, params)]
+    
+    def evaluate_columns(self, columns: Dict[str, np.ndarray], n: int, connection_type: str,
+                         present: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        status = np.empty((n, len(self.rules)), dtype=np.int8)
+        calculated = np.empty((n, len(self.rules)))
+        limits = np.empty((n, len(self.rules)))
+        utilization = np.empty((n, len(self.rules)))
+        for j, rule in enumerate(self.rules):
+            status[:, j], calculated[:, j], limits[:, j] = rule.evaluate_columns(columns, n, connection_type, present)
+            utilization[:, j] = rule.utilization(calculated[:, j], limits[:, j])
+        return status, calculated, limits, utilization
\ No newline at end of file
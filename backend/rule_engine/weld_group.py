@@ -0,0 +1,186 @@
+import math
+import os
+import numpy as np
+from pathlib import Path
+from typing import Any, Optional, Tuple
+from geometry_engine import GeometryGenerator
+from .bolt_group import load_table
+
+PHI_WELD = 0.75
+THROAT_RATIO = math.sqrt(2) / 2
+DEFAULT_ELECTRODE_STRENGTH = 70.0
+
+SEGMENTS_PER_INCH = 4
+MIN_SEGMENTS_PER_LINE = 8
+
+FILLETS_PER_PLATE = 2
+
+LINE_TABLE_VERSION = 1
+LINE_TABLE_SEGMENTS = 64
+LINE_TABLE_RATIOS = np.arange(0.0, 3.0 + 1e-9, 0.01)
+
+DEFAULT_LINE_TABLE_PATH = Path(__file__).parent / "data" / f"weld_line_capacities_v{LINE_TABLE_VERSION}.npy"
+
+MINIMUM_FILLET_SIZES = ((0.25, 0.125), (0.5, 0.1875), (0.75, 0.25))
+MINIMUM_FILLET_SIZE_THICK = 0.3125
+
+def discretize(lines: np.ndarray, segments_per_inch: float = SEGMENTS_PER_INCH) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    lines = np.asarray(lines, dtype=np.float64)[:, :, :2]
+    vectors = lines[:, 1] - lines[:, 0]
+    lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+    lines = lines[lengths > 1e-9]
+    vectors = vectors[lengths > 1e-9]
+    lengths = lengths[lengths > 1e-9]
+    counts = np.maximum(np.ceil(lengths * segments_per_inch).astype(int), MIN_SEGMENTS_PER_LINE)
+    
+    line_index = np.repeat(np.arange(len(lines)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    fractions = (offsets + 0.5) / counts[line_index]
+    centers = lines[line_index, 0] + fractions[:, np.newaxis] * vectors[line_index]
+    segment_lengths = (lengths / counts)[line_index]
+    axes = (vectors / lengths[:, np.newaxis])[line_index]
+    return centers, segment_lengths, axes
+
+def elastic_capacities(centers: np.ndarray, lengths: np.ndarray, eccentricities: np.ndarray) -> np.ndarray:
+    eccentricities = np.abs(np.atleast_1d(np.asarray(eccentricities, dtype=np.float64)))[:, np.newaxis]
+    centroid = (centers * lengths[:, np.newaxis]).sum(axis=0) / lengths.sum()
+    x = np.abs(centers[:, 0] - centroid[0])[np.newaxis, :]
+    y = (centers[:, 1] - centroid[1])[np.newaxis, :]
+    polar = (lengths * (x[0] ** 2 + y[0] ** 2)).sum() + (lengths ** 3).sum() / 12
+    
+    direct = 1 / lengths.sum()
+    stress = np.hypot(direct + eccentricities * x / polar, eccentricities * y / polar).max(axis=1)
+    return PHI_WELD * 0.6 * THROAT_RATIO / stress
+
+def ic_capacities(centers: np.ndarray, lengths: np.ndarray, axes: np.ndarray, eccentricities: np.ndarray,
+                  iterations: int = 60) -> np.ndarray:
+    eccentricities = np.abs(np.atleast_1d(np.asarray(eccentricities, dtype=np.float64)))
+    ex = eccentricities[:, np.newaxis]
+    centroid = (centers * lengths[:, np.newaxis]).sum(axis=0) / lengths.sum()
+    x = (centers[:, 0] - centroid[0])[np.newaxis, :]
+    y = (centers[:, 1] - centroid[1])[np.newaxis, :]
+    ax = axes[:, 0][np.newaxis, :]
+    ay = axes[:, 1][np.newaxis, :]
+    scale = max(float(np.abs(centers - centroid).max()), 1.0)
+    
+    def strength(theta: np.ndarray, deformation_ratio: np.ndarray) -> np.ndarray:
+        sine = np.sin(np.radians(theta))
+        p = deformation_ratio
+        return 0.6 * (1 + 0.5 * sine ** 1.5) * np.maximum(p * (1.9 - 0.9 * p), 0) ** 0.3 * THROAT_RATIO * lengths
+    
+    def residual(r0: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        dx = x + r0
+        d = np.maximum(np.hypot(dx, y), 1e-12)
+        cosine = np.minimum(np.abs(-y * ax + dx * ay) / d, 1.0)
+        theta = np.degrees(np.arccos(cosine))
+        ultimate = np.minimum(1.087 * (theta + 6) ** -0.65, 0.17)
+        maximum = 0.209 * (theta + 2) ** -0.32
+        rotation = (ultimate / d).min(axis=1, keepdims=True)
+        force = strength(theta, rotation * d / maximum)
+        vertical = (force * dx / d).sum(axis=1, keepdims=True)
+        moment = (force * d).sum(axis=1, keepdims=True)
+        return vertical - moment / (ex + r0), vertical
+    
+    low = np.full(ex.shape, np.log(1e-6 * scale))
+    high = np.full(ex.shape, np.log(1e6 * scale))
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        f, _ = residual(np.exp(middle))
+        below = f < 0
+        low = np.where(below, middle, low)
+        high = np.where(below, high, middle)
+    
+    _, vertical = residual(np.exp((low + high) / 2))
+    theta = np.degrees(np.arccos(np.minimum(np.abs(axes[:, 1]), 1.0)))
+    concentric = (0.6 * (1 + 0.5 * np.sin(np.radians(theta)) ** 1.5) * THROAT_RATIO * lengths).sum()
+    return PHI_WELD * np.where(eccentricities <= 1e-9, concentric, np.minimum(vertical[:, 0], concentric))
+
+def line_capacities(ratios: np.ndarray) -> np.ndarray:
+    centers, lengths, axes = discretize(np.array([[[0.0, 0.0], [0.0, 1.0]]]), LINE_TABLE_SEGMENTS)
+    return ic_capacities(centers, lengths, axes, ratios)
+
+class LineCapacityTable:
+    
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or os.environ.get('WELD_TABLE_PATH', DEFAULT_LINE_TABLE_PATH))
+        self._table: Optional[np.ndarray] = None
+    
+    def load(self) -> np.ndarray:
+        if self._table is None:
+            self._table = load_table(self.path, LINE_TABLE_RATIOS.shape, lambda: line_capacities(LINE_TABLE_RATIOS),
+                                     "weld line capacity table")
+        return self._table
+    
+    def capacities(self, length: Any, eccentricity: Any) -> np.ndarray:
+        length, eccentricity = np.broadcast_arrays(
+            np.abs(np.asarray(length, dtype=np.float64)),
+            np.abs(np.asarray(eccentricity, dtype=np.float64))
+        )
+        shape = length.shape
+        length = length.ravel()
+        eccentricity = eccentricity.ravel()
+        result = np.full(length.shape, np.nan)
+        
+        finite = np.isfinite(length) & np.isfinite(eccentricity)
+        result[finite & (length <= 1e-9)] = 0.0
+        solid = finite & (length > 1e-9)
+        ratio = np.zeros(length.shape)
+        ratio[solid] = eccentricity[solid] / length[solid]
+        
+        on_table = solid & (ratio <= LINE_TABLE_RATIOS[-1])
+        result[on_table] = length[on_table] * np.interp(ratio[on_table], LINE_TABLE_RATIOS, self.load())
+        off_table = solid & ~on_table
+        if off_table.any():
+            unique_ratios, inverse = np.unique(ratio[off_table], return_inverse=True)
+            result[off_table] = length[off_table] * line_capacities(unique_ratios)[inverse.ravel()]
+        return result.reshape(shape)
+
+LINE_CAPACITY_TABLE = LineCapacityTable()
+
+def single_plate_weld_length(num_bolts: Any, bolt_spacing: Any, edge_distance: Any) -> np.ndarray:
+    return (np.maximum(np.asarray(num_bolts, dtype=np.float64), 1) - 1) * np.asarray(bolt_spacing, dtype=np.float64) + \
+        2 * np.asarray(edge_distance, dtype=np.float64)
+
+def end_plate_weld_length(num_bolts_vertical: Any, bolt_spacing_vertical: Any) -> np.ndarray:
+    return (np.maximum(np.asarray(num_bolts_vertical, dtype=np.float64), 1) - 1) * \
+        np.asarray(bolt_spacing_vertical, dtype=np.float64)
+
+def effective_weld_size(weld_size: Any, plate_thickness: Any) -> float:
+    return GeometryGenerator.weld_size({"weld_size": weld_size, "plate_thickness": plate_thickness}, plate_thickness)
+
+def effective_weld_size_array(weld_size: Any, plate_thickness: Any) -> np.ndarray:
+    weld_size = np.asarray(weld_size, dtype=np.float64)
+    default = np.ceil(0.625 * np.asarray(plate_thickness, dtype=np.float64) * 16 - 1e-9) / 16
+    return np.where(weld_size > 0, weld_size, default)
+
+def minimum_weld_size(plate_thickness: Any) -> float:
+    for thickness, size in MINIMUM_FILLET_SIZES:
+        if plate_thickness <= thickness:
+            return size
+    return MINIMUM_FILLET_SIZE_THICK
+
+def minimum_weld_size_array(plate_thickness: Any) -> np.ndarray:
+    plate_thickness = np.asarray(plate_thickness, dtype=np.float64)
+    return np.select([plate_thickness <= thickness for thickness, _ in MINIMUM_FILLET_SIZES],
+                     [size for _, size in MINIMUM_FILLET_SIZES], MINIMUM_FILLET_SIZE_THICK)
+
+def single_plate_weld_strength(num_bolts: Any, bolt_spacing: Any, edge_distance: Any, plate_width: Any,
+                               weld_size: Any, electrode_strength: Any) -> float:
+    return float(single_plate_weld_strength_array(num_bolts, bolt_spacing, edge_distance, plate_width, weld_size,
+                                                  electrode_strength))
+
+def single_plate_weld_strength_array(num_bolts: Any, bolt_spacing: Any, edge_distance: Any, plate_width: Any,
+                                     weld_size: Any, electrode_strength: Any) -> np.ndarray:
+    length = single_plate_weld_length(num_bolts, bolt_spacing, edge_distance)
+    capacity = FILLETS_PER_PLATE * LINE_CAPACITY_TABLE.capacities(length, np.asarray(plate_width, dtype=np.float64) / 2)
+    return capacity * np.asarray(weld_size, dtype=np.float64) * np.asarray(electrode_strength, dtype=np.float64)
+
+def end_plate_weld_strength(num_bolts_vertical: Any, bolt_spacing_vertical: Any, weld_size: Any,
+                            electrode_strength: Any) -> float:
+    return float(end_plate_weld_strength_array(num_bolts_vertical, bolt_spacing_vertical, weld_size, electrode_strength))
+
+def end_plate_weld_strength_array(num_bolts_vertical: Any, bolt_spacing_vertical: Any, weld_size: Any,
+                                  electrode_strength: Any) -> np.ndarray:
+    length = end_plate_weld_length(num_bolts_vertical, bolt_spacing_vertical)
+    capacity = FILLETS_PER_PLATE * LINE_CAPACITY_TABLE.capacities(length, 0.0)
+    return capacity * np.asarray(weld_size, dtype=np.float64) * np.asarray(electrode_strength, dtype=np.float64)
\ No newline at end of file
@@ -1,7 +1,7 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Depends
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
@@ -9,13 +9,33 @@ from pathlib import Path
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-from routes import auth, projects, connections, redlines, audit, ai
+from routes import auth, projects, connections, typicals, redlines, audit, ai, jobs
+from rule_engine.bolt_group import COEFFICIENT_TABLE
+from shape_service.shapes import SHAPES
+from validation_engine.bulk import shutdown_executor
+from audit_service.audit import AUDIT_WRITER
+from job_service.scheduler import JOBS
+from database import DATABASE, ensure_indexes
+from utils.dependencies import get_current_user
+from pymongo.errors import PyMongoError
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await ensure_indexes(DATABASE.connect())
+    except PyMongoError as e:
+        logger.error(f"Index bootstrap failed: {e}")
+    COEFFICIENT_TABLE.load()
+    SHAPES.load()
+    AUDIT_WRITER.start()
+    JOBS.start()
+    yield
+    await JOBS.stop()
+    shutdown_executor()
+    await AUDIT_WRITER.stop()
+    DATABASE.close()
 
-app = FastAPI(title="SteelConnect AI API", version="1.0.0")
+app = FastAPI(title="SteelConnect AI API", version="1.0.0", lifespan=lifespan)
 
 api_router = APIRouter(prefix="/api")
 
@@ -31,12 +51,26 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "SteelConnect AI"}
 
+@api_router.get("/health/database")
+async def database_stats(user_id: str = Depends(get_current_user)):
+    return DATABASE.stats()
+
+@api_router.get("/health/jobs")
+async def job_stats(user_id: str = Depends(get_current_user)):
+    return JOBS.stats()
+
+@api_router.get("/health/audit")
+async def audit_stats(user_id: str = Depends(get_current_user)):
+    return AUDIT_WRITER.stats()
+
 api_router.include_router(auth.router)
 api_router.include_router(projects.router)
 api_router.include_router(connections.router)
+api_router.include_router(typicals.router)
 api_router.include_router(redlines.router)
 api_router.include_router(audit.router)
 api_router.include_router(ai.router)
+api_router.include_router(jobs.router)
 
 app.include_router(api_router)
 
@@ -52,8 +86,4 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
-logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+logger = logging.getLogger(__name__)
\ No newline at end of file
@@ -0,0 +1,171 @@
+import csv
+import logging
+import os
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+DATABASE_VERSION = 1
+
+SOURCE_PATH = Path(__file__).parent / "aisc_shapes.csv"
+DEFAULT_DATABASE_PATH = Path(__file__).parent / "data" / f"aisc_shapes_v{DATABASE_VERSION}.npy"
+
+SHAPE_DTYPE = np.dtype([
+    ("designation", "U24"),
+    ("shape_type", "U4"),
+    ("W", "f8"),
+    ("A", "f8"),
+    ("d", "f8"),
+    ("bf", "f8"),
+    ("tw", "f8"),
+    ("tf", "f8"),
+    ("kdes", "f8")
+])
+
+SECTION_PARAMETERS = {
+    "beam_section": {
+        "beam_depth": "d",
+        "beam_flange_width": "bf",
+        "beam_web_thickness": "tw",
+        "beam_flange_thickness": "tf",
+        "beam_k": "kdes"
+    },
+    "angle_size": {
+        "angle_leg": "d",
+        "angle_outstanding_leg": "bf",
+        "angle_thickness": "tw",
+        "angle_k": "kdes"
+    }
+}
+
+def normalize_designation(designation: Any) -> str:
+    return str(designation).strip().upper().replace(" ", "")
+
+def build_database(source: Path = SOURCE_PATH) -> np.ndarray:
+    with open(source, newline='') as f:
+        rows = list(csv.DictReader(f))
+    database = np.zeros(len(rows), dtype=SHAPE_DTYPE)
+    for i, row in enumerate(rows):
+        database[i] = tuple(
+            normalize_designation(row[name]) if name == "designation" else
+            row[name] if name == "shape_type" else
+            float(row[name]) if row[name] else np.nan
+            for name in SHAPE_DTYPE.names
+        )
+    return database
+
+class ShapeDatabase:
+    
+    def __init__(self, path: Optional[Path] = None, source: Path = SOURCE_PATH):
+        self.path = Path(path or os.environ.get('SHAPES_DB_PATH', DEFAULT_DATABASE_PATH))
+        self.source = source
+        self._shapes: Optional[np.ndarray] = None
+        self._index: Dict[str, int] = {}
+    
+    def load(self) -> np.ndarray:
+        if self._shapes is not None:
+            return self._shapes
+        try:
+            if self.path.stat().st_mtime < self.source.stat().st_mtime:
+                raise ValueError("source table is newer")
+            shapes = np.load(self.path, mmap_mode='r')
+            if shapes.dtype != SHAPE_DTYPE:
+                raise ValueError(f"unexpected dtype {shapes.dtype}")
+        except (OSError, ValueError) as e:
+            logger.info(f"Building shapes database at {self.path} ({e})")
+            shapes = build_database(self.source)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporary = self.path.with_suffix(f".{os.getpid()}.tmp")
+                with open(temporary, 'wb') as f:
+                    np.save(f, shapes)
+                os.replace(temporary, self.path)
+                shapes = np.load(self.path, mmap_mode='r')
+            except OSError as e:
+                logger.warning(f"Could not persist shapes database: {e}")
+        self._index = {str(designation): i for i, designation in enumerate(shapes["designation"])}
+        self._shapes = shapes
+        return shapes
+    
+    def index(self, designation: Any) -> Optional[int]:
+        self.load()
+        return self._index.get(normalize_designation(designation))
+    
+    def lookup(self, designation: Any) -> Optional[np.void]:
+        i = self.index(designation)
+        return None if i is None else self.load()[i]
+    
+    def indices(self, designations: Iterable[Any]) -> np.ndarray:
+        self.load()
+        index = self._index
+        return np.array([index.get(normalize_designation(d), -1) if d is not None else -1 for d in designations], dtype=np.int64)
+    
+    def properties(self, designation: Any) -> Optional[Dict[str, Any]]:
+        shape = self.lookup(designation)
+        if shape is None:
+            return None
+        return {name: shape[name].item() for name in SHAPE_DTYPE.names}
+    
+    def designations(self, shape_type: Optional[str] = None) -> list:
+        shapes = self.load()
+        if shape_type is None:
+            return [str(d) for d in shapes["designation"]]
+        return [str(d) for d in shapes["designation"][shapes["shape_type"] == shape_type.upper()]]
+
+SHAPES = ShapeDatabase()
+
+def angle_designation(angle_size: Any) -> str:
+    designation = normalize_designation(angle_size)
+    return designation if designation.startswith("L") else f"L{designation}"
+
+def section_designation(parameter: str, value: Any) -> str:
+    return angle_designation(value) if parameter == "angle_size" else normalize_designation(value)
+
+def unknown_sections(params: Dict[str, Any]) -> Set[str]:
+    return {
+        parameter for parameter in SECTION_PARAMETERS
+        if params.get(parameter) is not None and SHAPES.index(section_designation(parameter, params[parameter])) is None
+    }
+
+def resolve_sections(params: Dict[str, Any]) -> Dict[str, Any]:
+    resolved = None
+    for parameter, fields in SECTION_PARAMETERS.items():
+        value = params.get(parameter)
+        if value is None:
+            continue
+        shape = SHAPES.lookup(section_designation(parameter, value))
+        if shape is None:
+            continue
+        for name, field in fields.items():
+            if name not in params and not np.isnan(shape[field]):
+                if resolved is None:
+                    resolved = dict(params)
+                resolved[name] = shape[field].item()
+    return params if resolved is None else resolved
+
+def derived_parameters(changed: Iterable[str]) -> Set[str]:
+    changed = set(changed)
+    for parameter in list(changed):
+        changed.update(SECTION_PARAMETERS.get(parameter, ()))
+    return changed
+
+def resolve_section_columns(sections: Dict[str, Sequence[Any]], columns: Dict[str, np.ndarray],
+                            present: Dict[str, np.ndarray]) -> None:
+    for parameter, values in sections.items():
+        fields = SECTION_PARAMETERS[parameter]
+        targets = [name for name in fields if name in columns]
+        if not targets:
+            continue
+        unique, inverse = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+        rows = SHAPES.indices([section_designation(parameter, value) for value in unique])[inverse.ravel()]
+        found = rows >= 0
+        if not found.any():
+            continue
+        shapes = SHAPES.load()
+        for name in targets:
+            derived = shapes[fields[name]][np.maximum(rows, 0)]
+            fill = found & ~present[name] & ~np.isnan(derived)
+            columns[name] = np.where(fill, derived, columns[name])
+            present[name] = present[name] | fill
\ No newline at end of file
@@ -0,0 +1,42 @@
+import hashlib
+import re
+from fastapi import HTTPException, Request, Response, status
+from typing import Any, Dict, List, Optional
+
+ENTITY_TAG = re.compile(r'^(?:W/)?"v(\d+)(?:-[^"]*)?"$')
+
+def entity_tag(document: Dict[str, Any], variant: Optional[str] = None) -> str:
+    version = document.get('version') or 0
+    if not variant:
+        return f'"v{version}"'
+    return f'"v{version}-{hashlib.sha1(variant.encode()).hexdigest()[:8]}"'
+
+def _tags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(',') if tag.strip()]
+
+def _weak(tag: str) -> str:
+    return tag[2:] if tag.startswith('W/') else tag
+
+def if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    return any(tag == '*' or _weak(tag) == _weak(etag) for tag in _tags(header))
+
+def if_match_version(request: Request) -> Optional[int]:
+    header = request.headers.get('if-match')
+    if not header:
+        return None
+    tags = _tags(header)
+    if '*' in tags:
+        return None
+    versions = {int(match.group(1)) for match in map(ENTITY_TAG.match, tags) if match and not match.group(0).startswith('W/')}
+    if len(versions) != 1:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="If-Match does not name a current version")
+    return versions.pop()
+
+def version_filter(version: int) -> Dict[str, Any]:
+    return {"version": version} if version else {"version": {"$in": [None, 0]}}
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,12 @@
+import hashlib
+from pathlib import Path
+from typing import Union
+
+def source_fingerprint(*paths: Union[str, Path]) -> str:
+    digest = hashlib.sha256()
+    for path in map(Path, paths):
+        files = sorted(path.glob('*.py')) if path.is_dir() else [path]
+        for file in files:
+            digest.update(file.name.encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()[:12]
\ No newline at end of file
@@ -0,0 +1,14 @@
+from fastapi import Request, status
+from typing import Any, Dict
+from .responses import FastJSONResponse
+
+def wants_async(request: Request) -> bool:
+    return any(preference.split(';')[0].strip().lower() == 'respond-async'
+               for preference in request.headers.get('prefer', '').split(','))
+
+def job_accepted(job: Dict[str, Any]) -> FastJSONResponse:
+    return FastJSONResponse(
+        {"job_id": job['id'], "kind": job['kind'], "status": job['status']},
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/api/jobs/{job['id']}", "Preference-Applied": "respond-async"}
+    )
\ No newline at end of file
@@ -0,0 +1,40 @@
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, TypeVar, Union
+import inspect
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get('accept', '')
+
+async def keyset_page(fetch: Awaitable[Tuple[T, Optional[str]]], response: Response) -> T:
+    try:
+        documents, next_cursor = await fetch
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return documents
+
+def cursor_headers(response: Response) -> Dict[str, str]:
+    next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+
+async def ndjson_stream(open_stream: Callable[[], Union[AsyncIterator[Dict[str, Any]], Awaitable[AsyncIterator[Dict[str, Any]]]]],
+                        serialize: Callable[[Dict[str, Any]], bytes]) -> StreamingResponse:
+    try:
+        documents = open_stream()
+        if inspect.isawaitable(documents):
+            documents = await documents
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    async def lines():
+        async for document in documents:
+            yield serialize(document) + b"\n"
+    
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
\ No newline at end of file
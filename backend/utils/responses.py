@@ -0,0 +1,25 @@
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import Any
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps(content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if isinstance(content, list) and content and all(isinstance(item, BaseModel) for item in content):
+        return b"[" + b",".join(item.__pydantic_serializer__.to_json(item) for item in content) + b"]"
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+class FastJSONResponse(JSONResponse):
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+from rule_engine import AISC360RuleEngine
+from geometry_engine import GeometryGenerator
+from geometry_engine.encoding import packed_fields
+from models.connection import ConnectionStatus
+from .validator import ValidationEngine
+
+CHUNK_SIZE = 25
+
+_rule_engine: Optional[AISC360RuleEngine] = None
+_executor: Optional[ProcessPoolExecutor] = None
+
+def worker_count() -> int:
+    return int(os.environ.get('VALIDATION_WORKERS', '0')) or os.cpu_count() or 1
+
+def executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=worker_count(), mp_context=multiprocessing.get_context('spawn'))
+    return _executor
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def validate_document(connection: Dict[str, Any]) -> Dict[str, Any]:
+    global _rule_engine
+    if _rule_engine is None:
+        _rule_engine = AISC360RuleEngine()
+    
+    connection_type = connection['connection_type']
+    parameters = connection.get('parameters') or {}
+    
+    param_validation = ValidationEngine.validate_parameters(parameters, connection_type)
+    if not param_validation['is_valid']:
+        return {
+            "connection_id": connection['id'],
+            "status": "failed",
+            "message": "Parameter validation failed",
+            "issues": param_validation['issues'],
+            "update": None
+        }
+    
+    rule_result = _rule_engine.validate_connection(connection_type, parameters)
+    geometry = GeometryGenerator.build(connection_type, parameters)
+    geom_validation = ValidationEngine.validate_geometry(geometry)
+    rule_validation = rule_result.to_dict()
+    status = ConnectionStatus.VALIDATED if rule_result.is_valid else ConnectionStatus.FAILED
+    
+    return {
+        "connection_id": connection['id'],
+        "status": status.value,
+        "overall_status": rule_result.overall_status.value,
+        "summary": rule_result.summary,
+        "is_valid": rule_result.is_valid,
+        "geometry_valid": geom_validation['is_valid'],
+        "update": {
+            "validation_results": rule_validation,
+            "rule_checks": rule_validation['checks'],
+            **packed_fields(geometry),
+            "status": status.value
+        }
+    }
+
+def validate_documents(connections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    results = []
+    for connection in connections:
+        try:
+            results.append(validate_document(connection))
+        except (TypeError, ValueError, KeyError) as e:
+            results.append({
+                "connection_id": connection.get('id'),
+                "status": "error",
+                "message": f"Validation error: {e}",
+                "update": None
+            })
+    return results
\ No newline at end of file
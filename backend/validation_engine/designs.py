@@ -0,0 +1,170 @@
+import asyncio
+from pymongo import UpdateOne
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from rule_engine import AISC360RuleEngine
+from geometry_engine import GeometryGenerator
+from geometry_engine.encoding import packed_fields
+from cache_service.result_cache import canonical_key
+from database import ConnectionRepo, DesignResultRepo
+from models.connection import ConnectionStatus
+from .validator import ValidationEngine
+
+DESIGN_VERSION = f"{AISC360RuleEngine.VERSION}/geometry-{GeometryGenerator.VERSION}"
+DESIGN_FIELDS = ("validation_results", "rule_checks", "geometry", "geometry_packed")
+DESIGN_PROJECTION = {name: 1 for name in DESIGN_FIELDS}
+SUMMARY_FIELDS = ("overall_status", "summary", "is_valid")
+
+DesignSpec = Tuple[str, Dict[str, Any]]
+
+def resolve_parameters(parameters: Optional[Dict[str, Any]], overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {**(parameters or {}), **(overrides or {})}
+
+def design_key(connection_type: str, parameters: Dict[str, Any]) -> str:
+    return canonical_key("design", connection_type, parameters, DESIGN_VERSION)
+
+def compute_design(rule_engine: AISC360RuleEngine, connection_type: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    param_validation = ValidationEngine.validate_parameters(parameters, connection_type)
+    if not param_validation['is_valid']:
+        return {
+            "status": ConnectionStatus.FAILED.value,
+            "validation_results": param_validation,
+            "rule_checks": [],
+            **packed_fields(None),
+            "geometry_valid": False
+        }
+    
+    rule_result = rule_engine.validate_connection(connection_type, parameters)
+    geometry = GeometryGenerator.build(connection_type, parameters)
+    rule_validation = rule_result.to_dict()
+    return {
+        "status": (ConnectionStatus.VALIDATED if rule_result.is_valid else ConnectionStatus.FAILED).value,
+        "validation_results": rule_validation,
+        "rule_checks": rule_validation['checks'],
+        **packed_fields(geometry),
+        "geometry_valid": ValidationEngine.validate_geometry(geometry)['is_valid']
+    }
+
+def instance_fields(key: str, design: Dict[str, Any]) -> Dict[str, Any]:
+    results = design.get('validation_results') or {}
+    return {
+        "design_key": key,
+        "status": design['status'],
+        "validation_results": {name: results.get(name) for name in SUMMARY_FIELDS},
+        "rule_checks": [],
+        **packed_fields(None)
+    }
+
+class DesignStore:
+    
+    def __init__(self, repo: Optional[DesignResultRepo] = None, connections: Optional[ConnectionRepo] = None):
+        self.repo = repo or DesignResultRepo()
+        self.connections = connections or ConnectionRepo()
+        self._rule_engine: Optional[AISC360RuleEngine] = None
+        self.computed = 0
+        self.reused = 0
+    
+    @property
+    def rule_engine(self) -> AISC360RuleEngine:
+        if self._rule_engine is None:
+            self._rule_engine = AISC360RuleEngine()
+        return self._rule_engine
+    
+    def _compute(self, specs: Dict[str, DesignSpec]) -> Dict[str, Dict[str, Any]]:
+        return {key: compute_design(self.rule_engine, connection_type, parameters)
+                for key, (connection_type, parameters) in specs.items()}
+    
+    async def ensure(self, specs: Dict[str, DesignSpec]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        designs = await self.repo.get_many(list(specs)) if specs else {}
+        missing = {key: spec for key, spec in specs.items() if key not in designs}
+        if missing:
+            computed = await asyncio.to_thread(self._compute, missing)
+            created_at = datetime.now(timezone.utc)
+            await self.repo.bulk_write([
+                UpdateOne({"_id": key}, {"$setOnInsert": {
+                    **design,
+                    "connection_type": missing[key][0],
+                    "parameters": missing[key][1],
+                    "version": DESIGN_VERSION,
+                    "created_at": created_at
+                }}, upsert=True)
+                for key, design in computed.items()
+            ], ordered=False)
+            designs.update(computed)
+        self.computed += len(missing)
+        self.reused += len(specs) - len(missing)
+        return designs, sorted(missing)
+    
+    async def assign(self, instances: List[Dict[str, Any]],
+                     typical: Optional[Dict[str, Any]] = None) -> Tuple[List[Tuple[Dict[str, Any], Dict[str, Any]]], Dict[str, Any]]:
+        keys = set()
+        pending = []
+        specs: Dict[str, DesignSpec] = {}
+        for instance in instances:
+            if typical is not None:
+                parameters = resolve_parameters(typical['parameters'], instance.get('overrides'))
+            else:
+                parameters = instance.get('parameters') or {}
+            key = design_key(instance['connection_type'], parameters)
+            keys.add(key)
+            if instance.get('design_key') == key and instance.get('status') not in (None, ConnectionStatus.DRAFT.value):
+                continue
+            specs.setdefault(key, (instance['connection_type'], parameters))
+            pending.append((instance, key, parameters))
+        
+        designs, computed = await self.ensure(specs)
+        assignments = [(instance, {"parameters": parameters, **instance_fields(key, designs[key])})
+                       for instance, key, parameters in pending]
+        return assignments, {
+            "instances": len(instances),
+            "unique_designs": len(keys),
+            "computed": len(computed),
+            "reused": len(specs) - len(computed),
+            "updated": len(assignments)
+        }
+    
+    async def link(self, instances: List[Dict[str, Any]], typical: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        assignments, stats = await self.assign(instances, typical)
+        if assignments:
+            updated_at = datetime.now(timezone.utc)
+            await self.connections.bulk_write([
+                UpdateOne({"id": instance['id']}, {"$set": {**fields, "updated_at": updated_at}, "$inc": {"version": 1}})
+                for instance, fields in assignments
+            ], ordered=False)
+        return stats
+    
+    async def attach(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        keys = {document['design_key'] for document in documents if document.get('design_key')}
+        if not keys:
+            return documents
+        designs = await self.repo.get_many(list(keys), DESIGN_PROJECTION)
+        for document in documents:
+            design = designs.get(document.get('design_key'))
+            if design is None:
+                continue
+            for name in DESIGN_FIELDS:
+                if name in document:
+                    document[name] = design.get(name)
+        return documents
+    
+    async def attach_stream(self, documents: AsyncIterator[Dict[str, Any]], batch_size: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        batch = []
+        async for document in documents:
+            batch.append(document)
+            if len(batch) >= batch_size:
+                for attached in await self.attach(batch):
+                    yield attached
+                batch = []
+        for attached in await self.attach(batch):
+            yield attached
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.computed + self.reused
+        return {
+            "version": DESIGN_VERSION,
+            "computed": self.computed,
+            "reused": self.reused,
+            "reuse_ratio": self.reused / lookups if lookups else 0.0
+        }
+
+DESIGNS = DesignStore()
\ No newline at end of file
@@ -0,0 +1,65 @@
+from typing import Dict, Any, Optional, Set
+from rule_engine import AISC360RuleEngine
+from geometry_engine import GeometryGenerator
+from geometry_engine.encoding import packed_fields, stored_components
+from models.connection import ConnectionStatus
+from .validator import ValidationEngine
+
+def changed_parameters(old: Dict[str, Any], new: Dict[str, Any]) -> Set[str]:
+    return {name for name in set(old) | set(new) if old.get(name) != new.get(name)}
+
+def incremental_revalidation(rule_engine: AISC360RuleEngine, connection: Dict[str, Any],
+                             new_parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not connection.get('validation_results'):
+        return None
+    
+    changed = changed_parameters(connection.get('parameters') or {}, new_parameters)
+    if not changed:
+        return None
+    
+    connection_type = connection['connection_type']
+    param_validation = ValidationEngine.validate_parameters(new_parameters, connection_type)
+    if not param_validation['is_valid']:
+        return {
+            "update": {
+                "validation_results": None,
+                "rule_checks": [],
+                **packed_fields(None),
+                "geometry_valid": False,
+                "status": ConnectionStatus.DRAFT.value
+            },
+            "changed_parameters": sorted(changed),
+            "rerun_rules": [],
+            "is_valid": False,
+            "geometry_validation": None
+        }
+    
+    rule_result = rule_engine.revalidate(
+        connection_type,
+        new_parameters,
+        connection['validation_results'],
+        changed
+    )
+    geometry = GeometryGenerator.regenerate(
+        connection_type,
+        new_parameters,
+        stored_components(connection),
+        changed
+    )
+    geom_validation = ValidationEngine.validate_geometry(geometry)
+    
+    validation_results = rule_result.to_dict()
+    
+    return {
+        "update": {
+            "validation_results": validation_results,
+            "rule_checks": validation_results['checks'],
+            **packed_fields(geometry),
+            "geometry_valid": geom_validation['is_valid'],
+            "status": (ConnectionStatus.VALIDATED if rule_result.is_valid else ConnectionStatus.FAILED).value
+        },
+        "changed_parameters": sorted(changed),
+        "rerun_rules": sorted(rule_engine.registry.dependent_rules(changed)),
+        "is_valid": rule_result.is_valid,
+        "geometry_validation": geom_validation
+    }
\ No newline at end of file
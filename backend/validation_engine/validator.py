@@ -1,4 +1,35 @@
+import numbers
+import numpy as np
+import pandas as pd
 from typing import Dict, Any, List
+from geometry_engine import WeldGroup
+from rule_engine.aisc360 import PARAMETER_DEFAULTS
+from shape_service.shapes import SHAPES, section_designation, unknown_sections
+
+REQUIRED_PARAMETERS = {
+    "single_plate": ["num_bolts", "bolt_diameter", "plate_thickness"],
+    "double_angle": ["num_bolts", "bolt_diameter", "angle_size"],
+    "end_plate": ["num_bolts_vertical", "num_bolts_horizontal", "plate_thickness"],
+    "beam_to_column_shear": ["num_bolts", "bolt_diameter"],
+    "beam_to_beam_shear": ["num_bolts", "bolt_diameter"]
+}
+STANDARD_BOLT_DIAMETERS = [0.5, 0.625, 0.75, 0.875, 1.0, 1.125, 1.25]
+MIN_PLATE_THICKNESS = 0.1875
+NUMERIC_PARAMETERS = frozenset(
+    {name for name, default in PARAMETER_DEFAULTS.items() if not isinstance(default, str)} |
+    {"bolt_spacing_horizontal", "beam_web_thickness", "angle_leg", "angle_thickness"}
+)
+
+def coerce_numeric_columns(parameters: pd.DataFrame) -> pd.DataFrame:
+    coerced = parameters.copy()
+    for name in parameters.columns:
+        if name not in NUMERIC_PARAMETERS:
+            continue
+        column = parameters[name]
+        numeric = pd.to_numeric(column, errors="coerce")
+        text = column.notna() & numeric.isna()
+        coerced[name] = column.astype(object).where(text, numeric) if text.any() else numeric
+    return coerced
 
 class ValidationEngine:
     
@@ -25,6 +56,15 @@ class ValidationEngine:
             elif len(bolts) < 2:
                 warnings.append("Less than 2 bolts - verify design intent")
         
+        if "welds" in geometry:
+            welds = geometry["welds"]
+            if isinstance(welds, WeldGroup):
+                invalid = len(welds) > 0 and welds.weld_size <= 0
+            else:
+                invalid = any(weld.get("weld_size", 0) <= 0 for weld in welds)
+            if invalid:
+                issues.append("Invalid weld size")
+        
         if "dimensions" not in geometry:
             warnings.append("Missing dimension summary")
         
@@ -42,33 +82,88 @@ class ValidationEngine:
         issues = []
         warnings = []
         
-        required_params = {
-            "single_plate": ["num_bolts", "bolt_diameter", "plate_thickness"],
-            "double_angle": ["num_bolts", "bolt_diameter", "angle_size"],
-            "end_plate": ["num_bolts_vertical", "num_bolts_horizontal", "plate_thickness"],
-            "beam_to_column_shear": ["num_bolts", "bolt_diameter"],
-            "beam_to_beam_shear": ["num_bolts", "bolt_diameter"]
-        }
-        
-        required = required_params.get(connection_type, [])
+        required = REQUIRED_PARAMETERS.get(connection_type, [])
         for param in required:
             if param not in params or params[param] is None:
                 issues.append(f"Missing required parameter: {param}")
         
-        if "bolt_diameter" in params:
+        text = set()
+        for param, value in params.items():
+            if param in NUMERIC_PARAMETERS and value is not None and not isinstance(value, numbers.Real):
+                issues.append(f"{param} must be numeric")
+                text.add(param)
+        
+        if "bolt_diameter" in params and "bolt_diameter" not in text:
             diameter = params["bolt_diameter"]
-            if diameter not in [0.5, 0.625, 0.75, 0.875, 1.0, 1.125, 1.25]:
+            if diameter not in STANDARD_BOLT_DIAMETERS:
                 warnings.append(f"Non-standard bolt diameter: {diameter} in")
         
-        if "plate_thickness" in params:
+        if "plate_thickness" in params and "plate_thickness" not in text:
             thickness = params["plate_thickness"]
-            if thickness < 0.1875:
+            if thickness < MIN_PLATE_THICKNESS:
                 issues.append(f"Plate thickness {thickness} in is below minimum (3/16 in)")
         
+        unknown = unknown_sections(params)
+        if "beam_section" in unknown:
+            warnings.append(f"Beam section {params['beam_section']} not found in shapes database; supply beam_depth explicitly")
+        if "angle_size" in unknown:
+            warnings.append(f"Angle size {params['angle_size']} not found in shapes database")
+        
         is_valid = len(issues) == 0
         
         return {
             "is_valid": is_valid,
             "issues": issues,
             "warnings": warnings
-        }
\ No newline at end of file
+        }
+    
+    @staticmethod
+    def validate_parameter_frame(parameters: pd.DataFrame, connection_types: pd.Series) -> pd.DataFrame:
+        issues: List[List[str]] = [[] for _ in range(len(parameters))]
+        warnings: List[List[str]] = [[] for _ in range(len(parameters))]
+        
+        def report(target: List[List[str]], mask: np.ndarray, message) -> None:
+            for position in np.flatnonzero(mask):
+                target[position].append(message if isinstance(message, str) else message(position))
+        
+        types = connection_types.to_numpy()
+        for connection_type, required in REQUIRED_PARAMETERS.items():
+            rows = types == connection_type
+            if not rows.any():
+                continue
+            for param in required:
+                missing = rows if param not in parameters else rows & parameters[param].isna().to_numpy()
+                report(issues, missing, f"Missing required parameter: {param}")
+        
+        numeric = {}
+        for param in parameters.columns:
+            if param in NUMERIC_PARAMETERS:
+                numeric[param] = pd.to_numeric(parameters[param], errors="coerce")
+                report(issues, (parameters[param].notna() & numeric[param].isna()).to_numpy(), f"{param} must be numeric")
+        
+        if "bolt_diameter" in parameters:
+            diameter = numeric["bolt_diameter"]
+            nonstandard = (diameter.notna() & ~diameter.isin(STANDARD_BOLT_DIAMETERS)).to_numpy()
+            report(warnings, nonstandard, lambda i: f"Non-standard bolt diameter: {diameter.iat[i]} in")
+        
+        if "plate_thickness" in parameters:
+            thickness = numeric["plate_thickness"]
+            report(issues, (thickness < MIN_PLATE_THICKNESS).to_numpy(),
+                   lambda i: f"Plate thickness {thickness.iat[i]} in is below minimum (3/16 in)")
+        
+        for parameter, template in (("beam_section", "Beam section {} not found in shapes database; supply beam_depth explicitly"),
+                                    ("angle_size", "Angle size {} not found in shapes database")):
+            if parameter not in parameters:
+                continue
+            values = parameters[parameter]
+            present = values.notna().to_numpy()
+            unique, inverse = np.unique(values[present].astype(str).to_numpy(), return_inverse=True)
+            unknown = np.zeros(len(values), dtype=bool)
+            unknown[present] = SHAPES.indices([section_designation(parameter, value) for value in unique])[inverse.ravel()] < 0
+            report(warnings, unknown, lambda i: template.format(values.iat[i]))
+        
+        return pd.DataFrame({
+            "is_valid": [not row for row in issues],
+            "issues": issues,
+            "warnings": warnings
+        }, index=parameters.index)
\ No newline at end of file
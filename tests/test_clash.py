@@ -0,0 +1,89 @@
+import itertools
+import numpy as np
+from clash_service.clash import CONTACT_TOLERANCE, ClashService, ConnectionEntry, ProjectClashIndex, boxes_overlap
+
+CONNECTION_TYPES = ["single_plate", "double_angle", "end_plate"]
+
+def random_connection(rng, connection_id: str):
+    return {
+        "id": connection_id,
+        "connection_type": str(rng.choice(CONNECTION_TYPES)),
+        "parameters": {
+            "num_bolts": int(rng.integers(2, 6)),
+            "num_bolts_vertical": int(rng.integers(2, 5)),
+            "bolt_diameter": float(rng.choice([0.75, 0.875, 1.0])),
+            "bolt_spacing": 3.0
+        },
+        "placement": {
+            "origin": rng.uniform(0.0, 30.0, 3).round(2).tolist(),
+            "rotation": [0.0, 0.0, float(rng.choice([0.0, 90.0, 37.5]))]
+        }
+    }
+
+def brute_force(connections, min_clearance: float):
+    entries = {c["id"]: ConnectionEntry("", c["connection_type"], c["parameters"], c["placement"], 6.0) for c in connections}
+    bolts, plates = set(), set()
+    for (a, first), (b, second) in itertools.combinations(sorted(entries.items()), 2):
+        for i, j in itertools.product(range(len(first.bolts)), range(len(second.bolts))):
+            distance = np.linalg.norm(first.bolts[i] - second.bolts[j])
+            if distance < first.radii[i] + second.radii[j] + min_clearance:
+                bolts.add(((a, i), (b, j)))
+        for i, j in itertools.product(range(len(first.box_half)), range(len(second.box_half))):
+            depth = boxes_overlap(first.box_centers[[i]], first.box_axes[[i]], first.box_half[[i]],
+                                  second.box_centers[[j]], second.box_axes[[j]], second.box_half[[j]])[0]
+            if depth > CONTACT_TOLERANCE:
+                plates.add(((a, i), (b, j)))
+    return bolts, plates
+
+def indexed(index: ProjectClashIndex):
+    bolts = {tuple(sorted(((c["connection_a"], c["bolt_a"]), (c["connection_b"], c["bolt_b"]))))
+             for clashes in index.bolt_clashes.values() for c in clashes}
+    plates = {tuple(sorted(((c["connection_a"], c["part_a"]), (c["connection_b"], c["part_b"]))))
+              for clashes in index.plate_clashes.values() for c in clashes}
+    return bolts, plates
+
+def test_incremental_sync_matches_brute_force():
+    rng = np.random.default_rng(12)
+    connections = {f"c{i:03d}": random_connection(rng, f"c{i:03d}") for i in range(60)}
+    index = ProjectClashIndex()
+    
+    index.sync(list(connections.values()), 0.5)
+    expected = brute_force(list(connections.values()), 0.5)
+    assert indexed(index) == expected
+    assert expected[0] and expected[1]
+    
+    for step in range(5):
+        for connection_id in rng.choice(sorted(connections), 8, replace=False).tolist():
+            connections[connection_id] = random_connection(rng, connection_id)
+        for connection_id in rng.choice(sorted(connections), 3, replace=False).tolist():
+            del connections[connection_id]
+        for i in range(3):
+            connection_id = f"n{step}{i}"
+            connections[connection_id] = random_connection(rng, connection_id)
+        clearance = float(rng.choice([0.25, 0.5, 1.0]))
+        
+        stats = index.sync(list(connections.values()), clearance)
+        assert stats["indexed"] == len(connections)
+        assert indexed(index) == brute_force(list(connections.values()), clearance)
+
+def test_unchanged_sync_rechecks_nothing():
+    rng = np.random.default_rng(3)
+    connections = [random_connection(rng, f"c{i}") for i in range(20)]
+    index = ProjectClashIndex()
+    index.sync(connections, 0.5)
+    before = indexed(index)
+    
+    stats = index.sync(connections, 0.5)
+    assert stats["changed"] == 0 and stats["rechecked"] == 0
+    assert indexed(index) == before
+
+def test_service_ignores_unplaced_connections():
+    rng = np.random.default_rng(5)
+    connections = [random_connection(rng, f"c{i}") for i in range(10)]
+    connections.append({"id": "loose", "connection_type": "single_plate", "parameters": {}})
+    result = ClashService().check("project", connections)
+    
+    bolts, plates = brute_force(connections[:-1], 0.5)
+    assert result["bolt_clash_count"] == len(bolts)
+    assert result["plate_clash_count"] == len(plates)
+    assert result["index"]["unplaced"] == 1
\ No newline at end of file
@@ -0,0 +1,77 @@
+import itertools
+import time
+import numpy as np
+import pytest
+from rule_engine import AISC360RuleEngine, DesignOptimizer
+from rule_engine.base import RuleStatus, STATUS_CODES
+from rule_engine.optimizer import OPTIMIZATION_VARIABLES
+
+CONSTRAINTS = {"plate_width": 5.0, "beam_depth": 24.0, "shear_load": 30.0}
+
+SMALL_RANGES = {
+    "num_bolts": [2, 3, 4, 5, 6],
+    "bolt_diameter": [0.625, 0.75, 0.875],
+    "bolt_spacing": [2.0, 2.5, 3.0, 3.25],
+    "edge_distance": [1.0, 1.25, 1.5, 2.0],
+    "plate_thickness": [0.1875, 0.25, 0.375, 0.5]
+}
+
+LARGE_RANGES = {
+    "num_bolts": list(range(2, 13)),
+    "bolt_diameter": [0.625, 0.75, 0.875, 1.0],
+    "bolt_spacing": list(np.arange(2.0, 8.01, 0.125)),
+    "edge_distance": list(np.arange(1.0, 4.01, 0.125)),
+    "plate_thickness": list(np.arange(0.1875, 1.001, 1 / 32))
+}
+
+@pytest.fixture(scope="module")
+def engine():
+    return AISC360RuleEngine()
+
+def brute_force(engine, connection_type, constraints, ranges):
+    rows = []
+    for values in itertools.product(*(ranges[name] for name in OPTIMIZATION_VARIABLES)):
+        row = {**constraints, **dict(zip(OPTIMIZATION_VARIABLES, values))}
+        row["plate_length"] = (row["num_bolts"] - 1) * row["bolt_spacing"] + 2 * row["edge_distance"]
+        row["connection_depth"] = row["plate_length"]
+        rows.append(row)
+    batch = engine.validate_batch(connection_type, rows)
+    return rows, batch.overall_status == STATUS_CODES[RuleStatus.PASS]
+
+@pytest.mark.parametrize("connection_type", ["single_plate", "double_angle"])
+def test_optimizer_matches_brute_force(engine, connection_type):
+    result = DesignOptimizer(engine).optimize(connection_type, CONSTRAINTS, SMALL_RANGES)
+    rows, passed = brute_force(engine, connection_type, CONSTRAINTS, SMALL_RANGES)
+    
+    assert result["grid_size"] == len(rows)
+    assert result["feasible_count"] == int(passed.sum())
+    assert result["pareto_designs"]
+    
+    plies = 2 if connection_type == "double_angle" else 1
+    lightest = {}
+    for row, ok in zip(rows, passed):
+        if ok:
+            weight = plies * 0.2836 * row["plate_width"] * row["plate_length"] * row["plate_thickness"]
+            lightest[row["num_bolts"]] = min(lightest.get(row["num_bolts"], np.inf), weight)
+    
+    for design in result["pareto_designs"]:
+        assert design["overall_status"] == RuleStatus.PASS
+        assert engine.validate_connection(connection_type, design["parameters"]).is_valid
+        assert design["plate_weight_lb"] == pytest.approx(lightest[design["bolt_count"]], abs=1e-3)
+
+def test_optimizer_reports_no_designs_when_load_is_unreachable(engine):
+    result = DesignOptimizer(engine).optimize("single_plate", {**CONSTRAINTS, "shear_load": 5000.0}, SMALL_RANGES)
+    assert result["feasible_count"] == 0
+    assert result["pareto_designs"] == []
+
+def test_optimizer_sweeps_a_million_candidates_with_load_in_under_a_second(engine):
+    optimizer = DesignOptimizer(engine)
+    optimizer.optimize("single_plate", CONSTRAINTS, SMALL_RANGES)
+    
+    started = time.perf_counter()
+    result = optimizer.optimize("single_plate", CONSTRAINTS, LARGE_RANGES)
+    elapsed = time.perf_counter() - started
+    
+    assert result["grid_size"] > 1_000_000
+    assert result["pareto_designs"]
+    assert elapsed < 1.0
\ No newline at end of file
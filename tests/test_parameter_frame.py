@@ -0,0 +1,62 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from import_service.schedule import _python_values
+from validation_engine.validator import REQUIRED_PARAMETERS, ValidationEngine, coerce_numeric_columns
+
+ROWS = 400
+
+def random_schedule(seed: int):
+    rng = np.random.default_rng(seed)
+    choices = {
+        "num_bolts": ["2", "3", "4", "6", "four"],
+        "num_bolts_vertical": ["2", "4"],
+        "num_bolts_horizontal": ["2"],
+        "bolt_diameter": ["0.625", "0.75", "0.7", "1.0", "1.5", "3/4"],
+        "plate_thickness": ["0.125", "0.1875", "0.25", "0.5", "0.5in"],
+        "beam_section": ["W12X26", "W18X35", "W99X1", "w12x26"],
+        "angle_size": ["4x4x3/8", "L4X4X3/8", "9x9x9"]
+    }
+    lines = [",".join(choices)]
+    for _ in range(ROWS):
+        lines.append(",".join("" if rng.random() < 0.15 else str(rng.choice(values)) for values in choices.values()))
+    frame = pd.read_csv(io.StringIO("\n".join(lines)), skipinitialspace=True)
+    types = pd.Series(rng.choice(sorted(REQUIRED_PARAMETERS) + ["unknown"], ROWS))
+    return frame, types
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_frame_checks_match_row_checks(seed):
+    frame, types = random_schedule(seed)
+    frame = coerce_numeric_columns(frame)
+    checks = ValidationEngine.validate_parameter_frame(frame, types)
+    records = _python_values(frame).to_dict("records")
+    
+    assert list(checks.index) == list(frame.index)
+    for position, record in enumerate(records):
+        params = {name: value for name, value in record.items() if value is not None}
+        expected = ValidationEngine.validate_parameters(params, types.iat[position])
+        assert checks["is_valid"].iat[position] == expected["is_valid"]
+        assert checks["issues"].iat[position] == expected["issues"]
+        assert checks["warnings"].iat[position] == expected["warnings"]
+
+def test_frame_without_optional_columns_reports_missing_parameters():
+    frame = pd.DataFrame({"num_bolts": [4, 3]})
+    checks = ValidationEngine.validate_parameter_frame(frame, pd.Series(["single_plate", "end_plate"]))
+    assert checks["issues"].tolist() == [
+        ["Missing required parameter: bolt_diameter", "Missing required parameter: plate_thickness"],
+        ["Missing required parameter: num_bolts_vertical", "Missing required parameter: num_bolts_horizontal",
+         "Missing required parameter: plate_thickness"]
+    ]
+    assert checks["is_valid"].tolist() == [False, False]
+
+def test_text_in_numeric_columns_is_reported_and_numbers_are_coerced():
+    frame = pd.read_csv(io.StringIO("num_bolts,plate_thickness,bolt_grade\n4,0.5in,A325\n3,0.375,A490"))
+    coerced = coerce_numeric_columns(frame)
+    checks = ValidationEngine.validate_parameter_frame(coerced, pd.Series(["single_plate", "single_plate"]))
+    
+    assert "plate_thickness must be numeric" in checks["issues"].iat[0]
+    assert "plate_thickness must be numeric" not in checks["issues"].iat[1]
+    assert _python_values(coerced).to_dict("records")[1] == {"num_bolts": 3, "plate_thickness": 0.375, "bolt_grade": "A490"}
+    assert ValidationEngine.validate_parameters({"plate_thickness": "0.5in"}, "single_plate")["issues"][-1] == \
+        "plate_thickness must be numeric"
\ No newline at end of file
@@ -0,0 +1,42 @@
+import asyncio
+import json
+import pytest
+from pydantic import ValidationError
+from cache_service.result_cache import ResultCache
+from models.connection import ConnectionCreate
+from rule_engine import AISC360RuleEngine
+
+BASE = {"num_bolts": 4, "bolt_diameter": 0.875, "shear_load": 40.0, "eccentricity": 3.0}
+
+@pytest.fixture(scope="module")
+def engine():
+    return AISC360RuleEngine()
+
+def rendered(result) -> str:
+    return json.dumps(result.to_dict(), sort_keys=True, default=str)
+
+def cached(cache, engine, parameters):
+    return rendered(asyncio.run(cache.get_or_compute(
+        "single_plate", parameters, lambda: engine.validate_connection("single_plate", parameters)
+    )))
+
+@pytest.mark.parametrize("first, second", [
+    ({"bolt_grade": "A490"}, {"bolt_grade": "A490 "}),
+    ({}, {"bolt_spacing": float("nan")}),
+    ({"bolt_spacing": 3.0}, {"bolt_spacing": 3.0000000001})
+])
+def test_cache_hits_match_fresh_results(engine, first, second):
+    cache = ResultCache("rule_results", AISC360RuleEngine.VERSION)
+    for extra in (first, second, first, second):
+        parameters = {**BASE, **extra}
+        assert cached(cache, engine, parameters) == rendered(engine.validate_connection("single_plate", parameters))
+    assert cache.misses == 2 and cache.hits == 2
+
+def test_input_parameters_are_cleaned_before_keying():
+    connection = ConnectionCreate(name="c", connection_type="single_plate", project_id="p",
+                                  parameters={**BASE, "bolt_grade": " A490 ", "bolt_spacing": None})
+    assert connection.parameters == {**BASE, "bolt_grade": "A490"}
+    
+    with pytest.raises(ValidationError):
+        ConnectionCreate(name="c", connection_type="single_plate", project_id="p",
+                         parameters={**BASE, "bolt_spacing": float("nan")})
\ No newline at end of file
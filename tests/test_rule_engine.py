@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from rule_engine import AISC360RuleEngine
+from rule_engine.aisc360 import SUPPORTED_CONNECTION_TYPES
+from rule_engine.bolt_group import ic_coefficient, ic_coefficient_array
+
+ROWS = 300
+
+@pytest.fixture(scope="module")
+def engine():
+    return AISC360RuleEngine()
+
+def random_rows(seed: int):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(ROWS):
+        row = {
+            "num_bolts": int(rng.integers(1, 14)),
+            "bolt_diameter": float(rng.choice([0.625, 0.75, 0.875, 1.0])),
+            "bolt_spacing": float(rng.choice([2.0, 2.5, 3.0, 3.5, 4.0, 7.0])),
+            "edge_distance": float(rng.choice([0.75, 1.0, 1.25, 1.5, 2.0])),
+            "plate_thickness": float(rng.choice([0.1875, 0.25, 0.375, 0.5, 0.875])),
+            "plate_width": float(rng.choice([4.0, 5.0, 6.5])),
+            "beam_depth": float(rng.choice([12.0, 18.0, 24.0])),
+            "connection_depth": float(rng.choice([8.0, 12.0, 20.0])),
+            "bolt_grade": str(rng.choice(["A325", "A490"])),
+            "shear_load": float(rng.uniform(0.0, 150.0)),
+            "eccentricity": float(rng.uniform(0.0, 9.0)),
+            "num_bolts_vertical": int(rng.integers(2, 8)),
+            "bolt_spacing_vertical": float(rng.choice([3.0, 3.5])),
+            "weld_size": float(rng.choice([0.0, 0.1875, 0.25, 0.3125]))
+        }
+        row["plate_length"] = (row["num_bolts"] - 1) * row["bolt_spacing"] + 2 * row["edge_distance"]
+        for name in list(row):
+            if rng.random() < 0.1:
+                del row[name]
+        rows.append(row)
+    return rows
+
+@pytest.mark.parametrize("connection_type", SUPPORTED_CONNECTION_TYPES)
+def test_batch_statuses_match_scalar_validation(engine, connection_type):
+    rows = random_rows(SUPPORTED_CONNECTION_TYPES.index(connection_type))
+    batch = engine.validate_batch(connection_type, rows)
+    
+    for index, row in enumerate(rows):
+        result = engine.validate_connection(connection_type, row)
+        assert batch.row_status(index) == {check.rule_id: check.status for check in result.checks}
+        assert batch.overall(index) == result.overall_status
+        for check in result.checks:
+            column = batch.rule_ids.index(check.rule_id)
+            assert batch.calculated[index, column] == pytest.approx(check.calculated_value, rel=1e-6)
+
+@pytest.mark.parametrize("num_bolts, eccentricity, expected", [
+    (2, 2.0, 1.18),
+    (3, 2.0, 2.23),
+    (4, 2.0, 3.32),
+    (5, 2.0, 4.39),
+    (6, 2.0, 5.45),
+    (3, 3.0, 1.75),
+    (4, 3.0, 2.81)
+])
+def test_ic_coefficients_match_aisc_table_7_6(num_bolts, eccentricity, expected):
+    assert ic_coefficient(num_bolts, 3.0, eccentricity) == pytest.approx(expected, rel=0.01)
+
+def test_ic_coefficient_is_bolt_count_when_concentric():
+    assert ic_coefficient(4, 3.0, 0.0) == pytest.approx(4.0)
+
+def test_ic_coefficient_array_matches_scalar_off_table():
+    num_bolts = np.array([3, 4, 7, 13, 4])
+    spacings = np.array([3.5, 2.25, 5.0, 3.0, 0.0])
+    eccentricities = np.array([2.3, 4.1, 40.0, 3.0, 2.0])
+    expected = [ic_coefficient(n, s, e) for n, s, e in zip(num_bolts, spacings, eccentricities)]
+    np.testing.assert_allclose(ic_coefficient_array(num_bolts, spacings, eccentricities), expected, rtol=1e-9)
+
+def test_ic_coefficient_rejects_non_finite_input():
+    assert np.isnan(ic_coefficient(np.nan, 3.0, 2.0))
+    coefficients = ic_coefficient_array([4, np.inf, 4], [3.0, 3.0, np.nan], [2.0, 2.0, 2.0])
+    assert np.isfinite(coefficients[0])
+    assert np.isnan(coefficients[1:]).all()
\ No newline at end of file
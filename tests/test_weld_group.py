@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+from rule_engine.weld_group import end_plate_weld_strength, single_plate_weld_strength, single_plate_weld_strength_array
+
+@pytest.mark.parametrize("num_bolts_vertical", [3, 5])
+def test_concentric_weld_matches_aisc_table_8_4(num_bolts_vertical):
+    weld_size = 0.25
+    length = (num_bolts_vertical - 1) * 3.0
+    strength = end_plate_weld_strength(num_bolts_vertical, 3.0, weld_size, 70.0)
+    assert strength / (0.75 * 16 * weld_size * length) == pytest.approx(3.71, rel=0.01)
+
+def test_eccentric_weld_capacity_drops_with_eccentricity():
+    widths = np.array([0.0, 4.0, 8.0, 16.0])
+    strengths = single_plate_weld_strength_array(4, 3.0, 1.5, widths, 0.25, 70.0)
+    assert np.all(np.diff(strengths) < 0)
+    np.testing.assert_allclose(strengths, [single_plate_weld_strength(4, 3.0, 1.5, w, 0.25, 70.0) for w in widths])
+
+@pytest.mark.parametrize("num_bolts", [-2, 0])
+def test_weld_length_clamps_bolt_count_to_one(num_bolts):
+    single = single_plate_weld_strength_array([num_bolts, 1], 3.0, 1.5, 5.0, 0.25, 70.0)
+    end = [end_plate_weld_strength(n, 3.0, 0.25, 70.0) for n in (num_bolts, 1)]
+    assert single[0] == single[1]
+    assert end == [0.0, 0.0]
\ No newline at end of file